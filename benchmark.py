@@ -0,0 +1,415 @@
+# -*- coding: utf-8 -*-
+"""
+Copyright (c) 2013, Daniele Esposti <expo@expobrain.net>
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+    * Redistributions of source code must retain the above copyright
+      notice, this list of conditions and the following disclaimer.
+    * Redistributions in binary form must reproduce the above copyright
+      notice, this list of conditions and the following disclaimer in the
+      documentation and/or other materials provided with the distribution.
+    * The name of the contributors may be used to endorse or promote products
+      derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY
+DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+(INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+Benchmarks of the tabbed windows' latencies.
+
+PyQt4 needs an X display, run the benchmarks headless on a virtual
+framebuffer with::
+
+    xvfb-run python benchmark.py --tabs 10,100,1000,5000 --windows 1,10,50 \\
+        --output results.json
+
+Results are written as JSON to be compared between runs.
+"""
+
+from __future__ import division, print_function, unicode_literals
+import argparse
+import json
+import os
+import platform
+import sys
+from timeit import default_timer
+from tabbedwindow import TabbedWindow
+from PyQt4 import QtGui, QtCore
+from PyQt4.QtCore import Qt
+
+
+class MouseEvent(QtGui.QMouseEvent):
+    """
+    Mouse event with the global position equal to the given position
+    """
+
+    def __init__(self, event_type, pos):
+        super(MouseEvent, self).__init__(
+            event_type, pos, Qt.LeftButton, Qt.LeftButton, Qt.NoModifier)
+
+    def globalPos(self):
+        return self.pos()
+
+    def globalX(self):
+        return self.globalPos().x()
+
+    def globalY(self):
+        return self.globalPos().y()
+
+
+def press(pos):
+    return MouseEvent(QtCore.QEvent.MouseButtonPress, pos)
+
+
+def move(pos):
+    return MouseEvent(QtCore.QEvent.MouseMove, pos)
+
+
+def release(pos):
+    return MouseEvent(QtCore.QEvent.MouseButtonRelease, pos)
+
+
+def tab_center(wnd, index):
+    """
+    Returns the global position of the center of the tab at the given index
+    """
+    tabbar = wnd.tabs.tabBar()
+
+    return tabbar.mapToGlobal(tabbar.tabRect(index).center())
+
+
+def drag_distance():
+    distance = QtGui.QApplication.startDragDistance() + 1
+
+    return QtCore.QPoint(distance, distance)
+
+
+class Benchmark(object):
+    """
+    Set up a number of windows with the same number of tabs each and time
+    the tabbed window's operations
+    """
+
+    WINDOW_SIZE = QtCore.QSize(640, 480)
+
+    def __init__(self, tabs, windows, repeat):
+        self.tabs = tabs
+        self.repeat = repeat
+        self.windows = []
+        self.results = []
+
+        # Lay out the windows in a grid, far from the screen's origin
+        columns = max(int(windows ** 0.5), 1)
+        per_window = max(tabs // windows, 1)
+
+        for i in range(windows):
+            wnd = TabbedWindow()
+            wnd.addViews(
+                (QtGui.QWidget(), "view {0}".format(j))
+                for j in range(per_window)
+            )
+            wnd.resize(self.WINDOW_SIZE)
+            wnd.move(
+                100 + (i % columns) * (self.WINDOW_SIZE.width() + 20),
+                100 + (i // columns) * (self.WINDOW_SIZE.height() + 20)
+            )
+            wnd.show()
+
+            self.windows.append(wnd)
+
+        self.process_events()
+
+    def process_events(self):
+        QtGui.QApplication.processEvents()
+
+        # Deferred deletions are not run by processEvents()
+        QtGui.QApplication.sendPostedEvents(
+            None, QtCore.QEvent.DeferredDelete)
+
+    def close(self):
+        for wnd in self.windows:
+            wnd.close()
+            wnd.deleteLater()
+
+        self.process_events()
+
+    def record(self, metric, samples):
+        samples = sorted(samples)
+
+        self.results.append({
+            "metric": metric,
+            "tabs": self.tabs,
+            "windows": len(self.windows),
+            "samples": len(samples),
+            "mean": sum(samples) / len(samples),
+            "median": samples[len(samples) // 2],
+            "min": samples[0],
+            "max": samples[-1],
+        })
+
+    def time_press_to_ghost(self):
+        """
+        Time from the mouse press to the ghost window visible
+        """
+        wnd = self.windows[0]
+        tabbar = wnd.tabs.tabBar()
+        origin = tab_center(wnd, 0)
+        samples = []
+
+        for _ in range(self.repeat):
+            start = default_timer()
+
+            tabbar.mousePressEvent(press(origin))
+            tabbar.mouseMoveEvent(move(origin + drag_distance()))
+
+            samples.append(default_timer() - start)
+
+            # Release the mouse where it was pressed, nothing is dropped
+            tabbar.mouseReleaseEvent(release(origin))
+
+        self.record("press_to_ghost", samples)
+
+    def time_move(self):
+        """
+        Time of a mouse move during the drag, including the ghost window's
+        move
+        """
+        wnd = self.windows[0]
+        tabbar = wnd.tabs.tabBar()
+        origin = tab_center(wnd, 0)
+        scheduler = tabbar.dragScheduler()
+        samples = []
+
+        tabbar.mousePressEvent(press(origin))
+        tabbar.mouseMoveEvent(move(origin + drag_distance()))
+
+        for i in range(self.repeat):
+            pos = origin + drag_distance() + QtCore.QPoint(i % 50, i % 50)
+            start = default_timer()
+
+            tabbar.mouseMoveEvent(move(pos))
+            scheduler.flush()
+
+            samples.append(default_timer() - start)
+
+        tabbar.mouseReleaseEvent(release(origin))
+
+        self.record("move", samples)
+
+    def drag(self, wnd, index, pos):
+        """
+        Drag the tab at the given index of the given window to the given
+        position and returns the time spent by the drop
+        """
+        tabbar = wnd.tabs.tabBar()
+        origin = tab_center(wnd, index)
+
+        tabbar.mousePressEvent(press(origin))
+        tabbar.mouseMoveEvent(move(origin + drag_distance()))
+        tabbar.mouseMoveEvent(move(pos))
+
+        start = default_timer()
+        tabbar.mouseReleaseEvent(release(pos))
+
+        return default_timer() - start
+
+    def time_drop_move_tab(self):
+        """
+        Time of a drop reordering the tabs in-place
+        """
+        wnd = self.windows[0]
+
+        if wnd.tabs.count() < 2:
+            return
+
+        samples = []
+
+        for _ in range(self.repeat):
+            # Make sure the dragged tabs are not scrolled out of the tab bar
+            wnd.setCurrentView(0)
+            samples.append(self.drag(wnd, 0, tab_center(wnd, 1)))
+
+        self.record("drop_move_tab", samples)
+
+    def time_drop_move_to_window(self):
+        """
+        Time of a drop moving a tab into another window
+        """
+        if len(self.windows) < 2 or self.windows[0].tabs.count() < 2:
+            return
+
+        src, dest = self.windows[:2]
+        samples = []
+
+        for _ in range(self.repeat):
+            src.setCurrentView(0)
+            dest.setCurrentView(0)
+            samples.append(self.drag(src, 0, tab_center(dest, 0)))
+
+            # Move the view back
+            view = dest.tabs.widget(0)
+            text = dest.tabs.tabText(0)
+
+            dest.removeView(0)
+
+            src.insertView(tab_center(src, 0), view, text)
+
+        self.record("drop_move_to_window", samples)
+
+    def time_drop_new_window(self):
+        """
+        Time of a drop creating a new window
+        """
+        wnd = self.windows[0]
+
+        if wnd.tabs.count() < 2:
+            return
+
+        outside = QtCore.QPoint(-10000, -10000)
+        samples = []
+
+        for _ in range(self.repeat):
+            wnd.setCurrentView(0)
+            samples.append(self.drag(wnd, 0, outside))
+
+            # Move the view back and close the new window
+            new_wnd = [
+                candidate for candidate in QtGui.QApplication.topLevelWidgets()
+                if isinstance(candidate, TabbedWindow) and
+                candidate not in self.windows and candidate.tabs.count()
+            ][0]
+
+            view = new_wnd.tabs.widget(0)
+            text = new_wnd.tabs.tabText(0)
+
+            new_wnd.removeView(0)
+            wnd.insertView(tab_center(wnd, 0), view, text)
+
+            # The emptied window is closed but not deleted, the window pool
+            # is disabled so it would never be reused
+            new_wnd.deleteLater()
+            self.process_events()
+
+        self.record("drop_new_window", samples)
+
+    def time_add_remove_view(self):
+        """
+        Throughput of addView() and removeView(), the time is per view
+        """
+        wnd = self.windows[0]
+        count = max(self.tabs // len(self.windows), 1)
+        views = [QtGui.QWidget() for _ in range(count)]
+        add_samples = []
+        remove_samples = []
+
+        for _ in range(max(self.repeat // 10, 1)):
+            start = default_timer()
+
+            for view in views:
+                wnd.addView(view, "view")
+
+            add_samples.append((default_timer() - start) / count)
+
+            start = default_timer()
+
+            for _ in views:
+                wnd.removeView(wnd.tabs.count() - 1)
+
+            remove_samples.append((default_timer() - start) / count)
+
+        self.record("add_view", add_samples)
+        self.record("remove_view", remove_samples)
+
+    def time_tab_switch(self):
+        """
+        Time to switch the current tab, including the repaint
+        """
+        wnd = self.windows[0]
+        count = wnd.tabs.count()
+        samples = []
+
+        for i in range(self.repeat):
+            start = default_timer()
+
+            wnd.setCurrentView((i + 1) % count)
+            wnd.tabs.repaint()
+
+            samples.append(default_timer() - start)
+
+        self.record("tab_switch", samples)
+
+    def run(self):
+        self.time_press_to_ghost()
+        self.time_move()
+        self.time_drop_move_tab()
+        self.time_drop_move_to_window()
+        self.time_drop_new_window()
+        self.time_add_remove_view()
+        self.time_tab_switch()
+
+        return self.results
+
+
+def parse_list(value):
+    return [int(item) for item in value.split(",") if item]
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        description="Headless benchmarks of the tabbed windows' latencies")
+    parser.add_argument(
+        "--tabs", type=parse_list, default=[10, 100, 1000, 5000],
+        help="comma separated total numbers of tabs")
+    parser.add_argument(
+        "--windows", type=parse_list, default=[1, 10, 50],
+        help="comma separated numbers of windows")
+    parser.add_argument(
+        "--repeat", type=int, default=50,
+        help="number of samples per measure")
+    parser.add_argument(
+        "--output", default=None,
+        help="JSON output file, default to the standard output")
+    args = parser.parse_args(argv)
+
+    app = QtGui.QApplication(sys.argv[:1])  # noqa
+    results = []
+
+    for tabs in args.tabs:
+        for windows in args.windows:
+            if windows > tabs:
+                continue
+
+            benchmark = Benchmark(tabs, windows, args.repeat)
+
+            try:
+                results.extend(benchmark.run())
+            finally:
+                benchmark.close()
+
+    report = {
+        "python": platform.python_version(),
+        "qt": QtCore.QT_VERSION_STR,
+        "display": os.environ.get("DISPLAY"),
+        "repeat": args.repeat,
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -26,9 +26,483 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
 
 from __future__ import division, print_function, unicode_literals
+import bisect
+import contextlib
+import functools
+import json
+import logging
+import math
+import os
+import struct
+import threading
+import collections
+import time
+import weakref
+import zlib
+from timeit import default_timer
 from PyQt4 import QtGui, QtCore
 from PyQt4.QtCore import Qt
 
+_logger = logging.getLogger(__name__)
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+try:
+    from concurrent import futures
+except ImportError:
+    futures = None
+
+
+def _as_future(obj):
+    """
+    Returns the given object as a future if it's a future or an awaitable
+    otherwise returns *None*.
+
+    Awaitables are scheduled on the running asyncio event loop.
+
+    :param obj: The object to be checked
+    :type obj: object
+    :rtype: Future
+    """
+    if hasattr(obj, "add_done_callback") and hasattr(obj, "cancel"):
+        return obj
+
+    if asyncio is not None and (
+            asyncio.iscoroutine(obj) or hasattr(obj, "__await__")):
+        return asyncio.ensure_future(obj)
+
+    return None
+
+
+def _grab_widget(widget):
+    """
+    Returns a pixmap with the rendering of the given widget, the Qt4 and Qt5
+    API are different
+
+    :param widget: The widget to be grabbed
+    :type widget: QWidget
+    :rtype: QPixmap
+    """
+    if QtCore.QT_VERSION >= 0x050000:
+        return widget.grab()
+
+    return QtGui.QPixmap.grabWidget(widget)
+
+
+def _block_position(index, indices, count):
+    """
+    Returns the position among the tabs not dragged where the dragged tabs are
+    moved as a block when dropped on the tab at the given index, -1 means
+    after the last tab.
+
+    The given drop index counts all the tabs, the dragged ones included. Like
+    QTabBar.moveTab() the tabs moved to the right are placed after the tab
+    under the cursor.
+
+    :param index: The drop index
+    :param indices: The sorted indices of the dragged tabs
+    :param count: The number of tabs
+
+    :type index: int
+    :type indices: list
+    :type count: int
+    :rtype: int
+    """
+    others = count - len(indices)
+
+    if index == -1:
+        return others
+
+    position = index - len([i for i in indices if i < index])
+
+    if index > indices[0] and index not in indices:
+        position += 1
+
+    return min(position, others)
+
+
+def _render_thumbnail(widget, max_pixels):
+    """
+    Render the given widget into a pixmap not bigger than the given number of
+    pixels and returns the pixmap and the scale factor used
+
+    :param widget: The widget to be rendered
+    :param max_pixels: The maximum number of pixels of the pixmap
+
+    :type widget: QWidget
+    :type max_pixels: int
+
+    :rtype: tuple
+    """
+    width = max(widget.width(), 1)
+    height = max(widget.height(), 1)
+    scale = min(math.sqrt(max_pixels / (width * height)), 1.0)
+
+    # Render the widget directly at the reduced size
+    pixmap = QtGui.QPixmap(
+        max(int(width * scale), 1), max(int(height * scale), 1))
+    pixmap.fill(Qt.transparent)
+
+    painter = QtGui.QPainter(pixmap)
+    painter.scale(scale, scale)
+    widget.render(painter)
+    painter.end()
+
+    return pixmap, scale
+
+
+class Tracer(object):
+    """
+    Records the spans of the tabbed windows' operations in a bounded ring
+    buffer and exports them in the Chrome trace-event JSON format, which can
+    be loaded by ``chrome://tracing`` or Perfetto.
+
+    The tracer is opt-in, create it and call
+    :py:meth:`.tabbedwindow.Tracer.install()`. Only the last
+    :py:attr:`.tabbedwindow.Tracer.CAPACITY` spans are kept so it can stay
+    installed and be dumped on demand by
+    :py:meth:`.tabbedwindow.Tracer.dump()`.
+
+    Spans carry the identifiers of the windows and of the views involved so a
+    view can be followed across windows.
+    """
+
+    CAPACITY = 10000
+    CATEGORY = "tabbedwindow"
+
+    _active = None
+
+    def __init__(self, capacity=None):
+        """
+        Constructor accepts the optional maximum number of spans kept
+
+        :param capacity: The maximum number of spans kept
+        :type capacity: int
+        """
+        # Protected attributes
+        self._spans = collections.deque(maxlen=capacity or self.CAPACITY)
+
+    @classmethod
+    def active(cls):
+        """
+        Returns the installed tracer or *None*
+
+        :rtype: :py:class:`.tabbedwindow.Tracer`
+        """
+        return cls._active
+
+    def install(self):
+        """
+        Install the tracer replacing the current one
+        """
+        Tracer._active = self
+
+    def uninstall(self):
+        """
+        Uninstall the tracer if it's the installed one
+        """
+        if Tracer._active is self:
+            Tracer._active = None
+
+    @contextlib.contextmanager
+    def span(self, name, **args):
+        """
+        Context manager recording a span with the given name and arguments
+
+        :param name: The span's name
+        :type name: string
+        """
+        start = default_timer()
+
+        try:
+            yield
+        finally:
+            self._spans.append((
+                name, start, default_timer() - start,
+                threading.current_thread().ident, args
+            ))
+
+    def clear(self):
+        """
+        Discard the recorded spans
+        """
+        self._spans.clear()
+
+    def events(self):
+        """
+        Returns the recorded spans as Chrome's complete events
+
+        :rtype: list
+        """
+        pid = os.getpid()
+
+        return [
+            {
+                "name": name,
+                "cat": self.CATEGORY,
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": duration * 1e6,
+                "pid": pid,
+                "tid": tid,
+                "args": args,
+            }
+            for name, start, duration, tid, args in list(self._spans)
+        ]
+
+    def dumps(self):
+        """
+        Returns the recorded spans as a Chrome trace-event JSON document
+
+        :rtype: string
+        """
+        return json.dumps({
+            "traceEvents": self.events(),
+            "displayTimeUnit": "ms",
+        })
+
+    def dump(self, path):
+        """
+        Write the recorded spans as a Chrome trace-event JSON document into
+        the file at the given path
+
+        :param path: The output file's path
+        :type path: string
+        """
+        with open(path, "w") as output:
+            output.write(self.dumps())
+
+
+def _object_id(obj):
+    """
+    Returns the identifier of the given object used in the traces
+
+    :param obj: The object
+    :type obj: object
+    :rtype: string
+    """
+    return None if obj is None else "0x{0:x}".format(id(obj))
+
+
+def _traced(name, describe):
+    """
+    Decorator recording a span for every call of the decorated method when a
+    :py:class:`.tabbedwindow.Tracer` is installed
+
+    :param name: The span's name
+    :param describe: Callable returning the span's arguments from the
+                     method's arguments
+
+    :type name: string
+    :type describe: callable
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwds):
+            tracer = Tracer.active()
+
+            if tracer is None:
+                return method(self, *args, **kwds)
+
+            with tracer.span(name, **describe(self, *args, **kwds)):
+                return method(self, *args, **kwds)
+
+        return wrapper
+
+    return decorator
+
+
+def _describe_drag(tabbar, ghost_wnd, **args):
+    """
+    Returns the span's arguments of an operation on the view dragged from
+    the given tab bar
+    """
+    index = ghost_wnd.index()
+
+    args.update(
+        window=_object_id(tabbar.window()),
+        index=index,
+        view=_object_id(tabbar.parent().widget(index)),
+    )
+
+    if len(ghost_wnd.indices()) > 1:
+        args.update(indices=ghost_wnd.indices())
+
+    return args
+
+
+class GhostRenderer(object):
+    """
+    Base class of the strategies used to paint a
+    :py:class:`.tabbedwindow.GhostWindow` during the Drag&Drop action.
+
+    Subclasses must implement :py:meth:`.tabbedwindow.GhostRenderer.render()`
+    which sets up the appearance of the ghost window, the ghost window's
+    geometry is always set to the geometry of the dragged window.
+
+    A renderer can be chosen per window class by setting the
+    :py:attr:`.tabbedwindow.TabbedWindow.GHOST_RENDERER` class attribute or per
+    tab bar by :py:meth:`.tabbedwindow.TabBar.setGhostRenderer()`.
+    """
+
+    def render(self, ghost, wnd):
+        """
+        Set up the appearance of the ghost window for the given window
+
+        :param ghost: The ghost window to be painted
+        :param wnd: The window being dragged
+
+        :type ghost: :py:class:`.tabbedwindow.GhostWindow`
+        :type wnd: QWidget
+        """
+        raise NotImplementedError
+
+
+class SnapshotRenderer(GhostRenderer):
+    """
+    Paint the ghost window with a full resolution, translucent screenshot of
+    the dragged window.
+    """
+
+    def render(self, ghost, wnd):
+        """
+        See :py:meth:`.tabbedwindow.GhostRenderer.render()`
+        """
+        palette = QtGui.QPalette()
+        palette.setBrush(
+            ghost.backgroundRole(), QtGui.QBrush(_grab_widget(wnd)))
+
+        ghost.setPalette(palette)
+        ghost.setWindowOpacity(ghost.OPACITY)
+
+
+class ThumbnailRenderer(GhostRenderer):
+    """
+    Paint the ghost window with a translucent screenshot of the dragged window
+    rendered at a reduced resolution.
+
+    The screenshot is never bigger than the given budget of pixels and it's
+    stretched to fill the ghost window.
+    """
+
+    MAX_PIXELS = 320 * 240
+
+    def __init__(self, max_pixels=None):
+        """
+        Constructor accepts the optional maximum number of pixels of the
+        screenshot, by default
+        :py:attr:`.tabbedwindow.ThumbnailRenderer.MAX_PIXELS`
+
+        :param max_pixels: The maximum number of pixels of the screenshot
+        :type max_pixels: int
+        """
+        self._max_pixels = max_pixels or self.MAX_PIXELS
+
+    def maxPixels(self):
+        """
+        The maximum number of pixels of the screenshot
+
+        :rtype: int
+        """
+        return self._max_pixels
+
+    def render(self, ghost, wnd):
+        """
+        See :py:meth:`.tabbedwindow.GhostRenderer.render()`
+        """
+        pixmap, scale = _render_thumbnail(wnd, self._max_pixels)
+
+        # Stretch the thumbnail over the ghost window
+        brush = QtGui.QBrush(pixmap)
+        brush.setTransform(QtGui.QTransform.fromScale(1 / scale, 1 / scale))
+
+        palette = QtGui.QPalette()
+        palette.setBrush(ghost.backgroundRole(), brush)
+
+        ghost.setPalette(palette)
+        ghost.setWindowOpacity(ghost.OPACITY)
+
+
+class OutlineRenderer(GhostRenderer):
+    """
+    Paint only an opaque frame with the size of the dragged window.
+
+    The window is not grabbed and no translucency is used, this is the
+    cheapest renderer.
+    """
+
+    BORDER = 3
+
+    def render(self, ghost, wnd):
+        """
+        See :py:meth:`.tabbedwindow.GhostRenderer.render()`
+        """
+        palette = QtGui.QPalette()
+        palette.setColor(
+            ghost.backgroundRole(),
+            wnd.palette().color(QtGui.QPalette.Highlight)
+        )
+
+        # Show only the border of the window
+        rect = QtCore.QRect(QtCore.QPoint(), wnd.size())
+        inner = rect.adjusted(
+            self.BORDER, self.BORDER, -self.BORDER, -self.BORDER)
+
+        ghost.setPalette(palette)
+        ghost.setMask(QtGui.QRegion(rect).subtracted(QtGui.QRegion(inner)))
+
+
+class CachedSnapshotRenderer(GhostRenderer):
+    """
+    Paint the ghost window with the snapshot of the dragged view taken from
+    the :py:class:`.tabbedwindow.SnapshotCache`, drawn at the view's place
+    inside the window's frame. Only the tab bar is grabbed from the window.
+
+    The whole window is grabbed by
+    :py:class:`.tabbedwindow.SnapshotRenderer` if the view has no snapshot.
+
+    This is the default renderer.
+    """
+
+    def render(self, ghost, wnd):
+        """
+        See :py:meth:`.tabbedwindow.GhostRenderer.render()`
+        """
+        tabbar = ghost.tabBar()
+        tabs = tabbar.parent()
+        view = tabs.widget(ghost.index())
+        pixmap = SnapshotCache.instance().snapshot(view) if view else None
+
+        if pixmap is None or pixmap.isNull():
+            SnapshotRenderer().render(ghost, wnd)
+            return
+
+        # All the pages share the geometry of the current one, the dragged
+        # view could have never been laid out
+        page = tabs.currentWidget() or view
+        rect = QtCore.QRect(page.mapTo(wnd, QtCore.QPoint()), page.size())
+
+        frame = QtGui.QPixmap(wnd.size())
+        frame.fill(wnd.palette().color(QtGui.QPalette.Window))
+
+        painter = QtGui.QPainter(frame)
+
+        try:
+            painter.drawPixmap(
+                tabbar.mapTo(wnd, QtCore.QPoint()), _grab_widget(tabbar))
+            painter.drawPixmap(rect, pixmap)
+        finally:
+            painter.end()
+
+        palette = QtGui.QPalette()
+        palette.setBrush(ghost.backgroundRole(), QtGui.QBrush(frame))
+
+        ghost.setPalette(palette)
+        ghost.setWindowOpacity(ghost.OPACITY)
+
 
 class GhostWindow(QtGui.QWidget):
     """
@@ -44,41 +518,72 @@ class GhostWindow(QtGui.QWidget):
     """
 
     OPACITY = 0.5
+    RENDERER = CachedSnapshotRenderer()
 
-    def __init__(self, tabbar, pos):
+    def __init__(self, tabbar, pos, renderer=None, index=None,
+                 drag_distance=None):
         """
-        Constructor accepts the reference to the tab bar widget and the
-        position of the cursor local to the tab bar itself
+        Constructor accepts the reference to the tab bar widget, the
+        position of the cursor local to the tab bar itself, the optional
+        renderer used to paint the ghost window, by default the tab bar's
+        :py:meth:`.tabbedwindow.TabBar.ghostRenderer()`, the optional
+        index of the dragged tab, by default the tab under the given position,
+        and the optional drag distance, by default
+        QApplication.startDragDistance()
 
         :param tabbar: The tab bar where the D&D action is generated
         :param pos: The screen coordinates of the mouse pointer
+        :param renderer: The ghost window's renderer
+        :param index: The index of the dragged tab
+        :param drag_distance: The distance starting the drag
 
         :type tabbar: :py:class:`.tabbedwindow.TabBar`
         :type pos: QPoint
+        :type renderer: :py:class:`.tabbedwindow.GhostRenderer`
+        :type index: int
+        :type drag_distance: int
         """
         # Call superclass
         super(GhostWindow, self).__init__()
 
-        # Calculate palette using original window as brush
-        palette = QtGui.QPalette()
+        # Protected attributes
+        self._tabbar = tabbar
+        self._index = tabbar.tabAt(pos) if index is None else index
+
+        if drag_distance is None:
+            drag_distance = QtGui.QApplication.startDragDistance()
+
+        self._drag_distance = drag_distance
+        self._indices = [self._index]
+
+        # Drag all the selected tabs if the dragged one is selected
+        selected = tabbar.selectedIndices()
+
+        if self._index in selected:
+            self._indices = selected
+
+        # Paint the ghost window using the original window
         wnd = tabbar.window()
 
-        if QtCore.QT_VERSION >= 0x050000:
-            brush = wnd.grab()
-        else:
-            brush = QtGui.QPixmap.grabWidget(wnd)
+        if renderer is None:
+            renderer = tabbar.ghostRenderer()
 
-        palette.setBrush(self.backgroundRole(), QtGui.QBrush(brush))
+        tracer = Tracer.active()
+
+        if tracer is None:
+            renderer.render(self, wnd)
+        else:
+            with tracer.span("GhostWindow.render",
+                             window=_object_id(wnd),
+                             renderer=type(renderer).__name__):
+                renderer.render(self, wnd)
 
         # Setup widget appearance
-        self.setPalette(palette)
         self.setGeometry(wnd.geometry())
-        self.setWindowOpacity(self.OPACITY)
         self.setAttribute(Qt.WA_TransparentForMouseEvents)
 
         # Protected attributes
         self._offset = tabbar.mapToGlobal(pos) - wnd.pos()
-        self._index = tabbar.tabAt(pos)
         self._origin = tabbar.mapToGlobal(pos)
 
     def offset(self):
@@ -98,6 +603,23 @@ class GhostWindow(QtGui.QWidget):
         """
         return self._index
 
+    def indices(self):
+        """
+        Sorted indices of all the dragged tabs, more than one if the original
+        tab is part of the tab bar's multiple selection
+
+        :rtype: list
+        """
+        return list(self._indices)
+
+    def tabBar(self):
+        """
+        The tab bar where the D&D action is generated
+
+        :rtype: :py:class:`.tabbedwindow.TabBar`
+        """
+        return self._tabbar
+
     def moveWithOffset(self, pos):
         """
         Move the widget into the given position taking in account the current
@@ -111,14 +633,13 @@ class GhostWindow(QtGui.QWidget):
         if self.isHidden():
             distance = (self._origin - pos).manhattanLength()
 
-            if distance >= QtGui.QApplication.startDragDistance():
+            if distance >= self._drag_distance:
                 self.show()
 
     def dragStarted(self, pos):
         """
         Return *True* if the difference between the position of the original
-        widget and given point is greater than the
-        QApplication.startDragDistance() value
+        widget and given point is greater than the drag distance
 
         :param pos: The current cursor position
         :type post: QPoint
@@ -126,349 +647,5349 @@ class GhostWindow(QtGui.QWidget):
         """
         length = (pos - self._origin).manhattanLength()
 
-        return length >= QtGui.QApplication.startDragDistance()
+        return length >= self._drag_distance
 
 
-class TabBar(QtGui.QTabBar):
+class SnapshotCache(QtCore.QObject):
     """
-    Re-implemented the standard QTabBar widget but adds new methods to allow
-    Drag&Drop operations outside the tab bar's window, like creating a new
-    window with a dragged view, move a view into a different window or close
-    the current window if no more tabs are available
+    Cache of small renderings of the views used by the ghost windows and by
+    the tabs' hover previews.
+
+    A view is tracked from the first request of its snapshot. The snapshot
+    becomes stale only when the view, or one of its children, is repainted
+    and stale snapshots of visible views are refreshed a few at a time,
+    at most every :py:attr:`.tabbedwindow.SnapshotCache.REFRESH_INTERVAL`
+    milliseconds.
+
+    The snapshots are kept under a global budget of bytes evicting the least
+    recently used ones.
+
+    Use :py:meth:`.tabbedwindow.SnapshotCache.instance()` to get the cache.
     """
 
-    def __init__(self, *args, **kwds):
+    MAX_BYTES = 32 * 1024 * 1024
+    MAX_PIXELS = ThumbnailRenderer.MAX_PIXELS
+    REFRESH_INTERVAL = 500
+    REFRESH_BATCH = 2
+
+    _instance = None
+
+    def __init__(self, max_bytes=None, max_pixels=None, parent=None):
         """
-        See QTabBar
+        Constructor accepts the optional budget in bytes of all the
+        snapshots, the optional maximum number of pixels of a snapshot and
+        the optional parent object
+
+        :param max_bytes: The budget in bytes of all the snapshots
+        :param max_pixels: The maximum number of pixels of a snapshot
+        :param parent: The optional parent object
+
+        :type max_bytes: int
+        :type max_pixels: int
+        :type parent: QObject
         """
         # Call superclass
-        super(TabBar, self).__init__(*args, **kwds)
+        super(SnapshotCache, self).__init__(parent)
 
         # Protected attributes
-        self._ghost = None
+        self._max_bytes = max_bytes or self.MAX_BYTES
+        self._max_pixels = max_pixels or self.MAX_PIXELS
+        self._entries = collections.OrderedDict()
+        self._owners = weakref.WeakKeyDictionary()
+        self._bytes = 0
 
-    def _create_new_window(self, ghost_wnd):
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.REFRESH_INTERVAL)
+        self._timer.timeout.connect(self.refresh)
+
+    @classmethod
+    def instance(cls):
         """
-        Creates and returns new window fetching geometry information from the
-        given :py:class:`.tabbedwindow.GhostWindow` instance and moving the
-        view at the index referenced by
-        :py:meth:`.tabbedwindow.GhostWindow.index()` into the newly created
-        window.
+        Returns the process wide cache
 
-        :param ghost_wnd: The ghost windows instance from the D&D action
-        :type ghost_wnd: :py:class:`.tabbedwindow.GhostWindow`
-        :rtype: :py:class:`.tabbedwindow.TabbedWindow`
+        :rtype: :py:class:`.tabbedwindow.SnapshotCache`
         """
-        # Create new window
-        wnd = self.window().clone(ghost_wnd.geometry())
+        if cls._instance is None:
+            cls._instance = cls()
 
-        # Move tab into new window
-        views = self.parent()
-        index = ghost_wnd.index()
+        return cls._instance
 
-        view = views.widget(index)
-        text = views.tabText(index)
+    def bytes(self):
+        """
+        The size in bytes of the cached snapshots
 
-        # Move tab
-        views.removeTab(index)
-        wnd.addView(view, text)
+        :rtype: int
+        """
+        return self._bytes
 
-        # Show new windows
-        wnd.show()
+    def maxBytes(self):
+        """
+        The budget in bytes of all the snapshots
 
-        return wnd
+        :rtype: int
+        """
+        return self._max_bytes
 
-    def _move_to_window(self, tabbed_wnd, pos, ghost_wnd):
+    def setMaxBytes(self, max_bytes):
         """
-        Move the view at the index referenced by the
-        :py:meth:`.tabbedwindow.GhostWindow.index()` attribute into the given
-        tabbed window and at the given current position
+        Set the budget in bytes of all the snapshots
 
-        :param tabbed_wnd: The target tabbed window instance
-        :param pos: The global screen position where the view will be inserted
-        :param ghost_wnd: The dragged ghost window
+        :param max_bytes: The budget in bytes of all the snapshots
+        :type max_bytes: int
+        """
+        self._max_bytes = max_bytes
+        self._evict()
 
-        :type tabbed_wnd: :py:class:`.tabbedwindow.TabbedWindow`
-        :type pos: QPoint
-        :type ghost_wnd: :py:class:`.tabbedwindow.GhostWindow`
+    def isTracked(self, view):
         """
-        # Get view and title to be moved
-        views = self.parent()
-        index = ghost_wnd.index()
+        Returns *True* if the given view is tracked by the cache
 
-        view = views.widget(index)
-        text = views.tabText(index)
+        :param view: The view
+        :type view: QWidget
+        :rtype: bool
+        """
+        return id(view) in self._entries
 
-        # Remove view form local window
-        views.removeTab(index)
+    def isStale(self, view):
+        """
+        Returns *True* if the given view has been repainted since its
+        snapshot has been taken
 
-        # Insert tab into remove window
-        index = tabbed_wnd.insertView(pos, view, text)
+        :param view: The view
+        :type view: QWidget
+        :rtype: bool
+        """
+        entry = self._entries.get(id(view))
 
-        # Set it as the current tab and raise focus to the window
-        tabbed_wnd.setCurrentView(index)
-        tabbed_wnd.raise_()
+        return entry is None or entry[2]
 
-    def _move_tab(self, pos, ghost_wnd):
+    def snapshot(self, view):
         """
-        Move the tab in-place by the given position
+        Returns the snapshot of the given view.
 
-        :param pos: The global screen position where the view will be inserted
-        :param ghost_wnd: The dragged ghost window
+        The view is rendered immediately only if it has no snapshot yet, a
+        stale snapshot is returned as it is and refreshed later.
 
-        :type pos: QPoint
-        :type ghost_wnd: :py:class:`.tabbedwindow.GhostWindow`
+        :param view: The view
+        :type view: QWidget
+        :rtype: QPixmap
         """
-        # Move tab if more than one tab
-        if self.count() > 1:
-            # Get new tab index by pos
-            old_index = ghost_wnd.index()
-            new_index = self.tabAt(self.mapFromGlobal(pos))
+        key = id(view)
 
-            if new_index == -1:
-                new_index = self.count() - 1
+        if key not in self._entries:
+            self._track(view)
 
-            # Move tab only if the indices are different
-            if new_index != old_index:
-                # Move tab
-                self.moveTab(old_index, new_index)
+        entry = self._entries[key]
 
-                # Workaround to notify the tab widget the correct active tab
-                self.emit(QtCore.SIGNAL(b"currentChanged(int)"), new_index)
+        if entry[1] is None:
+            self._render(entry)
+        elif entry[2]:
+            self._schedule()
 
-    def tabRemoved(self, index):  # pylint: disable=W0613
-        """
-        If no tabs are left in the current tab bar closes the widget's window.
+        # Most recently used
+        entry = self._entries.pop(key)
+        self._entries[key] = entry
 
-        See QTabBar.tabRemoved()
+        return entry[1]
 
-        :param index: The removed tab's index
-        :type index: int
+    def invalidate(self, view):
         """
-        if self.count() == 0:
-            self.window().close()
+        Mark the snapshot of the given view as stale
 
-    def mousePressEvent(self, event):
+        :param view: The view
+        :type view: QWidget
         """
-        If the left mouse button if pressed over a tab show the ghost window
-        and starts the Drag&Drop operation
+        entry = self._entries.get(id(view))
 
-        See QWidget.mousePressEvent()
+        if entry is not None and not entry[2]:
+            entry[2] = True
+            self._schedule()
+
+    def refresh(self):
         """
-        # Create ghost window if needed
-        pos = self.mapFromGlobal(event.globalPos())
+        Render again some of the stale snapshots of the visible views
+        """
+        stale = [
+            entry for entry in self._entries.values()
+            if entry[2] and entry[1] is not None and entry[0].isVisible()
+        ]
 
-        if event.button() == Qt.LeftButton and self.tabAt(pos) > -1:
-            self._ghost = GhostWindow(self, pos)
+        for entry in stale[:self.REFRESH_BATCH]:
+            self._render(entry)
 
-        # Call superclass
-        super(TabBar, self).mousePressEvent(event)
+        if len(stale) > self.REFRESH_BATCH:
+            self._schedule()
 
-    def mouseMoveEvent(self, event):
+    def eventFilter(self, obj, event):
         """
-        Update the ghost window's position during mouse move.
+        Mark the snapshots stale when the views are repainted and track the
+        new children of the views.
 
-        See QWidget.mouseMoveEvent()
+        See QObject.eventFilter()
         """
-        if self._ghost:
-            self._ghost.moveWithOffset(event.globalPos())
+        if event.type() == QtCore.QEvent.Paint:
+            view = self._owners.get(obj)
 
-    def tabDropEvent(self, event):
-        """
-        Drops the current dragged view and creates a new window if no tab bar
-        under the event's screen position otherwise move the dragged view into
-        the tab bar under the mouse event's position.
+            if view is not None:
+                self.invalidate(view)
 
-        Close the current window if no more tabs are left.
+        elif event.type() == QtCore.QEvent.ChildAdded:
+            child = event.child()
+            view = self._owners.get(obj)
 
-        This method can be overridden to implement custom tab drop's behaviour.
+            if view is not None and child.isWidgetType():
+                self._watch(child, view)
 
-        :param event: The mouse release event
-        :type: QMouseEvent
+        return False
+
+    def _track(self, view):
         """
-        # Enter code only if drag is far enough
-        pos = event.globalPos()
+        Start tracking the repaints of the given view and of its children
+        """
+        self._entries[id(view)] = [view, None, True]
 
-        if self._ghost.dragStarted(pos):
-            tabs = QtGui.QApplication.widgetAt(pos)
+        self._watch(view, view)
 
-            # Choose action by the widget under the mouse's coordinates
-            if isinstance(tabs, TabBar):
-                if tabs == self:
-                    # Move tab in-place
-                    self._move_tab(pos, self._ghost)
-                else:
-                    # Move the dragged tab into the window under the cursor
-                    self._move_to_window(tabs.window(), pos, self._ghost)
+        for child in view.findChildren(QtGui.QWidget):
+            self._watch(child, view)
 
-            else:
-                if self.count() == 1:
-                    # Only move the current window into the new position
-                    self.window().move(self._ghost.pos())
-                else:
-                    # Creates a new window and move the tab
-                    self._create_new_window(self._ghost)
+        view.destroyed.connect(functools.partial(self._forget, id(view)))
 
-    def mouseReleaseEvent(self, event):
+    def _watch(self, widget, view):
         """
-        Analyse the mouse release event calling only the superclass if the
-        released button is not the left mouse button otherwise pass the mouse
-        release event to the :py:meth:`.tabbedwindow.TabBar.tabDropEvent()`
-        handler.
+        Install the event filter on the given widget of the given view
+        """
+        if widget not in self._owners:
+            self._owners[widget] = view
+            widget.installEventFilter(self)
 
-        Finishing by destroying the ghost windows widget.
+    def _forget(self, key, *args):  # pylint: disable=W0613
+        """
+        Stop tracking the destroyed view with the given key
+        """
+        entry = self._entries.pop(key, None)
 
-        See QWidget.mouseReleaseEvent()
+        if entry is not None and entry[1] is not None:
+            self._bytes -= self._size(entry[1])
+
+    def _render(self, entry):
         """
-        # Call superclass if not a left button release mouse event
-        if event.button() != Qt.LeftButton:
-            super(TabBar, self).mouseReleaseEvent(event)
-            return
+        Render the snapshot of the given entry
+        """
+        if entry[1] is not None:
+            self._bytes -= self._size(entry[1])
 
-        # Handle mouse release event
-        self.tabDropEvent(event)
+        entry[1], _ = _render_thumbnail(entry[0], self._max_pixels)
+        entry[2] = False
 
-        # Close ghost window
-        if self._ghost:
-            self._ghost.close()
-            self._ghost = None
+        self._bytes += self._size(entry[1])
+        self._evict(keep=entry)
 
+    def _evict(self, keep=None):
+        """
+        Drop the least recently used snapshots until the cache is within the
+        budget, the snapshot of the given entry is kept
+        """
+        for entry in list(self._entries.values()):
+            if self._bytes <= self._max_bytes:
+                break
 
-class TabWidget(QtGui.QTabWidget):
+            if entry is not keep and entry[1] is not None:
+                self._bytes -= self._size(entry[1])
+                entry[1] = None
+                entry[2] = True
+
+    def _schedule(self):
+        """
+        Schedule a refresh of the stale snapshots
+        """
+        if not self._timer.isActive():
+            self._timer.start()
+
+    @staticmethod
+    def _size(pixmap):
+        """
+        Returns the approximate size in bytes of the given pixmap
+        """
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+class TabPreview(QtGui.QLabel):
     """
-    Subclass of a standard QTabWidget wit a custom tab bar, to be extended to
-    fit the desired view's Drag&Drop behaviour
+    Popup showing the snapshot of a tab's view while hovering the tab
     """
 
-    def __init__(self, parent=None):
-        """
-        Constructor accepts the optional tab widget's parent
+    OFFSET = QtCore.QPoint(16, 16)
 
-        :param parent: The optional parent widget
-        :type parent: QWidget
+    def __init__(self):
+        """
+        Empty constructor
         """
         # Call superclass
-        super(TabWidget, self).__init__(parent)
+        super(TabPreview, self).__init__(None, Qt.ToolTip)
 
         # Set up widget
-        self.setTabBar(TabBar(self))
+        self.setFrameStyle(QtGui.QFrame.Box | QtGui.QFrame.Plain)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
 
-    def tabAt(self, pos):
+    def showSnapshot(self, pixmap, pos):
         """
-        Re-implementation of the QTabBar.tabAt() method.
+        Show the given snapshot near the given screen position
 
-        This should be exposed here because the original one is a protected
-        method and in the TabbedWindow class we need to retrieve the tab's
-        index by the cursor position.
+        :param pixmap: The snapshot
+        :param pos: The global screen position of the cursor
 
-        See QTabBar.tabAt()
+        :type pixmap: QPixmap
+        :type pos: QPoint
         """
-        return self.tabBar().tabAt(pos)
+        self.setPixmap(pixmap)
+        self.adjustSize()
+        self.move(pos + self.OFFSET)
+        self.show()
 
 
-class TabbedWindow(QtGui.QMainWindow):
+class DragScheduler(QtCore.QObject):
     """
-    Subclass of QMainWindow, contains a tab bar to manage a per-window list of
-    tabbed views and allows to add, insert or remove a view.
+    Coalesces the cursor positions received during a Drag&Drop action and
+    applies only the latest one at most once per display frame.
 
-    Views can be standard QWidget instances or even instances of QMainWindow
-    with menu bar and tool bars as well.
+    High polling rate mice can generate hundreds of mouse move events per
+    frame, moving the ghost window for each one of them is a waste because
+    only one position per frame is ever displayed.
 
-    These features will be displayed automatically when the view's tab will be
-    activated and hidden when it'll be deactivated.
+    The number of applied and coalesced updates are available by
+    :py:meth:`.tabbedwindow.DragScheduler.appliedCount()` and
+    :py:meth:`.tabbedwindow.DragScheduler.coalescedCount()` for diagnostics.
     """
 
-    def __init__(self):
+    FRAME_RATE = 60
+
+    def __init__(self, callback, frame_rate=None, parent=None):
         """
-        Empty constructor.
+        Constructor accepts the callable which receives the latest cursor
+        position, the optional target frame rate, by default the refresh rate
+        of the screen, and the optional parent object
 
-        The tabbed's window parent will be the Qt desktop widget.
+        :param callback: Callable accepting the cursor position
+        :param frame_rate: The maximum number of updates per second
+        :param parent: The optional parent object
+
+        :type callback: callable
+        :type frame_rate: float
+        :type parent: QObject
         """
         # Call superclass
-        super(TabbedWindow, self).__init__(QtGui.QApplication.desktop())
+        super(DragScheduler, self).__init__(parent)
 
-        # Public attributes
-        self.tabs = TabWidget(self)
+        # Protected attributes
+        self._callback = callback
+        self._pending = None
+        self._applied = 0
+        self._coalesced = 0
+        self._frame_rate = None
 
-        # Setup window
-        self.tabs.setDocumentMode(True)
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
 
-        self.setCentralWidget(self.tabs)
+        if hasattr(Qt, "PreciseTimer"):
+            self._timer.setTimerType(Qt.PreciseTimer)
 
-    def addView(self, view, text):
+        self.setFrameRate(frame_rate)
+
+    @staticmethod
+    def screenRefreshRate():
         """
-        Add the given view with the given text to this tabbed window and
-        returns the position of the newly created tab
+        Returns the refresh rate of the primary screen, if not available
+        returns :py:attr:`.tabbedwindow.DragScheduler.FRAME_RATE`
 
-        :param view: The view to be added
-        :param text: The title of the view's tab
+        :rtype: float
+        """
+        if QtCore.QT_VERSION >= 0x050000:
+            screen = QtGui.QGuiApplication.primaryScreen()
 
-        :type view: QWidget
-        :type text: string
+            if screen is not None and screen.refreshRate() > 0:
+                return screen.refreshRate()
 
-        :rtype: int
+        return DragScheduler.FRAME_RATE
+
+    def frameRate(self):
         """
-        return self.tabs.addTab(view, text)
+        The maximum number of updates applied per second
 
-    def clone(self, geometry):
+        :rtype: float
         """
-        Clone the current window with the given geometry.
+        return self._frame_rate
 
-        Override this method in your subclass of TabbedWindow to return the
-        instance of the subclass.
+    def setFrameRate(self, frame_rate):
+        """
+        Set the maximum number of updates applied per second, use *None* to
+        follow the refresh rate of the screen
 
-        :param geometry: The geometry of the cloned window
-        :type geometry: QRect
+        :param frame_rate: The maximum number of updates per second
+        :type frame_rate: float
         """
-        wnd = TabbedWindow()
-        wnd.setGeometry(geometry)
+        if frame_rate is None:
+            frame_rate = self.screenRefreshRate()
 
-        return wnd
+        self._frame_rate = frame_rate
+        self._timer.setInterval(max(int(round(1000 / frame_rate)), 1))
 
-    def insertView(self, pos, view, text):
+    def schedule(self, pos):
         """
-        Insert the given view using the given screen's coordinates and using
-        the given text as the tab's title.
+        Schedule the given cursor position to be applied on the next frame,
+        replacing the position not applied yet
 
-        Returns -1 if the insert view operations fails otherwise returns the
-        tabs's index.
+        :param pos: The cursor position
+        :type pos: QPoint
+        """
+        if self._pending is not None:
+            self._coalesced += 1
 
-        :param pos: The screen coordinates where the widget will be inserted
-        :param view: The view to be inserted
-        :param text: The tab's title
+        self._pending = QtCore.QPoint(pos)
 
-        :type pos: QPoint
-        :type view: QWidget
-        :type text: string
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """
+        Apply the pending cursor position immediately
+        """
+        self._timer.stop()
+
+        if self._pending is not None:
+            pos, self._pending = self._pending, None
+            self._applied += 1
+            self._callback(pos)
+
+    def cancel(self):
+        """
+        Discard the pending cursor position without applying it
+        """
+        self._timer.stop()
+        self._pending = None
+
+    def hasPending(self):
+        """
+        Returns *True* if a cursor position is waiting to be applied
+
+        :rtype: bool
+        """
+        return self._pending is not None
+
+    def appliedCount(self):
+        """
+        Number of cursor positions applied since the last reset
 
         :rtype: int
         """
-        index = self.tabs.tabAt(self.tabs.mapFromGlobal(pos))
+        return self._applied
 
-        return self.tabs.insertTab(index, view, text)
+    def coalescedCount(self):
+        """
+        Number of cursor positions dropped because replaced by a newer one
+        before being applied since the last reset
 
-    def removeView(self, index):
+        :rtype: int
         """
-        Remove the view at the given index
+        return self._coalesced
 
-        :param index: The tab's index to be removed
-        :type index: int
+    def resetCounters(self):
         """
-        self.tabs.removeTab(index)
+        Reset the applied and coalesced counters
+        """
+        self._applied = 0
+        self._coalesced = 0
 
-    def setCurrentView(self, index):
+
+class WindowRegistry(object):
+    """
+    Process wide registry of the live :py:class:`.tabbedwindow.TabBar`
+    instances and of their windows.
+
+    The registry keeps a screen-space index of the tab bars' rectangles
+    ordered by their windows' stacking order, the index is used to find the
+    tab bar under the cursor at the end of a Drag&Drop action without walking
+    the widget hierarchy.
+
+    The screen is split in vertical slabs at the left and right edges of every
+    tab bar, each slab holds the tab bars overlapping it sorted from the top
+    most window. A lookup is a binary search of the slab followed by a scan of
+    the few tab bars in it.
+
+    The index is rebuilt lazily on the first lookup after any tab bar or
+    window has been moved, resized, shown, hidden or raised.
+
+    The registry also keeps the location of every view, the window and the
+    tab's index, updated incrementally by the
+    :py:class:`.tabbedwindow.TabWidget` instances when tabs are inserted,
+    removed or moved. See :py:meth:`.tabbedwindow.WindowRegistry.locateView()`
+    and :py:meth:`.tabbedwindow.WindowRegistry.views()`.
+
+    Use :py:meth:`.tabbedwindow.WindowRegistry.instance()` to get the
+    registry.
+    """
+
+    _instance = None
+
+    def __init__(self):
         """
-        Set the view at the given index as the current focused view
+        Empty constructor
+        """
+        # Protected attributes
+        self._tabbars = weakref.WeakKeyDictionary()
+        self._z = 0
+        self._edges = None
+        self._slabs = None
+        self._tables = weakref.WeakKeyDictionary()
+        self._locations = weakref.WeakKeyDictionary()
 
-        :param index; The tab's index to be focused
-        :type index: int
+    @classmethod
+    def instance(cls):
         """
-        self.tabs.setCurrentIndex(index)
+        Returns the process wide registry
 
-    def currentView(self):
+        :rtype: :py:class:`.tabbedwindow.WindowRegistry`
         """
-        Returns the current focused view
+        if cls._instance is None:
+            cls._instance = cls()
 
-        :rtype: QWidget
+        return cls._instance
+
+    def register(self, tabbar):
+        """
+        Add the given tab bar to the registry on top of the existing ones, the
+        tab bar is removed when destroyed
+
+        :param tabbar: The tab bar to be registered
+        :type tabbar: :py:class:`.tabbedwindow.TabBar`
+        """
+        self._z += 1
+        self._tabbars[tabbar] = self._z
+        self.invalidate()
+
+        # The wrapper can outlive the destroyed tab bar until collected
+        tabbar.destroyed.connect(
+            functools.partial(self._tabbar_destroyed, weakref.ref(tabbar)))
+
+    def unregister(self, tabbar):
+        """
+        Remove the given tab bar from the registry
+
+        :param tabbar: The tab bar to be removed
+        :type tabbar: :py:class:`.tabbedwindow.TabBar`
+        """
+        self._tabbars.pop(tabbar, None)
+        self.invalidate()
+
+    def _tabbar_destroyed(self, ref, *args):  # pylint: disable=W0613
+        """
+        Remove the destroyed tab bar referenced by the given weak reference
+        """
+        tabbar = ref()
+
+        if tabbar is not None:
+            self.unregister(tabbar)
+        else:
+            self.invalidate()
+
+    def invalidate(self):
         """
-        return self.tabs.currentWidget()
+        Discard the current index, it will be rebuilt on the next lookup
+        """
+        self._edges = None
+        self._slabs = None
+
+    def raiseWindow(self, wnd):
+        """
+        Move the tab bars of the given window on top of the stacking order
+
+        :param wnd: The raised window
+        :type wnd: QWidget
+        """
+        self._z += 1
+
+        for tabbar in list(self._tabbars.keys()):
+            if tabbar.window() is wnd:
+                self._tabbars[tabbar] = self._z
+
+        self.invalidate()
+
+    def tabBars(self):
+        """
+        Returns the registered tab bars from the top most window
+
+        :rtype: list
+        """
+        items = sorted(
+            self._tabbars.items(), key=lambda item: item[1], reverse=True)
+
+        return [tabbar for tabbar, _ in items]
+
+    def windows(self):
+        """
+        Returns the windows of the registered tab bars from the top most one
+
+        :rtype: list
+        """
+        windows = []
+
+        for tabbar in self.tabBars():
+            wnd = tabbar.window()
+
+            if wnd not in windows:
+                windows.append(wnd)
+
+        return windows
+
+    def tabBarAt(self, pos):
+        """
+        Returns the visible tab bar under the given screen position or *None*
+
+        :param pos: The global screen position
+        :type pos: QPoint
+        :rtype: :py:class:`.tabbedwindow.TabBar`
+        """
+        if self._edges is None:
+            self._build()
+
+        slab = bisect.bisect_right(self._edges, pos.x()) - 1
+
+        if slab < 0 or slab >= len(self._slabs):
+            return None
+
+        for top, bottom, tabbar in self._slabs[slab]:
+            if top <= pos.y() < bottom:
+                return tabbar
+
+        return None
+
+    def _build(self):
+        """
+        Build the index of the visible tab bars' rectangles
+        """
+        rects = []
+
+        for tabbar, z in self._tabbars.items():
+            if not tabbar.isVisible() or tabbar.window().isMinimized():
+                continue
+
+            rect = QtCore.QRect(
+                tabbar.mapToGlobal(QtCore.QPoint(0, 0)), tabbar.size())
+            rects.append((z, rect, tabbar))
+
+        # Split the screen at every vertical edge
+        edges = set()
+
+        for _, rect, _ in rects:
+            edges.add(rect.left())
+            edges.add(rect.left() + rect.width())
+
+        self._edges = sorted(edges)
+        self._slabs = [[] for _ in self._edges]
+
+        # Fill the slabs from the top most tab bar
+        rects.sort(key=lambda item: item[0], reverse=True)
+
+        for _, rect, tabbar in rects:
+            first = bisect.bisect_left(self._edges, rect.left())
+            last = bisect.bisect_left(
+                self._edges, rect.left() + rect.width())
+            entry = (rect.top(), rect.top() + rect.height(), tabbar)
+
+            for slab in range(first, last):
+                self._slabs[slab].append(entry)
+
+    def _table(self, tabs):
+        """
+        Returns the list of pages of the given tab widget and the mapping of
+        the pages to their indices
+
+        :param tabs: The tab widget
+        :type tabs: :py:class:`.tabbedwindow.TabWidget`
+        :rtype: tuple
+        """
+        table = self._tables.get(tabs)
+
+        if table is None:
+            table = self._tables[tabs] = ([], {})
+
+            # Destroyed windows don't remove their tabs
+            tabs.destroyed.connect(
+                functools.partial(self._tabs_destroyed, weakref.ref(tabs)))
+
+        return table
+
+    def _tabs_destroyed(self, ref, *args):  # pylint: disable=W0613
+        """
+        Forget the pages of the destroyed tab widget referenced by the given
+        weak reference
+        """
+        tabs = ref()
+        table = self._tables.pop(tabs, None) if tabs is not None else None
+
+        if table is None:
+            return
+
+        for page in table[0]:
+            location = self._locations.get(page)
+
+            if location is not None and location() is tabs:
+                del self._locations[page]
+
+    @staticmethod
+    def _renumber(table, first, last):
+        """
+        Update the indices of the pages between the given indices included
+        """
+        pages, indices = table
+
+        for index in range(first, min(last, len(pages) - 1) + 1):
+            indices[pages[index]] = index
+
+    def viewInserted(self, tabs, index):
+        """
+        Record the page inserted at the given index of the given tab widget
+
+        :param tabs: The tab widget
+        :param index: The new tab's index
+
+        :type tabs: :py:class:`.tabbedwindow.TabWidget`
+        :type index: int
+        """
+        table = self._table(tabs)
+        page = tabs.widget(index)
+
+        table[0].insert(index, page)
+        self._renumber(table, index, len(table[0]) - 1)
+        self._locations[page] = weakref.ref(tabs)
+
+    def viewRemoved(self, tabs, index):
+        """
+        Forget the page removed at the given index of the given tab widget
+
+        :param tabs: The tab widget
+        :param index: The removed tab's index
+
+        :type tabs: :py:class:`.tabbedwindow.TabWidget`
+        :type index: int
+        """
+        table = self._table(tabs)
+
+        if index >= len(table[0]):
+            return
+
+        page = table[0].pop(index)
+        table[1].pop(page, None)
+        self._renumber(table, index, len(table[0]) - 1)
+
+        location = self._locations.get(page)
+
+        if location is not None and location() is tabs:
+            del self._locations[page]
+
+    def viewMoved(self, tabs, from_index, to_index):
+        """
+        Record the move of a tab of the given tab widget
+
+        :param tabs: The tab widget
+        :param from_index: The tab's old index
+        :param to_index: The tab's new index
+
+        :type tabs: :py:class:`.tabbedwindow.TabWidget`
+        :type from_index: int
+        :type to_index: int
+        """
+        table = self._table(tabs)
+
+        table[0].insert(to_index, table[0].pop(from_index))
+        self._renumber(
+            table, min(from_index, to_index), max(from_index, to_index))
+
+    def locateView(self, view):
+        """
+        Returns the window and the tab's index of the given view or *None* if
+        the view is not in a tabbed window.
+
+        The view can be the page of the tab or the view built by a
+        :py:class:`.tabbedwindow.LazyView` placeholder.
+
+        :param view: The view to be located
+        :type view: QWidget
+        :rtype: tuple
+        """
+        page = view
+
+        if page not in self._locations:
+            try:
+                parent = view.parentWidget()
+            except RuntimeError:
+                # The view has been deleted
+                return None
+
+            if isinstance(parent, LazyView) and parent.view() is view:
+                page = parent
+
+        location = self._locations.get(page)
+        tabs = location() if location is not None else None
+
+        if tabs is None:
+            self._locations.pop(page, None)
+            return None
+
+        index = self._table(tabs)[1].get(page)
+
+        if index is None:
+            return None
+
+        return tabs.window(), index
+
+    def viewAt(self, wnd, index):
+        """
+        Returns the view at the given index of the given tabbed window, see
+        :py:meth:`.tabbedwindow.TabWidget.view()`
+
+        :param wnd: The tabbed window
+        :param index: The tab's index
+
+        :type wnd: :py:class:`.tabbedwindow.TabbedWindow`
+        :type index: int
+
+        :rtype: QWidget
+        """
+        return wnd.tabs.view(index)
+
+    def views(self):
+        """
+        Iterates over the views of all the tabbed windows returning tuples of
+        view, window and tab's index
+
+        :rtype: iterator
+        """
+        for tabs, (pages, _) in list(self._tables.items()):
+            wnd = tabs.window()
+
+            for index in range(len(pages)):
+                yield tabs.view(index), wnd, index
+
+    def activateView(self, view):
+        """
+        Set the given view as the current one of its window and raise the
+        window, returns *False* if the view is not in a tabbed window
+
+        :param view: The view to be activated
+        :type view: QWidget
+        :rtype: bool
+        """
+        location = self.locateView(view)
+
+        if location is None:
+            return False
+
+        wnd, index = location
+
+        wnd.setCurrentView(index)
+        wnd.raise_()
+        wnd.activateWindow()
+
+        return True
+
+
+class DropIndicator(object):
+    """
+    Live feedback of the drop target during a Drag&Drop action: highlights
+    the tab bar under the cursor and shows a caret where the dragged tab will
+    be inserted.
+
+    The hit test is cached, the tab bar and the insertion index are resolved
+    again only when the cursor leaves the rectangle of the tab, or of the
+    empty area of the tab bar, found by the previous hit test. The insertion
+    index is the same one returned by
+    :py:meth:`.tabbedwindow.TabBar.dropIndex()`.
+    """
+
+    CARET_WIDTH = 2
+
+    def __init__(self):
+        """
+        Empty constructor
+        """
+        # Protected attributes
+        self._tabbar = None
+        self._index = -1
+        self._rect = None
+        self._frame = None
+        self._caret = None
+        self._source = None
+        self._indices = []
+
+    def target(self):
+        """
+        The tab bar under the cursor or *None*
+
+        :rtype: :py:class:`.tabbedwindow.TabBar`
+        """
+        return self._tabbar
+
+    def index(self):
+        """
+        The insertion index into the target tab bar, -1 means after the last
+        tab
+
+        :rtype: int
+        """
+        return self._index
+
+    def update(self, pos, source=None, indices=None):
+        """
+        Update the feedback for the given cursor position, the optional tab
+        bar and indices of the dragged tabs place the caret where an in-place
+        move will put them
+
+        :param pos: The global screen position of the cursor
+        :param source: The tab bar of the dragged tabs
+        :param indices: The sorted indices of the dragged tabs
+
+        :type pos: QPoint
+        :type source: :py:class:`.tabbedwindow.TabBar`
+        :type indices: list
+        """
+        self._source = source
+        self._indices = indices or []
+
+        # Nothing changed if the cursor is still in the same area
+        if self._rect is not None and self._rect.contains(pos):
+            return
+
+        tabbar = WindowRegistry.instance().tabBarAt(pos)
+
+        if tabbar is None:
+            self.clear()
+            return
+
+        index = tabbar.dropIndex(pos)
+        local = tabbar.mapFromGlobal(pos)
+
+        # Cache the rectangle of the tab or of the empty area of the tab bar
+        if index > -1:
+            rect = tabbar.tabRect(index)
+        else:
+            rect = tabbar.rect()
+
+            if tabbar.count():
+                rect.setLeft(tabbar.tabRect(tabbar.count() - 1).right() + 1)
+
+        if rect.contains(local):
+            self._rect = rect.translated(tabbar.mapToGlobal(QtCore.QPoint()))
+        else:
+            self._rect = None
+
+        # Update feedback only if the target has changed
+        if tabbar is not self._tabbar or index != self._index:
+            self._show(tabbar, index)
+
+    def clear(self):
+        """
+        Hide the feedback and reset the cached hit test
+        """
+        for band in (self._frame, self._caret):
+            if band is not None:
+                band.hide()
+
+        self._tabbar = None
+        self._index = -1
+        self._rect = None
+
+    def close(self):
+        """
+        Hide and destroy the feedback's widgets
+        """
+        self.clear()
+
+        for band in (self._frame, self._caret):
+            if band is not None:
+                band.deleteLater()
+
+        self._frame = None
+        self._caret = None
+
+    def _show(self, tabbar, index):
+        """
+        Highlight the given tab bar and show the caret at the given index
+
+        :param tabbar: The target tab bar
+        :param index: The insertion index, -1 after the last tab
+
+        :type tabbar: :py:class:`.tabbedwindow.TabBar`
+        :type index: int
+        """
+        if self._frame is None:
+            self._frame = QtGui.QRubberBand(QtGui.QRubberBand.Rectangle)
+            self._caret = QtGui.QRubberBand(QtGui.QRubberBand.Line)
+
+        # Move the feedback's widgets into the new target
+        if tabbar is not self._tabbar:
+            self._frame.setParent(tabbar)
+            self._caret.setParent(tabbar)
+
+        x = self._caret_x(tabbar, index)
+
+        self._frame.setGeometry(tabbar.rect())
+        self._caret.setGeometry(
+            x - self.CARET_WIDTH // 2, 0, self.CARET_WIDTH, tabbar.height())
+
+        self._frame.show()
+        self._caret.show()
+        self._caret.raise_()
+
+        self._tabbar = tabbar
+        self._index = index
+
+    def _caret_x(self, tabbar, index):
+        """
+        Returns the position of the caret for the given insertion index: on
+        the left edge of the tab or after the last one, for an in-place move
+        before the first tab not dragged that follows the dragged tabs
+        """
+        count = tabbar.count()
+
+        if tabbar is self._source and self._indices:
+            # Same index semantics of TabBar._move_tab() and
+            # TabBar._move_tabs()
+            moved = set(self._indices)
+            others = [i for i in range(count) if i not in moved]
+
+            if others:
+                index = _block_position(index, self._indices, count)
+
+                if index < len(others):
+                    return tabbar.tabRect(others[index]).left()
+
+                return tabbar.tabRect(others[-1]).right() + 1
+
+        if index > -1:
+            return tabbar.tabRect(index).left()
+
+        if count:
+            return tabbar.tabRect(count - 1).right() + 1
+
+        return 0
+
+
+class WindowPool(QtCore.QObject):
+    """
+    Pool of hidden, fully constructed windows ready to receive a torn-off
+    tab.
+
+    The pool is disabled by default, enable it by setting its size with
+    :py:meth:`.tabbedwindow.WindowPool.setSize()`. Windows are created by the
+    :py:meth:`.tabbedwindow.TabbedWindow.clone()` method of the window from
+    which the tab is torn off, so subclasses still decide the type of the new
+    window, and the pool is refilled one window at a time when the event loop
+    is idle.
+
+    Windows closed without tabs left go back into the pool if there's room
+    for them.
+
+    Use :py:meth:`.tabbedwindow.WindowPool.instance()` to get the pool.
+    """
+
+    _instance = None
+
+    def __init__(self, size=0, parent=None):
+        """
+        Constructor accepts the number of windows to keep ready for every
+        type of window and the optional parent object
+
+        :param size: The number of windows to keep ready
+        :param parent: The optional parent object
+
+        :type size: int
+        :type parent: QObject
+        """
+        # Call superclass
+        super(WindowPool, self).__init__(parent)
+
+        # Protected attributes
+        self._size = size
+        self._windows = {}
+        self._templates = weakref.WeakValueDictionary()
+        self._products = {}
+        self._refill_pending = False
+
+    @classmethod
+    def instance(cls):
+        """
+        Returns the process wide pool
+
+        :rtype: :py:class:`.tabbedwindow.WindowPool`
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+
+        return cls._instance
+
+    def size(self):
+        """
+        The number of windows kept ready for every type of window
+
+        :rtype: int
+        """
+        return self._size
+
+    def setSize(self, size):
+        """
+        Set the number of windows kept ready for every type of window, 0
+        disables the pool and releases the pooled windows
+
+        :param size: The number of windows to keep ready
+        :type size: int
+        """
+        self._size = size
+
+        for windows in self._windows.values():
+            while len(windows) > size:
+                windows.pop().deleteLater()
+
+    def count(self, source=None):
+        """
+        Returns the number of pooled windows for the type of the given source
+        window or for all the types if *None*
+
+        :param source: The window from which tabs are torn off
+        :type source: :py:class:`.tabbedwindow.TabbedWindow`
+        :rtype: int
+        """
+        if source is None:
+            return sum(len(windows) for windows in self._windows.values())
+
+        return len(self._windows.get(type(source), []))
+
+    def acquire(self, source, geometry):
+        """
+        Returns a window with the given geometry for a tab torn off the given
+        window, a pooled one if available otherwise a new one created by
+        :py:meth:`.tabbedwindow.TabbedWindow.clone()`
+
+        :param source: The window from which the tab is torn off
+        :param geometry: The geometry of the new window
+
+        :type source: :py:class:`.tabbedwindow.TabbedWindow`
+        :type geometry: QRect
+
+        :rtype: :py:class:`.tabbedwindow.TabbedWindow`
+        """
+        windows = self._windows.get(type(source), [])
+
+        if windows:
+            wnd = windows.pop()
+            wnd.setGeometry(geometry)
+        else:
+            wnd = self._clone(source, geometry)
+
+        if self._size > 0:
+            self._templates[type(source)] = source
+            self._schedule_refill()
+
+        return wnd
+
+    def release(self, wnd):
+        """
+        Put the given closed window without tabs into the pool if there's room
+        for it, returns *True* if the window has been pooled
+
+        :param wnd: The released window
+        :type wnd: :py:class:`.tabbedwindow.TabbedWindow`
+        :rtype: bool
+        """
+        if wnd.tabs.count() or wnd.testAttribute(Qt.WA_DeleteOnClose):
+            return False
+
+        for key, product in self._products.items():
+            windows = self._windows.setdefault(key, [])
+
+            if product is type(wnd) and len(windows) < self._size:
+                if wnd not in windows:
+                    windows.append(wnd)
+
+                return True
+
+        return False
+
+    def fill(self, source):
+        """
+        Create the missing windows for the type of the given window
+        immediately
+
+        :param source: The window from which tabs will be torn off
+        :type source: :py:class:`.tabbedwindow.TabbedWindow`
+        """
+        windows = self._windows.setdefault(type(source), [])
+
+        while len(windows) < self._size:
+            windows.append(self._clone(source, source.geometry()))
+
+    def _clone(self, source, geometry):
+        """
+        Create a new window with the given geometry by cloning the given
+        window
+
+        :param source: The window to be cloned
+        :param geometry: The geometry of the new window
+
+        :type source: :py:class:`.tabbedwindow.TabbedWindow`
+        :type geometry: QRect
+
+        :rtype: :py:class:`.tabbedwindow.TabbedWindow`
+        """
+        wnd = source.clone(geometry)
+        self._products[type(source)] = type(wnd)
+
+        return wnd
+
+    def _schedule_refill(self):
+        """
+        Refill the pool when the event loop is idle
+        """
+        if not self._refill_pending:
+            self._refill_pending = True
+            QtCore.QTimer.singleShot(0, self._refill)
+
+    def _refill(self):
+        """
+        Create one missing window and schedule the next one
+        """
+        self._refill_pending = False
+
+        for key, source in list(self._templates.items()):
+            windows = self._windows.setdefault(key, [])
+
+            if len(windows) < self._size:
+                windows.append(self._clone(source, source.geometry()))
+                self._schedule_refill()
+                return
+
+
+class DragObserver(object):
+    """
+    Base class of the observers of the Drag&Drop actions of the tab bars.
+
+    Observers are registered by
+    :py:meth:`.tabbedwindow.TabBar.addDragObserver()` and receive the start
+    time and duration of every phase of the Drag&Drop action, see
+    :py:meth:`.tabbedwindow.DragObserver.dragPhase()`. Times are in seconds
+    and taken from ``timeit.default_timer()``.
+
+    When no observers are registered the phases are not timed at all.
+    """
+
+    # Mouse press over a tab
+    PRESS = "press"
+    # The cursor moved farther than the drag distance, timed from the press
+    THRESHOLD = "threshold"
+    # Creation of the ghost window
+    GHOST = "ghost"
+    # Move of the ghost window and update of the drop feedback
+    MOVE = "move"
+    # Resolution of the tab bar under the cursor at the drop
+    RESOLVE = "resolve"
+    # Drop of the tab, the detail is the chosen branch
+    DROP = "drop"
+    # Clean up at the mouse release
+    RELEASE = "release"
+
+    # Move of the dropped views into another window, the detail is the path
+    REPARENT = "reparent"
+
+    # Branches of the drop phase
+    MOVE_TAB = "move_tab"
+    MOVE_TO_WINDOW = "move_to_window"
+    NEW_WINDOW = "new_window"
+    MOVE_WINDOW = "move_window"
+
+    # Paths of the reparent phase
+    FAST_PATH = "fast"
+    SLOW_PATH = "slow"
+
+    # Reasons of the slow reparent path
+    NATIVE_WINDOW = "native_window"
+    OPENGL = "opengl"
+    STYLE_SHEET = "style_sheet"
+    STYLE = "style"
+
+    def dragPhase(self, tabbar, phase, start, duration, detail=None):
+        """
+        Called at the end of every phase of a Drag&Drop action, does nothing
+        by default
+
+        :param tabbar: The tab bar where the Drag&Drop action is generated
+        :param phase: The phase, one of the class' constants
+        :param start: The start time of the phase
+        :param duration: The duration of the phase
+        :param detail: The drop's branch for the drop phase, the path for
+                       the reparent phase, otherwise *None*
+
+        :type tabbar: :py:class:`.tabbedwindow.TabBar`
+        :type phase: string
+        :type start: float
+        :type duration: float
+        :type detail: string
+        """
+
+    def slowReparent(self, tabbar, view, reasons):
+        """
+        Called for every view moved between windows whose reparenting is
+        expensive, see :py:meth:`.tabbedwindow.TabBar.reparentCosts()`, does
+        nothing by default
+
+        :param tabbar: The tab bar where the Drag&Drop action is generated
+        :param view: The moved view
+        :param reasons: The reasons, some of the class' constants
+
+        :type tabbar: :py:class:`.tabbedwindow.TabBar`
+        :type view: QWidget
+        :type reasons: list
+        """
+
+
+class DragStatistics(DragObserver):
+    """
+    Drag observer aggregating the durations of the phases.
+
+    The last :py:attr:`.tabbedwindow.DragStatistics.SAMPLES` durations of
+    every phase are kept to compute percentiles, the drop phase is aggregated
+    per branch as ``drop:<branch>`` and the reparent phase per path as
+    ``reparent:<path>``.
+    """
+
+    SAMPLES = 1000
+
+    def __init__(self, samples=None):
+        """
+        Constructor accepts the optional number of durations kept per phase
+
+        :param samples: The number of durations kept per phase
+        :type samples: int
+        """
+        # Protected attributes
+        self._samples = samples or self.SAMPLES
+        self._durations = {}
+        self._counts = collections.Counter()
+        self._reasons = collections.Counter()
+
+    def dragPhase(self, tabbar, phase, start, duration, detail=None):
+        """
+        See :py:meth:`.tabbedwindow.DragObserver.dragPhase()`
+        """
+        key = phase if detail is None else "{0}:{1}".format(phase, detail)
+
+        if key not in self._durations:
+            self._durations[key] = collections.deque(maxlen=self._samples)
+
+        self._durations[key].append(duration)
+        self._counts[key] += 1
+
+    def slowReparent(self, tabbar, view, reasons):  # pylint: disable=W0613
+        """
+        See :py:meth:`.tabbedwindow.DragObserver.slowReparent()`
+        """
+        self._reasons.update(reasons)
+
+    def slowReparents(self):
+        """
+        Returns how many views have been moved by the slow reparent path for
+        every reason
+
+        :rtype: dict
+        """
+        return dict(self._reasons)
+
+    def phases(self):
+        """
+        Returns the names of the recorded phases
+
+        :rtype: list
+        """
+        return sorted(self._durations)
+
+    def count(self, phase):
+        """
+        Returns the number of times the given phase has been recorded
+
+        :param phase: The phase's name
+        :type phase: string
+        :rtype: int
+        """
+        return self._counts[phase]
+
+    def percentile(self, phase, percent):
+        """
+        Returns the given percentile of the recorded durations of the given
+        phase or *None* if the phase was never recorded
+
+        :param phase: The phase's name
+        :param percent: The percentile between 0 and 100
+
+        :type phase: string
+        :type percent: float
+
+        :rtype: float
+        """
+        durations = sorted(self._durations.get(phase, ()))
+
+        if not durations:
+            return None
+
+        rank = int(math.ceil(percent / 100 * len(durations))) - 1
+
+        return durations[min(max(rank, 0), len(durations) - 1)]
+
+    def summary(self):
+        """
+        Returns the count, median, 99th percentile and maximum duration of
+        every recorded phase
+
+        :rtype: dict
+        """
+        return dict(
+            (phase, {
+                "count": self._counts[phase],
+                "p50": self.percentile(phase, 50),
+                "p99": self.percentile(phase, 99),
+                "max": max(self._durations[phase]),
+            })
+            for phase in self._durations
+        )
+
+    def reset(self):
+        """
+        Discard the recorded durations
+        """
+        self._durations.clear()
+        self._counts.clear()
+        self._reasons.clear()
+
+
+class TabBar(QtGui.QTabBar):
+    """
+    Re-implemented the standard QTabBar widget but adds new methods to allow
+    Drag&Drop operations outside the tab bar's window, like creating a new
+    window with a dragged view, move a view into a different window or close
+    the current window if no more tabs are available
+
+    During the Drag&Drop action the ghost window is moved at most
+    :py:attr:`.tabbedwindow.TabBar.DRAG_FRAME_RATE` times per second, by
+    default following the screen's refresh rate.
+
+    The tabs' rectangles are cached and
+    :py:meth:`.tabbedwindow.TabBar.tabAt()` finds the tab with a binary
+    search, the cache is invalidated every time the tabs' layout changes.
+
+    The phases of the Drag&Drop actions of all the tab bars can be timed by
+    registering a :py:class:`.tabbedwindow.DragObserver` with
+    :py:meth:`.tabbedwindow.TabBar.addDragObserver()`.
+
+    With thousands of tabs enable the virtualized mode with
+    :py:meth:`.tabbedwindow.TabBar.setVirtualized()`: all the tabs have the
+    same length so no text is measured, only the visible tabs are painted,
+    :py:meth:`.tabbedwindow.TabBar.tabAt()` takes constant time and the
+    mouse wheel scrolls a page of tabs at once.
+
+    Many tabs can be selected with Ctrl-click and Shift-click, dragging one of
+    the selected tabs moves all of them at once.
+    """
+
+    VERTICAL_SHAPES = (
+        QtGui.QTabBar.RoundedWest, QtGui.QTabBar.RoundedEast,
+        QtGui.QTabBar.TriangularWest, QtGui.QTabBar.TriangularEast,
+    )
+
+    _drag_observers = []
+
+    DRAG_FRAME_RATE = None
+
+    VIRTUAL_TAB_LENGTH = 160
+
+    OVERFLOW_CHUNK = 50
+
+    def __init__(self, *args, **kwds):
+        """
+        See QTabBar
+        """
+        # Call superclass
+        super(TabBar, self).__init__(*args, **kwds)
+
+        # Protected attributes
+        self._ghost = None
+        self._ghost_renderer = None
+        self._press_pos = None
+        self._press_index = -1
+        self._press_time = 0.0
+        self._drag_distance = 0
+        self._scheduler = DragScheduler(
+            self._move_ghost, self.DRAG_FRAME_RATE, self)
+        self._indicator = DropIndicator()
+        self._tab_rects = None
+        self._tab_keys = None
+        self._tab_key = None
+        self._tab_origin = QtCore.QPoint()
+        self._preview = None
+        self._previews = False
+        self._virtual = False
+        self._virtual_size = None
+        self._overflow_button = None
+        self._selection = []
+        self._selection_anchor = None
+
+        self.currentChanged.connect(self._invalidate_tabs)
+
+        # Register the tab bar as a drop target
+        WindowRegistry.instance().register(self)
+
+    @classmethod
+    def addDragObserver(cls, observer):
+        """
+        Register the given observer of the Drag&Drop actions of all the tab
+        bars
+
+        :param observer: The observer to be registered
+        :type observer: :py:class:`.tabbedwindow.DragObserver`
+        """
+        if observer not in TabBar._drag_observers:
+            TabBar._drag_observers.append(observer)
+
+    @classmethod
+    def removeDragObserver(cls, observer):
+        """
+        Unregister the given observer
+
+        :param observer: The observer to be removed
+        :type observer: :py:class:`.tabbedwindow.DragObserver`
+        """
+        if observer in TabBar._drag_observers:
+            TabBar._drag_observers.remove(observer)
+
+    def _notify_drag(self, phase, start, detail=None):
+        """
+        Notify the given phase started at the given time to the registered
+        observers and returns the current time
+
+        :param phase: The phase of the Drag&Drop action
+        :param start: The start time of the phase
+        :param detail: The optional detail of the phase
+
+        :type phase: string
+        :type start: float
+        :type detail: string
+
+        :rtype: float
+        """
+        now = default_timer()
+
+        for observer in list(self._drag_observers):
+            observer.dragPhase(self, phase, start, now - start, detail)
+
+        return now
+
+    def tabPreviews(self):
+        """
+        Returns *True* if hovering a tab shows the snapshot of its view
+
+        :rtype: bool
+        """
+        return self._previews
+
+    def setTabPreviews(self, enabled):
+        """
+        Enable or disable the snapshots of the views shown while hovering the
+        tabs, the snapshots are taken from the
+        :py:class:`.tabbedwindow.SnapshotCache`
+
+        :param enabled: Show the previews
+        :type enabled: bool
+        """
+        self._previews = enabled
+
+        if not enabled:
+            self._hide_preview()
+
+    def _show_preview(self, index, pos):
+        """
+        Show the preview of the tab at the given index, returns *False* if the
+        view has no snapshot
+
+        :param index: The tab's index
+        :param pos: The global screen position of the cursor
+
+        :type index: int
+        :type pos: QPoint
+
+        :rtype: bool
+        """
+        page = self.parent().widget(index)
+
+        # Views not built yet have nothing to show
+        if page is None:
+            return False
+
+        if isinstance(page, LazyView) and not page.isMaterialized():
+            return False
+
+        if self._preview is None:
+            self._preview = TabPreview()
+
+        self._preview.showSnapshot(
+            SnapshotCache.instance().snapshot(page), pos)
+
+        return True
+
+    def _hide_preview(self):
+        """
+        Hide the tab's preview if visible
+        """
+        if self._preview is not None:
+            self._preview.hide()
+
+    def event(self, event):
+        """
+        Show the preview of the hovered tab in place of the tooltip if the
+        previews are enabled.
+
+        See QWidget.event()
+        """
+        if self._previews:
+            if event.type() == QtCore.QEvent.ToolTip:
+                index = self.tabAt(event.pos())
+
+                if index > -1 and index != self.currentIndex():
+                    if self._show_preview(index, event.globalPos()):
+                        return True
+
+                self._hide_preview()
+
+            elif event.type() in (QtCore.QEvent.Leave,
+                                  QtCore.QEvent.MouseButtonPress,
+                                  QtCore.QEvent.Hide):
+                self._hide_preview()
+
+        return super(TabBar, self).event(event)
+
+    def isVirtualized(self):
+        """
+        Returns *True* if the tab bar is in virtualized mode
+
+        :rtype: bool
+        """
+        return self._virtual
+
+    def setVirtualized(self, enabled):
+        """
+        Enable or disable the virtualized mode.
+
+        In virtualized mode all the tabs are
+        :py:attr:`.tabbedwindow.TabBar.VIRTUAL_TAB_LENGTH` pixels long with the
+        text elided, the tab bar scrolls instead of shrinking the tabs.
+
+        :param enabled: Enable the virtualized mode
+        :type enabled: bool
+        """
+        self._virtual = enabled
+        self._virtual_size = None
+
+        if enabled:
+            self.setUsesScrollButtons(True)
+            self.setExpanding(False)
+            self.setElideMode(Qt.ElideRight)
+
+        self._invalidate_tabs()
+        self.updateGeometry()
+        self.update()
+
+    def tabSizeHint(self, index):
+        """
+        In virtualized mode returns the same size for all the tabs without
+        measuring their text.
+
+        See QTabBar.tabSizeHint()
+        """
+        if not self._virtual:
+            return super(TabBar, self).tabSizeHint(index)
+
+        if self._virtual_size is None:
+            hint = super(TabBar, self).tabSizeHint(index)
+
+            if self.shape() in self.VERTICAL_SHAPES:
+                self._virtual_size = QtCore.QSize(
+                    hint.width(), self.VIRTUAL_TAB_LENGTH)
+            else:
+                self._virtual_size = QtCore.QSize(
+                    self.VIRTUAL_TAB_LENGTH, hint.height())
+
+        return QtCore.QSize(self._virtual_size)
+
+    def _virtual_tab_at(self, pos):
+        """
+        Returns the index of the tab at the given position in virtualized mode
+        without checking the tabs' range
+        """
+        first = self.tabRect(0)
+
+        if self.shape() in self.VERTICAL_SHAPES:
+            return (pos.y() - first.top()) // max(first.height(), 1)
+        elif self.isRightToLeft():
+            return (first.right() - pos.x()) // max(first.width(), 1)
+
+        return (pos.x() - first.left()) // max(first.width(), 1)
+
+    def visibleRange(self):
+        """
+        Returns the indices of the first and of the last visible tabs, the
+        last index is lower than the first one if no tabs are visible
+
+        :rtype: tuple
+        """
+        count = self.count()
+
+        if count == 0:
+            return 0, -1
+
+        rect = self.rect()
+
+        if self.isRightToLeft() and self.shape() not in self.VERTICAL_SHAPES:
+            start, end = rect.topRight(), rect.bottomLeft()
+        else:
+            start, end = rect.topLeft(), rect.bottomRight()
+
+        if self._virtual:
+            first = self._virtual_tab_at(start)
+            last = self._virtual_tab_at(end)
+        else:
+            start = self._cached_pos(start)
+            end = self._cached_pos(end)
+
+            first = bisect.bisect_left(self._tab_keys, self._tab_key(start))
+            last = bisect.bisect_left(self._tab_keys, self._tab_key(end))
+
+        return max(first, 0), min(last, count - 1)
+
+    def paintEvent(self, event):
+        """
+        In virtualized mode paints only the visible tabs.
+
+        See QWidget.paintEvent()
+        """
+        if not self._virtual:
+            super(TabBar, self).paintEvent(event)
+            return
+
+        painter = QtGui.QStylePainter(self)
+        first, last = self.visibleRange()
+        current = self.currentIndex()
+
+        if self.drawBase():
+            self._paint_base(painter, first, last, current)
+
+        # The current tab is painted over its neighbours
+        for index in range(first, last + 1):
+            if index != current:
+                self._paint_tab(painter, index)
+
+        if first <= current <= last:
+            self._paint_tab(painter, current)
+
+    def _paint_tab(self, painter, index):
+        """
+        Paint the tab at the given index
+        """
+        option = QtGui.QStyleOptionTabV3()
+        self.initStyleOption(option, index)
+
+        painter.drawControl(QtGui.QStyle.CE_TabBarTab, option)
+
+    def _paint_base(self, painter, first, last, current):
+        """
+        Paint the tab bar's base under the visible tabs
+        """
+        option = QtGui.QStyleOptionTabBarBaseV2()
+        option.initFrom(self)
+        option.shape = self.shape()
+        option.documentMode = self.documentMode()
+
+        if first <= last:
+            option.tabBarRect = self.tabRect(first).united(self.tabRect(last))
+
+        if first <= current <= last:
+            option.selectedTabRect = self.tabRect(current)
+
+        overlap = self.style().pixelMetric(
+            QtGui.QStyle.PM_TabBarBaseOverlap, None, self)
+        rect = self.rect()
+
+        if self.shape() in (QtGui.QTabBar.RoundedNorth,
+                            QtGui.QTabBar.TriangularNorth):
+            rect.setTop(rect.bottom() - overlap + 1)
+        elif self.shape() in (QtGui.QTabBar.RoundedSouth,
+                              QtGui.QTabBar.TriangularSouth):
+            rect.setBottom(rect.top() + overlap - 1)
+        elif self.shape() in (QtGui.QTabBar.RoundedWest,
+                              QtGui.QTabBar.TriangularWest):
+            rect.setLeft(rect.right() - overlap + 1)
+        else:
+            rect.setRight(rect.left() + overlap - 1)
+
+        option.rect = rect
+
+        painter.drawPrimitive(QtGui.QStyle.PE_FrameTabBarBase, option)
+
+    def wheelEvent(self, event):
+        """
+        In virtualized mode the mouse wheel moves the current tab by a page of
+        visible tabs.
+
+        See QWidget.wheelEvent()
+        """
+        if not self._virtual or not self.count():
+            super(TabBar, self).wheelEvent(event)
+            return
+
+        first, last = self.visibleRange()
+        steps = event.delta() // 120 or (1 if event.delta() > 0 else -1)
+        index = self.currentIndex() - steps * max(last - first, 1)
+
+        self.setCurrentIndex(min(max(index, 0), self.count() - 1))
+
+        event.accept()
+
+    def overflowButton(self):
+        """
+        Returns the button with the menu to jump to any tab, the menu is built
+        only when shown and with many tabs it's split in sub-menus of
+        :py:attr:`.tabbedwindow.TabBar.OVERFLOW_CHUNK` tabs
+
+        :rtype: QToolButton
+        """
+        if self._overflow_button is None:
+            menu = QtGui.QMenu(self)
+            menu.aboutToShow.connect(
+                functools.partial(self._fill_overflow_menu, menu))
+
+            button = QtGui.QToolButton(self)
+            button.setArrowType(Qt.DownArrow)
+            button.setAutoRaise(True)
+            button.setPopupMode(QtGui.QToolButton.InstantPopup)
+            button.setMenu(menu)
+
+            self._overflow_button = button
+
+        return self._overflow_button
+
+    def _fill_overflow_menu(self, menu, first=0, last=None):
+        """
+        Fill the given menu with the tabs from the first to the last index, a
+        sub-menu is created for every chunk of tabs if they are too many
+        """
+        if last is None:
+            last = self.count() - 1
+
+        menu.clear()
+
+        for submenu in menu.findChildren(QtGui.QMenu):
+            if submenu.parent() is menu:
+                submenu.deleteLater()
+
+        chunk = self.OVERFLOW_CHUNK
+
+        if last - first < chunk:
+            for index in range(first, last + 1):
+                action = menu.addAction(self.tabText(index))
+                action.triggered.connect(
+                    functools.partial(self.setCurrentIndex, index))
+
+                if index == self.currentIndex():
+                    action.setCheckable(True)
+                    action.setChecked(True)
+
+            return
+
+        # Split the tabs in chunks, each one filled when shown
+        size = chunk
+
+        while (last - first + 1) > size * chunk:
+            size *= chunk
+
+        for start in range(first, last + 1, size):
+            end = min(start + size - 1, last)
+            submenu = menu.addMenu("{0} - {1}".format(start + 1, end + 1))
+            submenu.aboutToShow.connect(functools.partial(
+                self._fill_overflow_menu, submenu, start, end))
+
+    def selectedIndices(self):
+        """
+        Returns the sorted indices of the selected tabs
+
+        :rtype: list
+        """
+        views = self.parent()
+
+        indices = (views.indexOf(page) for page in self._selection)
+
+        return sorted(index for index in indices if index > -1)
+
+    def setSelectedIndices(self, indices):
+        """
+        Select the tabs at the given indices
+
+        :param indices: The tabs' indices
+        :type indices: iterable
+        """
+        views = self.parent()
+
+        for page in self._selection:
+            index = views.indexOf(page)
+
+            if index > -1:
+                self.setTabTextColor(index, QtGui.QColor())
+
+        self._selection = []
+
+        color = self.palette().color(QtGui.QPalette.Highlight)
+
+        for index in sorted(set(indices)):
+            self._selection.append(views.widget(index))
+            self.setTabTextColor(index, color)
+
+    def clearSelection(self):
+        """
+        Deselect all the tabs
+        """
+        if self._selection:
+            self.setSelectedIndices([])
+
+        self._selection_anchor = None
+
+    def _select(self, index, modifiers):
+        """
+        Update the selection by a click with the given keyboard modifiers on
+        the tab at the given index, returns *True* if the selection changed
+        """
+        selected = self.selectedIndices()
+
+        if modifiers & Qt.ShiftModifier:
+            if self._selection_anchor is None:
+                self._selection_anchor = self.currentIndex()
+
+            first = min(self._selection_anchor, index)
+            last = max(self._selection_anchor, index)
+
+            self.setSelectedIndices(range(first, last + 1))
+
+        elif modifiers & Qt.ControlModifier:
+            # Selection starts from the current tab
+            if not selected:
+                selected = [self.currentIndex()]
+
+            if index in selected:
+                selected.remove(index)
+            else:
+                selected.append(index)
+
+            self._selection_anchor = index
+            self.setSelectedIndices(selected)
+
+        else:
+            return False
+
+        return True
+
+    def dragScheduler(self):
+        """
+        Returns the scheduler which coalesces the ghost window's moves
+
+        :rtype: :py:class:`.tabbedwindow.DragScheduler`
+        """
+        return self._scheduler
+
+    def ghostRenderer(self):
+        """
+        Returns the renderer used to paint the ghost window during the
+        Drag&Drop action.
+
+        If not set with :py:meth:`.tabbedwindow.TabBar.setGhostRenderer()` the
+        renderer is the tab bar's window
+        :py:attr:`.tabbedwindow.TabbedWindow.GHOST_RENDERER` attribute.
+
+        :rtype: :py:class:`.tabbedwindow.GhostRenderer`
+        """
+        if self._ghost_renderer is not None:
+            return self._ghost_renderer
+
+        return getattr(self.window(), "GHOST_RENDERER", GhostWindow.RENDERER)
+
+    def setGhostRenderer(self, renderer):
+        """
+        Set the renderer used to paint the ghost window of this tab bar, use
+        *None* to restore the window's default renderer
+
+        :param renderer: The ghost window's renderer
+        :type renderer: :py:class:`.tabbedwindow.GhostRenderer`
+        """
+        self._ghost_renderer = renderer
+
+    @_traced("TabBar._create_new_window",
+             lambda self, ghost_wnd: _describe_drag(self, ghost_wnd))
+    def _create_new_window(self, ghost_wnd):
+        """
+        Creates and returns new window fetching geometry information from the
+        given :py:class:`.tabbedwindow.GhostWindow` instance and moving the
+        view at the index referenced by
+        :py:meth:`.tabbedwindow.GhostWindow.index()` into the newly created
+        window.
+
+        :param ghost_wnd: The ghost windows instance from the D&D action
+        :type ghost_wnd: :py:class:`.tabbedwindow.GhostWindow`
+        :rtype: :py:class:`.tabbedwindow.TabbedWindow`
+        """
+        # Create new window, taken from the pool if available
+        wnd = WindowPool.instance().acquire(
+            self.window(), ghost_wnd.geometry())
+
+        # Move the tabs while the new window is hidden so it's laid out only
+        # once when shown
+        self._transfer(wnd, ghost_wnd.indices())
+
+        # Show new windows
+        wnd.show()
+
+        return wnd
+
+    @_traced("TabBar._move_to_window",
+             lambda self, tabbed_wnd, pos, ghost_wnd: _describe_drag(
+                 self, ghost_wnd, target=_object_id(tabbed_wnd)))
+    def _move_to_window(self, tabbed_wnd, pos, ghost_wnd):
+        """
+        Move the view at the index referenced by the
+        :py:meth:`.tabbedwindow.GhostWindow.index()` attribute into the given
+        tabbed window and at the given current position
+
+        :param tabbed_wnd: The target tabbed window instance
+        :param pos: The global screen position where the view will be inserted
+        :param ghost_wnd: The dragged ghost window
+
+        :type tabbed_wnd: :py:class:`.tabbedwindow.TabbedWindow`
+        :type pos: QPoint
+        :type ghost_wnd: :py:class:`.tabbedwindow.GhostWindow`
+        """
+        index = self._transfer(tabbed_wnd, ghost_wnd.indices(), pos)[0]
+
+        # Set it as the current tab and raise focus to the window
+        tabbed_wnd.setCurrentView(index)
+        tabbed_wnd.raise_()
+
+        WindowRegistry.instance().raiseWindow(tabbed_wnd)
+
+    @_traced("TabBar._move_tab",
+             lambda self, pos, ghost_wnd: _describe_drag(self, ghost_wnd))
+    def _move_tab(self, pos, ghost_wnd):
+        """
+        Move the tab in-place by the given position
+
+        :param pos: The global screen position where the view will be inserted
+        :param ghost_wnd: The dragged ghost window
+
+        :type pos: QPoint
+        :type ghost_wnd: :py:class:`.tabbedwindow.GhostWindow`
+        """
+        indices = ghost_wnd.indices()
+
+        if len(indices) > 1:
+            self._move_tabs(pos, indices)
+            return
+
+        # Move tab if more than one tab
+        if self.count() > 1:
+            # Get new tab index by pos
+            old_index = ghost_wnd.index()
+            new_index = self.dropIndex(pos)
+
+            if new_index == -1:
+                new_index = self.count() - 1
+
+            # Move tab only if the indices are different
+            if new_index != old_index:
+                # Move tab
+                self.moveTab(old_index, new_index)
+
+                # Workaround to notify the tab widget the correct active tab
+                self.emit(QtCore.SIGNAL(b"currentChanged(int)"), new_index)
+
+    def _move_tabs(self, pos, indices):
+        """
+        Move the tabs at the given indices in-place as a single block by the
+        given position
+
+        :param pos: The global screen position where the tabs will be moved
+        :param indices: The sorted indices of the tabs
+
+        :type pos: QPoint
+        :type indices: list
+        """
+        moved = set(indices)
+        others = [index for index in range(self.count())
+                  if index not in moved]
+        new_index = _block_position(self.dropIndex(pos), indices, self.count())
+        order = others[:new_index] + indices + others[new_index:]
+
+        wnd = self.window()
+
+        if isinstance(wnd, TabbedWindow):
+            wnd.reorderViews(order)
+        else:
+            self.reorder(order)
+
+    def _transfer(self, wnd, indices, pos=None):
+        """
+        Move the views at the given indices into the given window, at the
+        given screen position or after the last tab, and returns their new
+        indices.
+
+        The views are removed and inserted in a single batch update of both
+        windows with their own painting suspended, so every view is
+        reparented once and every window is laid out once. Views whose
+        reparenting is expensive anyway are reported to the drag observers,
+        see :py:meth:`.tabbedwindow.TabBar.reparentCosts()`
+
+        :param wnd: The target window
+        :param indices: The sorted indices of the views
+        :param pos: The global screen position where the views are inserted
+
+        :type wnd: :py:class:`.tabbedwindow.TabbedWindow`
+        :type indices: list
+        :type pos: QPoint
+
+        :rtype: list
+        """
+        start = default_timer() if self._drag_observers else 0.0
+        views = self._take_views(indices)
+        slow = False
+
+        if self._drag_observers:
+            for view, _ in views:
+                reasons = self.reparentCosts(view, wnd)
+
+                if reasons:
+                    slow = True
+
+                    for observer in list(self._drag_observers):
+                        observer.slowReparent(self, view, reasons)
+
+        # Repaint the views only once in place
+        suspended = [view for view, _ in views if view.updatesEnabled()]
+
+        for view in suspended:
+            view.setUpdatesEnabled(False)
+
+        try:
+            if pos is None:
+                result = wnd.addViews(views)
+            else:
+                result = wnd.insertViews(pos, views)
+        finally:
+            for view in suspended:
+                view.setUpdatesEnabled(True)
+
+        if self._drag_observers:
+            self._notify_drag(
+                DragObserver.REPARENT, start,
+                DragObserver.SLOW_PATH if slow else DragObserver.FAST_PATH)
+
+        return result
+
+    def reparentCosts(self, view, wnd):
+        """
+        Returns the reasons why moving the given view into the given window
+        costs more than a plain reparenting, an empty list if none:
+
+        * :py:attr:`.tabbedwindow.DragObserver.NATIVE_WINDOW`: the view or a
+          child has a native window which is recreated
+        * :py:attr:`.tabbedwindow.DragObserver.OPENGL`: the view or a child is
+          an OpenGL widget whose context could be recreated
+        * :py:attr:`.tabbedwindow.DragObserver.STYLE_SHEET`: the view or the
+          window use a style sheet, the whole view is polished again
+        * :py:attr:`.tabbedwindow.DragObserver.STYLE`: the window has a
+          different style, the whole view is polished again
+
+        :param view: The moved view
+        :param wnd: The target window
+
+        :type view: QWidget
+        :type wnd: :py:class:`.tabbedwindow.TabbedWindow`
+
+        :rtype: list
+        """
+        reasons = []
+        widgets = [view] + view.findChildren(QtGui.QWidget)
+
+        if any(widget.testAttribute(Qt.WA_NativeWindow)
+               for widget in widgets):
+            reasons.append(DragObserver.NATIVE_WINDOW)
+
+        if any(widget.inherits("QGLWidget") for widget in widgets):
+            reasons.append(DragObserver.OPENGL)
+
+        if (view.testAttribute(Qt.WA_StyleSheet) or
+                wnd.testAttribute(Qt.WA_StyleSheet)):
+            reasons.append(DragObserver.STYLE_SHEET)
+
+        if view.style() is not wnd.style():
+            reasons.append(DragObserver.STYLE)
+
+        return reasons
+
+    def _take_views(self, indices):
+        """
+        Remove the views at the given indices in a single batch update and
+        returns them as (view, text) pairs
+
+        :param indices: The sorted indices of the views
+        :type indices: list
+        :rtype: list
+        """
+        tabs = self.parent()
+        views = [
+            (tabs.widget(index), tabs.tabText(index)) for index in indices]
+
+        self.clearSelection()
+
+        wnd = self.window()
+
+        # Views are moved, not closed
+        if isinstance(wnd, TabbedWindow):
+            with wnd.batchUpdate():
+                for index in reversed(indices):
+                    tabs.removeTab(index)
+        else:
+            for index in reversed(indices):
+                tabs.removeTab(index)
+
+        return views
+
+    def reorder(self, order):
+        """
+        Reorder the tabs so the tab at the old index ``order[i]`` ends up at
+        the index ``i``, returns the number of moved tabs.
+
+        Only the tabs outside the longest run already in the right relative
+        order are moved, the current tab stays the current one and the tab
+        widget is notified only once.
+
+        :param order: The permutation of the tabs' indices
+        :type order: list
+        :rtype: int
+        """
+        order = list(order)
+
+        if sorted(order) != list(range(self.count())):
+            raise ValueError("Not a permutation of the tabs' indices")
+
+        # Find the longest increasing subsequence of the target positions,
+        # these tabs stay where they are
+        targets = [0] * len(order)
+
+        for position, index in enumerate(order):
+            targets[index] = position
+
+        tails = []
+        tails_indices = []
+        previous = [-1] * len(order)
+
+        for index, position in enumerate(targets):
+            length = bisect.bisect_left(tails, position)
+
+            if length == len(tails):
+                tails.append(position)
+                tails_indices.append(index)
+            else:
+                tails[length] = position
+                tails_indices[length] = index
+
+            if length:
+                previous[index] = tails_indices[length - 1]
+
+        stay = set()
+        index = tails_indices[-1] if tails_indices else -1
+
+        while index != -1:
+            stay.add(index)
+            index = previous[index]
+
+        # Move every other tab right after its predecessor in the new order
+        tabs = list(range(len(order)))
+        moves = 0
+
+        for position, index in enumerate(order):
+            if index in stay:
+                continue
+
+            from_index = tabs.index(index)
+            tabs.pop(from_index)
+
+            to_index = tabs.index(order[position - 1]) + 1 if position else 0
+            tabs.insert(to_index, index)
+
+            self.moveTab(from_index, to_index)
+            moves += 1
+
+        # Workaround to notify the tab widget the correct active tab
+        if moves:
+            index = self.currentIndex()
+            self.emit(QtCore.SIGNAL(b"currentChanged(int)"), index)
+
+        return moves
+
+    def _move_ghost(self, pos):
+        """
+        Move the ghost window, if any, to the given cursor position and
+        update the drop target's feedback
+
+        :param pos: The global screen position of the cursor
+        :type pos: QPoint
+        """
+        if self._ghost:
+            start = default_timer() if self._drag_observers else 0.0
+
+            self._ghost.moveWithOffset(pos)
+            self._indicator.update(pos, self, self._ghost.indices())
+
+            if self._drag_observers:
+                self._notify_drag(DragObserver.MOVE, start)
+
+    def dropIndex(self, pos):
+        """
+        Returns the index where a view dropped at the given screen position
+        will be inserted, -1 means after the last tab
+
+        :param pos: The global screen position
+        :type pos: QPoint
+        :rtype: int
+        """
+        return self.tabAt(self.mapFromGlobal(pos))
+
+    def dropIndicator(self):
+        """
+        Returns the live feedback of the drop target during the Drag&Drop
+        action
+
+        :rtype: :py:class:`.tabbedwindow.DropIndicator`
+        """
+        return self._indicator
+
+    def moveEvent(self, event):
+        """
+        Invalidate the drop targets' index.
+
+        See QWidget.moveEvent()
+        """
+        WindowRegistry.instance().invalidate()
+
+        super(TabBar, self).moveEvent(event)
+
+    def resizeEvent(self, event):
+        """
+        Invalidate the drop targets' index and the cached tabs' rectangles.
+
+        See QWidget.resizeEvent()
+        """
+        WindowRegistry.instance().invalidate()
+        self._invalidate_tabs()
+
+        super(TabBar, self).resizeEvent(event)
+
+    def showEvent(self, event):
+        """
+        Invalidate the drop targets' index.
+
+        See QWidget.showEvent()
+        """
+        WindowRegistry.instance().invalidate()
+
+        super(TabBar, self).showEvent(event)
+
+    def hideEvent(self, event):
+        """
+        Invalidate the drop targets' index.
+
+        See QWidget.hideEvent()
+        """
+        WindowRegistry.instance().invalidate()
+
+        super(TabBar, self).hideEvent(event)
+
+    def _invalidate_tabs(self, *args):  # pylint: disable=W0613
+        """
+        Discard the cached tabs' rectangles
+        """
+        self._tab_rects = None
+
+    def _build_tabs(self):
+        """
+        Cache the tabs' rectangles and the sorted keys used to find the tab
+        at a given position
+        """
+        rects = [self.tabRect(i) for i in range(self.count())]
+
+        # The scroll buttons move the tabs without a layout change, the
+        # lookups compensate by the first tab's displacement
+        self._tab_origin = rects[0].topLeft() if rects else QtCore.QPoint()
+
+        # Keys are the tabs' far edges along the tab bar's direction, growing
+        # with the tab's index
+        if self.shape() in self.VERTICAL_SHAPES:
+            self._tab_keys = [rect.bottom() for rect in rects]
+            self._tab_key = lambda pos: pos.y()
+        elif self.isRightToLeft():
+            self._tab_keys = [-rect.left() for rect in rects]
+            self._tab_key = lambda pos: -pos.x()
+        else:
+            self._tab_keys = [rect.right() for rect in rects]
+            self._tab_key = lambda pos: pos.x()
+
+        self._tab_rects = rects
+
+    def _cached_pos(self, pos):
+        """
+        Returns the given position translated into the coordinates of the
+        cached tabs' rectangles, the cache is built if needed
+        """
+        if self._tab_rects is None:
+            self._build_tabs()
+
+        if not self._tab_rects:
+            return pos
+
+        return pos - (self.tabRect(0).topLeft() - self._tab_origin)
+
+    def tabAt(self, pos):
+        """
+        Returns the index of the tab at the given position or -1 if no tab is
+        under the position.
+
+        The tab is found by a binary search over the cached tabs' rectangles,
+        or computed directly in virtualized mode.
+
+        See QTabBar.tabAt()
+
+        :param pos: The position in the tab bar's coordinates
+        :type pos: QPoint
+        :rtype: int
+        """
+        if self._virtual:
+            if self.count():
+                index = self._virtual_tab_at(pos)
+
+                if 0 <= index < self.count():
+                    if self.tabRect(index).contains(pos):
+                        return index
+
+            return -1
+
+        pos = self._cached_pos(pos)
+        index = bisect.bisect_left(self._tab_keys, self._tab_key(pos))
+
+        if index < len(self._tab_rects):
+            if self._tab_rects[index].contains(pos):
+                return index
+
+        return -1
+
+    def tabInserted(self, index):
+        """
+        Invalidate the cached tabs' rectangles.
+
+        See QTabBar.tabInserted()
+        """
+        self._invalidate_tabs()
+
+        super(TabBar, self).tabInserted(index)
+
+    def tabLayoutChange(self):
+        """
+        Invalidate the cached tabs' rectangles.
+
+        See QTabBar.tabLayoutChange()
+        """
+        self._invalidate_tabs()
+
+        super(TabBar, self).tabLayoutChange()
+
+    def changeEvent(self, event):
+        """
+        Invalidate the cached tabs' rectangles if the font or the style has
+        changed.
+
+        See QWidget.changeEvent()
+        """
+        if event.type() in (QtCore.QEvent.FontChange,
+                            QtCore.QEvent.StyleChange):
+            self._virtual_size = None
+            self._invalidate_tabs()
+
+        super(TabBar, self).changeEvent(event)
+
+    def tabRemoved(self, index):  # pylint: disable=W0613
+        """
+        If no tabs are left in the current tab bar closes the widget's window,
+        unless a :py:meth:`.tabbedwindow.TabbedWindow.batchUpdate()` is in
+        progress.
+
+        See QTabBar.tabRemoved()
+
+        :param index: The removed tab's index
+        :type index: int
+        """
+        self._invalidate_tabs()
+
+        if self._selection:
+            views = self.parent()
+            self._selection = [
+                page for page in self._selection if views.indexOf(page) > -1]
+
+        wnd = self.window()
+
+        if self.count() == 0:
+            # Batch updates close the window when finished
+            if not (isinstance(wnd, TabbedWindow) and wnd.isBatchUpdating()):
+                wnd.close()
+
+    def mousePressEvent(self, event):
+        """
+        If the left mouse button if pressed over a tab records the cursor
+        position as the origin of a possible Drag&Drop operation.
+
+        The ghost window is not created here, it will be created by
+        :py:meth:`.tabbedwindow.TabBar.mouseMoveEvent()` only when the drag
+        distance is reached so a simple click on a tab doesn't pay the cost of
+        grabbing the whole window.
+
+        See QWidget.mousePressEvent()
+        """
+        start = default_timer() if self._drag_observers else 0.0
+
+        # Record drag's origin if needed
+        pos = self.mapFromGlobal(event.globalPos())
+        index = self.tabAt(pos)
+        dragging = event.button() == Qt.LeftButton and index > -1
+
+        # The index is resolved now, the superclass could scroll the tabs
+        if dragging:
+            self._press_pos = pos
+            self._press_index = index
+            self._press_time = start
+            self._drag_distance = QtGui.QApplication.startDragDistance()
+
+        # Ctrl-click and Shift-click change the selection but not the current
+        # tab, a click on a tab not selected discards the selection
+        if dragging and self._select(index, event.modifiers()):
+            event.accept()
+        else:
+            if dragging and index not in self.selectedIndices():
+                self.clearSelection()
+
+            if dragging:
+                self._selection_anchor = index
+
+            # Call superclass
+            super(TabBar, self).mousePressEvent(event)
+
+        if dragging and self._drag_observers:
+            self._notify_drag(DragObserver.PRESS, start)
+
+    def mouseMoveEvent(self, event):
+        """
+        Create the ghost window when the cursor moves far enough from the
+        position of the mouse press event and update the ghost window's
+        position during mouse move.
+
+        Updates are coalesced by the tab bar's
+        :py:class:`.tabbedwindow.DragScheduler`.
+
+        See QWidget.mouseMoveEvent()
+        """
+        pos = event.globalPos()
+
+        if self._ghost is None and self._press_pos is not None:
+            origin = self.mapToGlobal(self._press_pos)
+
+            if (pos - origin).manhattanLength() >= self._drag_distance:
+                if self._drag_observers:
+                    self._notify_drag(
+                        DragObserver.THRESHOLD,
+                        self._press_time or default_timer()
+                    )
+
+                # Windows moved by the window manager could have been
+                # reported late, start the drag with an up to date index
+                WindowRegistry.instance().invalidate()
+
+                start = default_timer() if self._drag_observers else 0.0
+                self._ghost = GhostWindow(
+                    self, self._press_pos, index=self._press_index,
+                    drag_distance=self._drag_distance)
+
+                if self._drag_observers:
+                    self._notify_drag(DragObserver.GHOST, start)
+
+                self._move_ghost(pos)
+
+        elif self._ghost:
+            self._scheduler.schedule(pos)
+
+    def tabDropEvent(self, event):
+        """
+        Drops the current dragged view and creates a new window if no tab bar
+        under the event's screen position otherwise move the dragged view into
+        the tab bar under the mouse event's position.
+
+        The tab bar under the cursor is found by the
+        :py:class:`.tabbedwindow.WindowRegistry`, windows or widgets covering
+        the tab bar don't hide it.
+
+        Close the current window if no more tabs are left.
+
+        This method can be overridden to implement custom tab drop's behaviour.
+
+        :param event: The mouse release event
+        :type: QMouseEvent
+        """
+        # Enter code only if drag is far enough
+        pos = event.globalPos()
+
+        if self._ghost and self._ghost.dragStarted(pos):
+            start = default_timer() if self._drag_observers else 0.0
+
+            tabs = WindowRegistry.instance().tabBarAt(pos)
+
+            if self._drag_observers:
+                start = self._notify_drag(DragObserver.RESOLVE, start)
+
+            # Choose action by the tab bar under the mouse's coordinates
+            if tabs is not None:
+                if tabs == self:
+                    # Move tab in-place
+                    branch = DragObserver.MOVE_TAB
+                    self._move_tab(pos, self._ghost)
+                else:
+                    # Move the dragged tab into the window under the cursor
+                    branch = DragObserver.MOVE_TO_WINDOW
+                    self._move_to_window(tabs.window(), pos, self._ghost)
+
+            else:
+                if self.count() == len(self._ghost.indices()):
+                    # Only move the current window into the new position
+                    branch = DragObserver.MOVE_WINDOW
+                    self.window().move(self._ghost.pos())
+                else:
+                    # Creates a new window and move the tab
+                    branch = DragObserver.NEW_WINDOW
+                    self._create_new_window(self._ghost)
+
+            if self._drag_observers:
+                self._notify_drag(DragObserver.DROP, start, branch)
+
+    def mouseReleaseEvent(self, event):
+        """
+        Analyse the mouse release event calling only the superclass if the
+        released button is not the left mouse button otherwise pass the mouse
+        release event to the :py:meth:`.tabbedwindow.TabBar.tabDropEvent()`
+        handler.
+
+        Finishing by destroying the ghost windows widget.
+
+        See QWidget.mouseReleaseEvent()
+        """
+        # Call superclass if not a left button release mouse event
+        if event.button() != Qt.LeftButton:
+            super(TabBar, self).mouseReleaseEvent(event)
+            return
+
+        # Apply the last cursor position before dropping the tab
+        self._scheduler.flush()
+
+        # Handle mouse release event
+        self.tabDropEvent(event)
+
+        # Close ghost window
+        start = default_timer() if self._drag_observers else 0.0
+        dragging = self._press_pos is not None
+
+        self._scheduler.cancel()
+        self._indicator.close()
+
+        if self._ghost:
+            self._ghost.close()
+            self._ghost = None
+
+        self._press_pos = None
+
+        if dragging and self._drag_observers:
+            self._notify_drag(DragObserver.RELEASE, start)
+
+
+class LazyView(QtGui.QWidget):
+    """
+    Placeholder page of a tab whose view is built only when needed.
+
+    The placeholder holds the factory of the view and builds it the first
+    time the tab becomes the current one or when
+    :py:meth:`.tabbedwindow.LazyView.materialize()` is called. The built view
+    is laid out inside the placeholder so the tab is never replaced, moving
+    the tab between windows doesn't build the view.
+
+    A built view can be destroyed again by
+    :py:meth:`.tabbedwindow.LazyView.hibernate()` and it will be rebuilt on
+    the next activation. Views can implement these optional methods to keep
+    their state while hibernated:
+
+    * ``saveViewState()`` returns an opaque object with the view's state
+    * ``restoreViewState(state)`` restores the state into a new view
+    * ``viewMemoryUsage()`` returns the approximate size in bytes of the
+      view's data, used by :py:class:`.tabbedwindow.HibernationManager`
+    """
+
+    def __init__(self, factory, parent=None):
+        """
+        Constructor accepts the callable which builds the view and the
+        optional parent widget
+
+        :param factory: Callable without arguments returning the view
+        :param parent: The optional parent widget
+
+        :type factory: callable
+        :type parent: QWidget
+        """
+        # Call superclass
+        super(LazyView, self).__init__(parent)
+
+        # Protected attributes
+        self._factory = factory
+        self._view = None
+        self._state = None
+        self._session_state = None
+        self._last_activated = 0.0
+
+        # Set up widget
+        layout = QtGui.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+    def factory(self):
+        """
+        The callable which builds the view
+
+        :rtype: callable
+        """
+        return self._factory
+
+    def view(self):
+        """
+        The built view or *None* if not built yet
+
+        :rtype: QWidget
+        """
+        return self._view
+
+    def isMaterialized(self):
+        """
+        Returns *True* if the view has been built
+
+        :rtype: bool
+        """
+        return self._view is not None
+
+    def lastActivated(self):
+        """
+        The time of the last activation of the view's tab, 0 if never
+        activated
+
+        :rtype: float
+        """
+        return self._last_activated
+
+    def activate(self):
+        """
+        Record the activation time of the view's tab and build the view if
+        not built yet
+
+        :rtype: QWidget
+        """
+        self._last_activated = time.time()
+
+        return self.materialize()
+
+    def materialize(self):
+        """
+        Build the view if not built yet, restoring the state saved by the last
+        :py:meth:`.tabbedwindow.LazyView.hibernate()` call, and returns it
+
+        :rtype: QWidget
+        """
+        if self._view is None:
+            self._view = self._factory()
+            self.layout().addWidget(self._view)
+            self.setFocusProxy(self._view)
+
+            if self._state is not None:
+                if hasattr(self._view, "restoreViewState"):
+                    self._view.restoreViewState(self._state)
+
+                self._state = None
+
+        return self._view
+
+    def hibernate(self):
+        """
+        Save the view's state and destroy the view, it will be built again by
+        the next :py:meth:`.tabbedwindow.LazyView.materialize()` call
+        """
+        if self._view is None:
+            return
+
+        if hasattr(self._view, "saveViewState"):
+            self._state = self._view.saveViewState()
+
+        view, self._view = self._view, None
+
+        self.setFocusProxy(None)
+        self.layout().removeWidget(view)
+        view.setParent(None)
+        view.deleteLater()
+
+    def sessionState(self):
+        """
+        The state saved in a :py:class:`.tabbedwindow.Session` for the view
+        not built yet, *None* if not restored from a session
+
+        :rtype: bytes
+        """
+        return self._session_state
+
+    def setSessionState(self, state):
+        """
+        Set the state saved in a :py:class:`.tabbedwindow.Session` for the
+        view not built yet
+
+        :param state: The view's state
+        :type state: bytes
+        """
+        self._session_state = state
+
+    def memoryUsage(self):
+        """
+        Approximate size in bytes of the built view as returned by its
+        ``viewMemoryUsage()`` method, 0 if not built or not implemented
+
+        :rtype: int
+        """
+        if self._view is not None and hasattr(self._view, "viewMemoryUsage"):
+            return self._view.viewMemoryUsage()
+
+        return 0
+
+
+class PendingView(LazyView):
+    """
+    Placeholder page of a tab whose view depends on data loaded
+    asynchronously.
+
+    The placeholder shows a loading indicator until the given future or
+    awaitable resolves, then the view is built by the given factory from the
+    future's result, or the result itself is the view if no factory is given.
+
+    The loading is cancelled if the placeholder is destroyed or
+    :py:meth:`.tabbedwindow.PendingView.cancel()` is called.
+
+    The future's callbacks can run on any thread, the view is always built by
+    the GUI thread.
+    """
+
+    # Emitted when the view has been built
+    resolved = QtCore.pyqtSignal()
+
+    # Emitted with the exception raised by the loading
+    failed = QtCore.pyqtSignal(object)
+
+    # Delivers the resolved future to the GUI thread
+    _done = QtCore.pyqtSignal(object)
+
+    LOADING_TEXT = "Loading\u2026"
+
+    def __init__(self, future, factory=None, parent=None):
+        """
+        Constructor accepts the future or the awaitable producing the view's
+        data, the optional callable building the view from the future's
+        result and the optional parent widget
+
+        :param future: The future or the awaitable
+        :param factory: Callable building the view from the future's result
+        :param parent: The optional parent widget
+
+        :type future: Future
+        :type factory: callable
+        :type parent: QWidget
+        """
+        # Awaitables are scheduled once, futures are used as they are
+        future = _as_future(future)
+
+        if factory is None:
+            factory = lambda result: result  # noqa
+
+        # Call superclass
+        super(PendingView, self).__init__(
+            lambda: factory(future.result()), parent)
+
+        # Protected attributes
+        self._future = future
+        self._error = None
+
+        # Set up widget
+        self._indicator = QtGui.QLabel(self.LOADING_TEXT, self)
+        self._indicator.setAlignment(Qt.AlignCenter)
+        self.layout().addWidget(self._indicator)
+
+        self._done.connect(self._resolve)
+        self.destroyed.connect(lambda *args: future.cancel())
+
+        future.add_done_callback(self._notify)
+
+    def future(self):
+        """
+        The future producing the view's data
+
+        :rtype: Future
+        """
+        return self._future
+
+    def isPending(self):
+        """
+        Returns *True* if the view's data is still loading
+
+        :rtype: bool
+        """
+        return not self._future.done()
+
+    def error(self):
+        """
+        The exception raised by the loading or *None*
+
+        :rtype: Exception
+        """
+        return self._error
+
+    def cancel(self):
+        """
+        Cancel the loading if still pending, returns *True* if cancelled
+
+        :rtype: bool
+        """
+        return self._future.cancel()
+
+    def materialize(self):
+        """
+        Build the view only if the view's data has been loaded.
+
+        See :py:meth:`.tabbedwindow.LazyView.materialize()`
+        """
+        if not self._future.done() or self._future.cancelled():
+            return None
+
+        if self._error is not None:
+            return None
+
+        return super(PendingView, self).materialize()
+
+    def _notify(self, future):
+        """
+        Forward the resolved future to the GUI thread, the placeholder could
+        be already destroyed
+        """
+        try:
+            self._done.emit(future)
+        except RuntimeError:
+            pass
+
+    def _resolve(self, future):
+        """
+        Replace the loading indicator with the view built from the future's
+        result
+        """
+        if future.cancelled():
+            return
+
+        error = future.exception()
+
+        if error is not None:
+            self._error = error
+            self._indicator.setText(str(error))
+            self.failed.emit(error)
+            return
+
+        self.layout().removeWidget(self._indicator)
+        self._indicator.deleteLater()
+        self._indicator = None
+
+        self.materialize()
+
+        # Notify the new view's visibility
+        widget = self.parentWidget()
+
+        while widget is not None and not isinstance(widget, TabWidget):
+            widget = widget.parentWidget()
+
+        if widget is not None:
+            widget.updateVisibility(widget.indexOf(self))
+
+        self.resolved.emit()
+
+
+class HibernationManager(QtCore.QObject):
+    """
+    Keeps the number of built views, or their memory usage, under a budget
+    across all the tabbed windows.
+
+    The manager is opt-in, create it with the budget and call
+    :py:meth:`.tabbedwindow.HibernationManager.install()`. Every time a tab is
+    activated the manager checks the budget and, if exceeded, hibernates the
+    least recently activated views built from a factory, see
+    :py:class:`.tabbedwindow.LazyView`. The current view of every window is
+    never hibernated.
+
+    Views added as plain widgets can't be rebuilt and are never hibernated.
+    """
+
+    _active = None
+
+    def __init__(self, max_views=None, max_memory=None, parent=None):
+        """
+        Constructor accepts the maximum number of built views, the maximum
+        memory usage in bytes of the built views and the optional parent.
+
+        A budget set to *None* is not checked.
+
+        :param max_views: The maximum number of built views
+        :param max_memory: The maximum memory usage of the built views
+        :param parent: The optional parent object
+
+        :type max_views: int
+        :type max_memory: int
+        :type parent: QObject
+        """
+        # Call superclass
+        super(HibernationManager, self).__init__(parent)
+
+        # Protected attributes
+        self._max_views = max_views
+        self._max_memory = max_memory
+        self._pending = False
+
+    @classmethod
+    def active(cls):
+        """
+        Returns the installed manager or *None*
+
+        :rtype: :py:class:`.tabbedwindow.HibernationManager`
+        """
+        return cls._active
+
+    def install(self):
+        """
+        Install the manager replacing the current one
+        """
+        HibernationManager._active = self
+
+    def uninstall(self):
+        """
+        Uninstall the manager if it's the installed one
+        """
+        if HibernationManager._active is self:
+            HibernationManager._active = None
+
+    def maxViews(self):
+        """
+        The maximum number of built views
+
+        :rtype: int
+        """
+        return self._max_views
+
+    def setMaxViews(self, max_views):
+        """
+        Set the maximum number of built views, *None* to disable the check
+
+        :param max_views: The maximum number of built views
+        :type max_views: int
+        """
+        self._max_views = max_views
+
+    def maxMemory(self):
+        """
+        The maximum memory usage in bytes of the built views
+
+        :rtype: int
+        """
+        return self._max_memory
+
+    def setMaxMemory(self, max_memory):
+        """
+        Set the maximum memory usage in bytes of the built views, *None* to
+        disable the check
+
+        :param max_memory: The maximum memory usage of the built views
+        :type max_memory: int
+        """
+        self._max_memory = max_memory
+
+    def viewActivated(self, page):  # pylint: disable=W0613
+        """
+        Notify the activation of the given page, the budget will be checked
+        when the control returns to the event loop
+
+        :param page: The activated page
+        :type page: QWidget
+        """
+        if not self._pending:
+            self._pending = True
+            QtCore.QTimer.singleShot(0, self.enforce)
+
+    def residentCounts(self):
+        """
+        Returns the number of built views per window
+
+        :rtype: dict
+        """
+        counts = {}
+
+        for wnd, tabs in self._tab_widgets():
+            count = 0
+
+            for index in range(tabs.count()):
+                page = tabs.widget(index)
+
+                if not isinstance(page, LazyView) or page.isMaterialized():
+                    count += 1
+
+            counts[wnd] = counts.get(wnd, 0) + count
+
+        return counts
+
+    def enforce(self):
+        """
+        Hibernate the least recently activated views until the budget is
+        satisfied and returns the number of hibernated views
+
+        :rtype: int
+        """
+        self._pending = False
+
+        # Collect the built views which can be hibernated
+        pages = []
+        resident = 0
+        memory = 0
+
+        for _, tabs in self._tab_widgets():
+            current = tabs.currentWidget()
+
+            for index in range(tabs.count()):
+                page = tabs.widget(index)
+
+                if isinstance(page, LazyView):
+                    if not page.isMaterialized():
+                        continue
+
+                    memory += page.memoryUsage()
+
+                    if page is not current:
+                        pages.append(page)
+
+                resident += 1
+
+        # Hibernate from the least recently activated view
+        pages.sort(key=lambda page: page.lastActivated())
+        hibernated = 0
+
+        for page in pages:
+            over_views = (self._max_views is not None and
+                          resident > self._max_views)
+            over_memory = (self._max_memory is not None and
+                           memory > self._max_memory)
+
+            if not (over_views or over_memory):
+                break
+
+            memory -= page.memoryUsage()
+            resident -= 1
+            hibernated += 1
+
+            page.hibernate()
+
+        return hibernated
+
+    def _tab_widgets(self):
+        """
+        Returns the list of the tab widgets of the registered tab bars
+        together with their windows
+
+        :rtype: list
+        """
+        result = []
+
+        for tabbar in WindowRegistry.instance().tabBars():
+            tabs = tabbar.parent()
+
+            if isinstance(tabs, QtGui.QTabWidget):
+                result.append((tabbar.window(), tabs))
+
+        return result
+
+
+class ViewThrottle(QtCore.QObject):
+    """
+    Opt-in helper suspending a view's timers, animations and other update
+    sources while the view is not visible.
+
+    The throttle is notified by the view's :py:class:`.tabbedwindow.TabWidget`
+    together with the view's ``viewVisibilityChanged(state)`` method, the
+    sources are suspended in the states given by
+    :py:meth:`.tabbedwindow.ViewThrottle.setSuspendStates()`, by default when
+    the view's tab is not the current one or the window is minimised or
+    hidden.
+    """
+
+    _throttles = weakref.WeakKeyDictionary()
+
+    def __init__(self, view):
+        """
+        Constructor accepts the throttled view, the throttle is owned by the
+        view
+
+        :param view: The throttled view
+        :type view: QWidget
+        """
+        # Call superclass
+        super(ViewThrottle, self).__init__(view)
+
+        # Protected attributes
+        self._timers = []
+        self._animations = []
+        self._sources = []
+        self._resume = []
+        self._suspended = False
+        self._states = (TabWidget.HIDDEN, TabWidget.BACKGROUND)
+
+        ViewThrottle._throttles[view] = self
+
+    @classmethod
+    def forView(cls, view):
+        """
+        Returns the throttle of the given view or *None*
+
+        :param view: The view
+        :type view: QWidget
+        :rtype: :py:class:`.tabbedwindow.ViewThrottle`
+        """
+        return cls._throttles.get(view)
+
+    def suspendStates(self):
+        """
+        The visibility states suspending the view's update sources
+
+        :rtype: tuple
+        """
+        return self._states
+
+    def setSuspendStates(self, states):
+        """
+        Set the visibility states suspending the view's update sources, like
+        only :py:attr:`.tabbedwindow.TabWidget.BACKGROUND` to keep updating
+        the views of the tabs not current
+
+        :param states: The visibility states
+        :type states: iterable
+        """
+        self._states = tuple(states)
+
+    def addTimer(self, timer):
+        """
+        Stop the given timer while the view is suspended
+
+        :param timer: The timer
+        :type timer: QTimer
+        """
+        self._timers.append(timer)
+
+    def addAnimation(self, animation):
+        """
+        Pause the given animation while the view is suspended
+
+        :param animation: The animation
+        :type animation: QAbstractAnimation
+        """
+        self._animations.append(animation)
+
+    def addSource(self, suspend, resume):
+        """
+        Call the given callables when the view is suspended and resumed, like
+        disconnecting and reconnecting a live data feed
+
+        :param suspend: Callable without arguments
+        :param resume: Callable without arguments
+
+        :type suspend: callable
+        :type resume: callable
+        """
+        self._sources.append((suspend, resume))
+
+    def isSuspended(self):
+        """
+        Returns *True* if the view's update sources are suspended
+
+        :rtype: bool
+        """
+        return self._suspended
+
+    def suspend(self):
+        """
+        Stop the active timers, pause the running animations and suspend the
+        other update sources
+        """
+        if self._suspended:
+            return
+
+        self._suspended = True
+
+        for timer in self._timers:
+            if timer.isActive():
+                timer.stop()
+                self._resume.append(timer.start)
+
+        for animation in self._animations:
+            if animation.state() == QtCore.QAbstractAnimation.Running:
+                animation.pause()
+                self._resume.append(animation.resume)
+
+        for suspend, resume in self._sources:
+            suspend()
+            self._resume.append(resume)
+
+    def resume(self):
+        """
+        Restart what has been stopped by the last
+        :py:meth:`.tabbedwindow.ViewThrottle.suspend()` call
+        """
+        if not self._suspended:
+            return
+
+        self._suspended = False
+
+        resume, self._resume = self._resume, []
+
+        for callback in resume:
+            callback()
+
+    def viewVisibilityChanged(self, state):
+        """
+        Suspend or resume the view's update sources by the given visibility
+        state
+
+        :param state: The view's visibility state
+        :type state: str
+        """
+        if state in self._states:
+            self.suspend()
+        else:
+            self.resume()
+
+
+class TabWidget(QtGui.QTabWidget):
+    """
+    Subclass of a standard QTabWidget wit a custom tab bar, to be extended to
+    fit the desired view's Drag&Drop behaviour
+
+    Views are notified when their visibility changes by their optional
+    ``viewVisibilityChanged(state)`` method and by their
+    :py:class:`.tabbedwindow.ViewThrottle`, the state is one of:
+
+    * :py:attr:`.tabbedwindow.TabWidget.VISIBLE`: the view's tab is the
+      current one and the window is shown
+    * :py:attr:`.tabbedwindow.TabWidget.HIDDEN`: the view's tab is not the
+      current one
+    * :py:attr:`.tabbedwindow.TabWidget.BACKGROUND`: the view's tab is the
+      current one but the window is minimised or hidden
+    """
+
+    VISIBLE = "visible"
+    HIDDEN = "hidden"
+    BACKGROUND = "background"
+
+    # Last state notified to the views, shared as views move between windows
+    _visibility = weakref.WeakKeyDictionary()
+
+    def __init__(self, parent=None):
+        """
+        Constructor accepts the optional tab widget's parent
+
+        :param parent: The optional parent widget
+        :type parent: QWidget
+        """
+        # Call superclass
+        super(TabWidget, self).__init__(parent)
+
+        # Set up widget
+        self.setTabBar(TabBar(self))
+
+        # Protected attributes
+        self._current_page = None
+
+        self.currentChanged.connect(self._materialize)
+        self.currentChanged.connect(self._current_changed)
+        self.tabBar().tabMoved.connect(self._tab_moved)
+
+    def _tab_moved(self, from_index, to_index):
+        """
+        Update the views' locations in the registry
+        """
+        WindowRegistry.instance().viewMoved(self, from_index, to_index)
+
+        journal = Journal.active()
+
+        if journal is not None:
+            journal.viewMoved(self, from_index, to_index)
+
+    def tabInserted(self, index):
+        """
+        Update the views' locations in the registry.
+
+        See QTabWidget.tabInserted()
+        """
+        WindowRegistry.instance().viewInserted(self, index)
+
+        super(TabWidget, self).tabInserted(index)
+
+        journal = Journal.active()
+
+        if journal is not None:
+            journal.viewInserted(self, index)
+
+        self.updateVisibility(index)
+
+    def tabRemoved(self, index):
+        """
+        Update the views' locations in the registry.
+
+        See QTabWidget.tabRemoved()
+        """
+        WindowRegistry.instance().viewRemoved(self, index)
+
+        journal = Journal.active()
+
+        if journal is not None:
+            journal.viewRemoved(self, index)
+
+        super(TabWidget, self).tabRemoved(index)
+
+    def _batching(self):
+        """
+        Returns *True* if a
+        :py:meth:`.tabbedwindow.TabbedWindow.batchUpdate()` of the window is
+        in progress, the current view is handled once at its end
+        """
+        wnd = self.window()
+
+        return isinstance(wnd, TabbedWindow) and wnd.isBatchUpdating()
+
+    def _current_changed(self, index):
+        """
+        Notify the visibility change of the previous and of the new current
+        views
+        """
+        if self._batching():
+            return
+
+        previous = self._current_page
+
+        if previous is not None and self.indexOf(previous) > -1:
+            self._notify_visibility(previous, self.HIDDEN)
+
+        self.updateVisibility(index)
+
+        journal = Journal.active()
+
+        if journal is not None:
+            journal.currentChanged(self, index)
+
+    def visibility(self, index):
+        """
+        Returns the visibility state of the view at the given index
+
+        :param index: The tab's index
+        :type index: int
+        :rtype: str
+        """
+        if index != self.currentIndex():
+            return self.HIDDEN
+
+        wnd = self.window()
+
+        if not wnd.isVisible() or wnd.isMinimized():
+            return self.BACKGROUND
+
+        return self.VISIBLE
+
+    def updateVisibility(self, index=None):
+        """
+        Notify the view at the given index, by default the current one, if
+        its visibility state has changed
+
+        :param index: The tab's index
+        :type index: int
+        """
+        if index is None:
+            index = self.currentIndex()
+
+        page = self.widget(index)
+
+        if page is None:
+            return
+
+        if index == self.currentIndex():
+            self._current_page = page
+
+        self._notify_visibility(page, self.visibility(index))
+
+    def _notify_visibility(self, page, state):
+        """
+        Notify the given state to the view of the given page if changed
+        """
+        view = page
+
+        # Placeholders are notified only once built
+        if isinstance(page, LazyView):
+            view = page.view()
+
+            if view is None:
+                return
+
+        if TabWidget._visibility.get(view) == state:
+            return
+
+        TabWidget._visibility[view] = state
+
+        if hasattr(view, "viewVisibilityChanged"):
+            view.viewVisibilityChanged(state)
+
+        throttle = ViewThrottle.forView(view)
+
+        if throttle is not None:
+            throttle.viewVisibilityChanged(state)
+
+    def _materialize(self, index):
+        """
+        Build the view of the tab at the given index if it's a
+        :py:class:`.tabbedwindow.LazyView` placeholder and notify the
+        activation to the installed
+        :py:class:`.tabbedwindow.HibernationManager`
+
+        :param index: The tab's index
+        :type index: int
+        """
+        if self._batching():
+            return
+
+        page = self.widget(index)
+
+        if isinstance(page, LazyView):
+            page.activate()
+
+        manager = HibernationManager.active()
+
+        if manager is not None and page is not None:
+            manager.viewActivated(page)
+
+    def view(self, index):
+        """
+        Returns the view at the given index, for a
+        :py:class:`.tabbedwindow.LazyView` placeholder returns the built view
+        or the placeholder itself if the view is not built yet
+
+        :param index: The tab's index
+        :type index: int
+        :rtype: QWidget
+        """
+        page = self.widget(index)
+
+        if isinstance(page, LazyView) and page.isMaterialized():
+            return page.view()
+
+        return page
+
+    def setVirtualized(self, enabled):
+        """
+        Enable or disable the tab bar's virtualized mode and show the menu to
+        jump to any tab in the tab widget's corner
+
+        See :py:meth:`.tabbedwindow.TabBar.setVirtualized()`
+
+        :param enabled: Enable the virtualized mode
+        :type enabled: bool
+        """
+        tabbar = self.tabBar()
+        tabbar.setVirtualized(enabled)
+
+        if enabled:
+            self.setCornerWidget(tabbar.overflowButton(), Qt.TopRightCorner)
+        else:
+            button = self.cornerWidget(Qt.TopRightCorner)
+
+            if button is not None and button is tabbar.overflowButton():
+                button.hide()
+                self.setCornerWidget(None, Qt.TopRightCorner)
+
+    def tabAt(self, pos):
+        """
+        Re-implementation of the QTabBar.tabAt() method.
+
+        This should be exposed here because the original one is a protected
+        method and in the TabbedWindow class we need to retrieve the tab's
+        index by the cursor position.
+
+        See QTabBar.tabAt()
+        """
+        return self.tabBar().tabAt(pos)
+
+
+class TabbedWindow(QtGui.QMainWindow):
+    """
+    Subclass of QMainWindow, contains a tab bar to manage a per-window list of
+    tabbed views and allows to add, insert or remove a view.
+
+    Views can be standard QWidget instances or even instances of QMainWindow
+    with menu bar and tool bars as well.
+
+    These features will be displayed automatically when the view's tab will be
+    activated and hidden when it'll be deactivated.
+
+    The ghost window shown while dragging a tab is painted by the
+    :py:attr:`.tabbedwindow.TabbedWindow.GHOST_RENDERER` renderer, override it
+    in a subclass to choose a cheaper one like
+    :py:class:`.tabbedwindow.ThumbnailRenderer` or
+    :py:class:`.tabbedwindow.OutlineRenderer`.
+
+    Many views can be added, removed or reordered at once by
+    :py:meth:`.tabbedwindow.TabbedWindow.addViews()`,
+    :py:meth:`.tabbedwindow.TabbedWindow.insertViews()`,
+    :py:meth:`.tabbedwindow.TabbedWindow.removeViews()` and
+    :py:meth:`.tabbedwindow.TabbedWindow.reorderViews()` with a single layout
+    pass and a single :py:attr:`.tabbedwindow.TabbedWindow.viewsChanged`
+    notification.
+
+    Set :py:attr:`.tabbedwindow.TabbedWindow.VIRTUALIZED_TABS` in a subclass
+    to use a virtualized tab bar for windows with thousands of tabs.
+
+    Worker threads can submit views with
+    :py:meth:`.tabbedwindow.TabbedWindow.submitView()`, the views are built
+    and added by the GUI thread in batches lasting at most
+    :py:attr:`.tabbedwindow.TabbedWindow.SUBMIT_BUDGET` milliseconds per
+    event loop iteration.
+
+    Views depending on slow data can be added as futures or awaitables, or
+    loaded concurrently by :py:meth:`.tabbedwindow.TabbedWindow.loadView()`,
+    a placeholder tab is shown until the data is loaded.
+
+    With :py:meth:`.tabbedwindow.TabbedWindow.setChromeHosting()` the tool
+    bars, the menus and the status bar of the current QMainWindow view are
+    shown by this window and given back to the view when its tab is
+    deactivated or moved, all the views share a single set of chrome.
+    """
+
+    GHOST_RENDERER = GhostWindow.RENDERER
+
+    HOST_CHROME = False
+
+    VIRTUALIZED_TABS = False
+
+    SUBMIT_BUDGET = 4
+
+    SUBMIT_EVENT = QtCore.QEvent.Type(QtCore.QEvent.registerEventType())
+
+    EXECUTOR = None
+
+    LOAD_WORKERS = 4
+
+    _executor = None
+
+    # Emitted once at the end of a batch update
+    viewsChanged = QtCore.pyqtSignal()
+
+    def __init__(self):
+        """
+        Empty constructor.
+
+        The tabbed's window parent will be the Qt desktop widget.
+        """
+        # Call superclass
+        super(TabbedWindow, self).__init__(QtGui.QApplication.desktop())
+
+        # Public attributes
+        self.tabs = TabWidget(self)
+
+        # Setup window
+        self.tabs.setDocumentMode(True)
+
+        if self.VIRTUALIZED_TABS:
+            self.tabs.setVirtualized(True)
+
+        self.setCentralWidget(self.tabs)
+
+        # Protected attributes
+        self._batch_depth = 0
+        self._submitted = collections.deque()
+        self._submit_lock = threading.Lock()
+        self._submit_posted = False
+        self._chrome_hosting = False
+        self._hosted = None
+
+        self.tabs.currentChanged.connect(self._update_chrome)
+
+        if self.HOST_CHROME:
+            self.setChromeHosting(True)
+
+    @_traced("TabbedWindow.addView",
+             lambda self, view, text, factory=None: dict(
+                 window=_object_id(self), view=_object_id(view), text=text))
+    def addView(self, view, text, factory=None):
+        """
+        Add the given view with the given text to this tabbed window and
+        returns the position of the newly created tab
+
+        The view can be a future or an awaitable producing the view, or the
+        view's data passed to the given factory, a
+        :py:class:`.tabbedwindow.PendingView` placeholder is added until the
+        future resolves.
+
+        :param view: The view to be added
+        :param text: The title of the view's tab
+        :param factory: Callable building the view from the future's result
+
+        :type view: QWidget
+        :type text: string
+        :type factory: callable
+
+        :rtype: int
+        """
+        future = _as_future(view)
+
+        if future is not None:
+            view = PendingView(future, factory)
+
+        return self.tabs.addTab(view, text)
+
+    def loadView(self, loader, text, factory=None):
+        """
+        Run the given loader on the
+        :py:meth:`.tabbedwindow.TabbedWindow.executor()` and add a
+        :py:class:`.tabbedwindow.PendingView` placeholder until the view's
+        data is loaded, returns the position of the newly created tab
+
+        :param loader: Callable without arguments returning the view's data,
+                       must be picklable for process pools
+        :param text: The title of the view's tab
+        :param factory: Callable building the view from the loaded data
+
+        :type loader: callable
+        :type text: string
+        :type factory: callable
+
+        :rtype: int
+        """
+        return self.addView(self.executor().submit(loader), text, factory)
+
+    @classmethod
+    def executor(cls):
+        """
+        Returns the executor running the loaders of
+        :py:meth:`.tabbedwindow.TabbedWindow.loadView()`, by default a thread
+        pool shared by all the windows.
+
+        Set :py:attr:`.tabbedwindow.TabbedWindow.EXECUTOR` in a subclass to
+        use a different one, like a process pool.
+
+        :rtype: Executor
+        """
+        if cls.EXECUTOR is not None:
+            return cls.EXECUTOR
+
+        if TabbedWindow._executor is None:
+            if futures is None:
+                raise RuntimeError("concurrent.futures is not available")
+
+            TabbedWindow._executor = futures.ThreadPoolExecutor(
+                cls.LOAD_WORKERS)
+
+        return TabbedWindow._executor
+
+    def addViews(self, views):
+        """
+        Add the given views to this tabbed window in a single batch update and
+        returns the positions of the newly created tabs
+
+        :param views: Iterable of (view, text) pairs
+        :type views: iterable
+        :rtype: list
+        """
+        with self.batchUpdate():
+            return [self.addView(view, text) for view, text in views]
+
+    def addViewFactory(self, factory, text):
+        """
+        Add a placeholder of the view built by the given factory with the
+        given text to this tabbed window and returns the position of the newly
+        created tab.
+
+        The view is built when its tab becomes the current one or when
+        :py:meth:`.tabbedwindow.TabbedWindow.prefetchView()` is called.
+
+        :param factory: Callable without arguments returning the view
+        :param text: The title of the view's tab
+
+        :type factory: callable
+        :type text: string
+
+        :rtype: int
+        """
+        return self.addView(LazyView(factory), text)
+
+    @_traced("TabbedWindow.clone",
+             lambda self, geometry: dict(window=_object_id(self)))
+    def clone(self, geometry):
+        """
+        Clone the current window with the given geometry.
+
+        Override this method in your subclass of TabbedWindow to return the
+        instance of the subclass.
+
+        :param geometry: The geometry of the cloned window
+        :type geometry: QRect
+        """
+        wnd = TabbedWindow()
+        wnd.setGeometry(geometry)
+
+        return wnd
+
+    @_traced("TabbedWindow.insertView",
+             lambda self, pos, view, text, factory=None: dict(
+                 window=_object_id(self), view=_object_id(view), text=text))
+    def insertView(self, pos, view, text, factory=None):
+        """
+        Insert the given view using the given screen's coordinates and using
+        the given text as the tab's title.
+
+        Returns -1 if the insert view operations fails otherwise returns the
+        tabs's index.
+
+        The view can be a future or an awaitable, see
+        :py:meth:`.tabbedwindow.TabbedWindow.addView()`
+
+        :param pos: The screen coordinates where the widget will be inserted
+        :param view: The view to be inserted
+        :param text: The tab's title
+        :param factory: Callable building the view from the future's result
+
+        :type pos: QPoint
+        :type view: QWidget
+        :type text: string
+        :type factory: callable
+
+        :rtype: int
+        """
+        future = _as_future(view)
+
+        if future is not None:
+            view = PendingView(future, factory)
+
+        index = self.tabs.tabBar().dropIndex(pos)
+
+        return self.tabs.insertTab(index, view, text)
+
+    def insertViews(self, pos, views):
+        """
+        Insert the given views, in the given order, using the given screen's
+        coordinates in a single batch update and returns the positions of the
+        newly created tabs
+
+        :param pos: The screen coordinates where the views will be inserted
+        :param views: Iterable of (view, text) pairs
+
+        :type pos: QPoint
+        :type views: iterable
+
+        :rtype: list
+        """
+        indices = []
+
+        with self.batchUpdate():
+            index = self.tabs.tabBar().dropIndex(pos)
+
+            for view, text in views:
+                index = self.tabs.insertTab(index, view, text)
+                indices.append(index)
+                index += 1
+
+        return indices
+
+    def insertViewFactory(self, pos, factory, text):
+        """
+        Insert a placeholder of the view built by the given factory using the
+        given screen's coordinates and using the given text as the tab's
+        title.
+
+        See :py:meth:`.tabbedwindow.TabbedWindow.addViewFactory()` and
+        :py:meth:`.tabbedwindow.TabbedWindow.insertView()`
+
+        :param pos: The screen coordinates where the widget will be inserted
+        :param factory: Callable without arguments returning the view
+        :param text: The tab's title
+
+        :type pos: QPoint
+        :type factory: callable
+        :type text: string
+
+        :rtype: int
+        """
+        return self.insertView(pos, LazyView(factory), text)
+
+    def prefetchView(self, index):
+        """
+        Build the view at the given index if it's not built yet and returns
+        it
+
+        :param index: The tab's index
+        :type index: int
+        :rtype: QWidget
+        """
+        page = self.tabs.widget(index)
+
+        if isinstance(page, LazyView):
+            return page.materialize()
+
+        return page
+
+    @_traced("TabbedWindow.removeView",
+             lambda self, index: dict(
+                 window=_object_id(self), index=index,
+                 view=_object_id(self.tabs.widget(index))))
+    def removeView(self, index):
+        """
+        Remove the view at the given index.
+
+        The loading of a :py:class:`.tabbedwindow.PendingView` placeholder is
+        cancelled.
+
+        :param index: The tab's index to be removed
+        :type index: int
+        """
+        page = self.tabs.widget(index)
+
+        if isinstance(page, PendingView):
+            page.cancel()
+
+        self.tabs.removeTab(index)
+
+    def removeViews(self, indices):
+        """
+        Remove the views at the given indices in a single batch update.
+
+        If no views are left the window is closed at the end of the batch
+        update, see :py:meth:`.tabbedwindow.TabbedWindow.batchUpdate()`
+
+        :param indices: The tabs' indices to be removed
+        :type indices: iterable
+        """
+        with self.batchUpdate():
+            for index in sorted(set(indices), reverse=True):
+                self.removeView(index)
+
+    def reorderViews(self, order):
+        """
+        Reorder the views in a single batch update so the view at the old
+        index ``order[i]`` ends up at the index ``i``, the current view stays
+        the current one.
+
+        See :py:meth:`.tabbedwindow.TabBar.reorder()`
+
+        :param order: The permutation of the views' indices
+        :type order: list
+        """
+        with self.batchUpdate():
+            self.tabs.tabBar().reorder(order)
+
+    def sortViews(self, key=None, reverse=False):
+        """
+        Sort the views in a single batch update, by default by their tabs'
+        titles.
+
+        See :py:meth:`.tabbedwindow.TabbedWindow.reorderViews()`
+
+        :param key: Callable returning the sort key of the view at the given
+                    index
+        :param reverse: Sort in descending order
+
+        :type key: callable
+        :type reverse: bool
+        """
+        if key is None:
+            key = self.tabs.tabText
+
+        self.reorderViews(
+            sorted(range(self.tabs.count()), key=key, reverse=reverse))
+
+    def isBatchUpdating(self):
+        """
+        Returns *True* while a batch update is in progress
+
+        :rtype: bool
+        """
+        return self._batch_depth > 0
+
+    @contextlib.contextmanager
+    def batchUpdate(self):
+        """
+        Context manager grouping many changes of the views into a single
+        update.
+
+        While the outermost batch update is in progress the window is not
+        repainted, the intermediate current views are not built nor notified
+        and the window is not closed when its last tab is removed. The tab
+        widget's signals are emitted as usual.
+
+        At the end of the batch update the final current view is built and
+        notified if it has changed,
+        :py:attr:`.tabbedwindow.TabbedWindow.viewsChanged` is emitted and, if
+        the batch removed the last views, the window is closed.
+        """
+        self._batch_depth += 1
+
+        if self._batch_depth > 1:
+            try:
+                yield
+            finally:
+                self._batch_depth -= 1
+            return
+
+        # Suspend updates, the tab bar is laid out lazily when painted
+        current = self.tabs.currentWidget()
+        current_index = self.tabs.currentIndex()
+        count = self.tabs.count()
+
+        self.setUpdatesEnabled(False)
+
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+
+            self.setUpdatesEnabled(True)
+
+            # Consolidated handling of the final current view
+            index = self.tabs.currentIndex()
+
+            if (self.tabs.currentWidget() is not current or
+                    index != current_index):
+                self.tabs._materialize(index)  # pylint: disable=W0212
+                self.tabs._current_changed(index)  # pylint: disable=W0212
+                self._update_chrome()
+
+            self.viewsChanged.emit()
+
+            # An empty window is closed only if the batch emptied it
+            if self.tabs.count() == 0 and count:
+                self.close()
+
+    def submitView(self, factory, text, index=-1):
+        """
+        Enqueue a view to be added to this window, can be called from any
+        thread.
+
+        The given factory is called by the GUI thread and must return the
+        view, the view is inserted at the given index or appended if the
+        index is -1 or past the last tab.
+
+        :param factory: Callable returning the view
+        :param text: The tab's title
+        :param index: The index where the view will be inserted
+
+        :type factory: callable
+        :type text: str
+        :type index: int
+        """
+        with self._submit_lock:
+            self._submitted.append((factory, text, index))
+
+            if self._submit_posted:
+                return
+
+            self._submit_posted = True
+
+        QtGui.QApplication.postEvent(
+            self, QtCore.QEvent(self.SUBMIT_EVENT))
+
+    def pendingViews(self):
+        """
+        Returns the number of submitted views not added yet
+
+        :rtype: int
+        """
+        with self._submit_lock:
+            return len(self._submitted)
+
+    def flushSubmittedViews(self):
+        """
+        Add all the submitted views now, must be called by the GUI thread
+        """
+        self._drain_submitted(None)
+
+    def _drain_submitted(self, budget):
+        """
+        Add the submitted views in a single batch update until the given
+        budget in milliseconds is spent, returns *True* if views are left in
+        the queue
+        """
+        if not self.pendingViews():
+            return False
+
+        deadline = (
+            default_timer() + budget / 1000 if budget is not None else None)
+
+        with self.batchUpdate():
+            while True:
+                with self._submit_lock:
+                    if not self._submitted:
+                        return False
+
+                    factory, text, index = self._submitted.popleft()
+
+                if index < 0 or index > self.tabs.count():
+                    index = self.tabs.count()
+
+                # A failing factory drops only its own view
+                try:
+                    view = factory()
+                except Exception:  # pylint: disable=W0703
+                    _logger.exception("Cannot build the view %r", text)
+                else:
+                    self.tabs.insertTab(index, view, text)
+
+                if deadline is not None and default_timer() >= deadline:
+                    return self.pendingViews() > 0
+
+    def customEvent(self, event):
+        """
+        Add the submitted views within the time budget and leave the rest to
+        the next event loop iteration.
+
+        See QObject.customEvent()
+        """
+        if event.type() != self.SUBMIT_EVENT:
+            super(TabbedWindow, self).customEvent(event)
+            return
+
+        try:
+            self._drain_submitted(self.SUBMIT_BUDGET)
+        finally:
+            # Never leave the queue stalled, even if the drain failed
+            with self._submit_lock:
+                self._submit_posted = bool(self._submitted)
+
+            if self._submit_posted:
+                QtGui.QApplication.postEvent(
+                    self, QtCore.QEvent(self.SUBMIT_EVENT))
+
+    def isChromeHosting(self):
+        """
+        Returns *True* if this window shows the chrome of the current view
+
+        :rtype: bool
+        """
+        return self._chrome_hosting
+
+    def setChromeHosting(self, enabled):
+        """
+        Enable or disable the hosting of the current view's chrome.
+
+        When enabled and the current view is a QMainWindow, its tool bars are
+        moved into this window, its menus are added to this window's menu bar
+        and its status bar replaces this window's one. The chrome goes back
+        to the view when another tab becomes the current one, when the view
+        is moved or when the hosting is disabled.
+
+        :param enabled: Host the current view's chrome
+        :type enabled: bool
+        """
+        self._chrome_hosting = enabled
+        self._update_chrome()
+
+    def hostedView(self):
+        """
+        The view whose chrome is hosted by this window or *None*
+
+        :rtype: QMainWindow
+        """
+        return self._hosted[0] if self._hosted is not None else None
+
+    def _update_chrome(self, *args):  # pylint: disable=W0613
+        """
+        Host the chrome of the current view, giving back the chrome of the
+        previous one
+        """
+        if self.isBatchUpdating():
+            return
+
+        view = None
+
+        if self._chrome_hosting:
+            view = self.tabs.view(self.tabs.currentIndex())
+
+            if (not isinstance(view, QtGui.QMainWindow) or
+                    isinstance(view, TabbedWindow)):
+                view = None
+
+        if self.hostedView() is view:
+            return
+
+        updates = self.updatesEnabled()
+        self.setUpdatesEnabled(False)
+
+        try:
+            self._return_chrome()
+
+            if view is not None:
+                self._lift_chrome(view)
+        finally:
+            self.setUpdatesEnabled(updates)
+
+    def _lift_chrome(self, view):
+        """
+        Move the chrome of the given view into this window
+        """
+        # Tool bars
+        toolbars = []
+
+        for toolbar in view.findChildren(QtGui.QToolBar):
+            area = view.toolBarArea(toolbar)
+
+            if toolbar.parentWidget() is not view or area == Qt.NoToolBarArea:
+                continue
+
+            visible = not toolbar.isHidden()
+
+            view.removeToolBar(toolbar)
+            self.addToolBar(area, toolbar)
+            toolbar.setVisible(visible)
+
+            toolbars.append((toolbar, area, visible))
+
+        # Menus are shared, the view's menu bar is only hidden and this
+        # window's menu bar is created only when there's something to show
+        menubar = view.menuWidget()
+        actions = []
+
+        if isinstance(menubar, QtGui.QMenuBar):
+            actions = menubar.actions()
+
+            if actions:
+                self.menuBar().addActions(actions)
+
+            menubar.hide()
+
+        # Status bars are deleted when replaced, take them out first
+        statusbar = self._status_bar(view)
+        own_statusbar = None
+
+        if statusbar is not None:
+            own_statusbar = self._status_bar(self)
+
+            if own_statusbar is not None:
+                own_statusbar.hide()
+                own_statusbar.setParent(None)
+
+            self.setStatusBar(statusbar)
+            statusbar.show()
+
+        view.destroyed.connect(self._drop_chrome)
+
+        self._hosted = (
+            view, toolbars, actions, menubar, statusbar, own_statusbar)
+
+    def _return_chrome(self):
+        """
+        Give back the hosted chrome to its view
+        """
+        if self._hosted is None:
+            return
+
+        view, toolbars, actions, menubar, statusbar, own_statusbar = (
+            self._hosted)
+        self._hosted = None
+
+        view.destroyed.disconnect(self._drop_chrome)
+
+        for toolbar, area, visible in toolbars:
+            self.removeToolBar(toolbar)
+            view.addToolBar(area, toolbar)
+            toolbar.setVisible(visible)
+
+        for action in actions:
+            self.menuBar().removeAction(action)
+
+        if menubar is not None:
+            menubar.show()
+
+        if statusbar is not None:
+            statusbar.hide()
+            statusbar.setParent(None)
+            view.setStatusBar(statusbar)
+            statusbar.show()
+
+            if own_statusbar is not None:
+                self.setStatusBar(own_statusbar)
+                own_statusbar.show()
+
+    def _drop_chrome(self, *args):  # pylint: disable=W0613
+        """
+        Delete the hosted chrome of a destroyed view
+        """
+        if self._hosted is None:
+            return
+
+        _, toolbars, actions, _, statusbar, own_statusbar = self._hosted
+        self._hosted = None
+
+        for toolbar, _, _ in toolbars:
+            self.removeToolBar(toolbar)
+            toolbar.deleteLater()
+
+        for action in actions:
+            self.menuBar().removeAction(action)
+
+        if statusbar is not None:
+            statusbar.hide()
+            statusbar.setParent(None)
+            statusbar.deleteLater()
+
+            if own_statusbar is not None:
+                self.setStatusBar(own_statusbar)
+                own_statusbar.show()
+
+    @staticmethod
+    def _status_bar(wnd):
+        """
+        Returns the status bar of the given main window or *None*, unlike
+        QMainWindow.statusBar() a missing status bar is not created
+        """
+        for child in wnd.children():
+            if isinstance(child, QtGui.QStatusBar):
+                return child
+
+        return None
+
+    def setCurrentView(self, index):
+        """
+        Set the view at the given index as the current focused view
+
+        :param index; The tab's index to be focused
+        :type index: int
+        """
+        self.tabs.setCurrentIndex(index)
+
+    def currentView(self):
+        """
+        Returns the current focused view
+
+        :rtype: QWidget
+        """
+        return self.tabs.view(self.tabs.currentIndex())
+
+    def moveEvent(self, event):
+        """
+        Invalidate the drop targets' index.
+
+        See QWidget.moveEvent()
+        """
+        WindowRegistry.instance().invalidate()
+
+        journal = Journal.active()
+
+        if journal is not None:
+            journal.windowChanged(self)
+
+        super(TabbedWindow, self).moveEvent(event)
+
+    def resizeEvent(self, event):
+        """
+        Invalidate the drop targets' index.
+
+        See QWidget.resizeEvent()
+        """
+        WindowRegistry.instance().invalidate()
+
+        journal = Journal.active()
+
+        if journal is not None:
+            journal.windowChanged(self)
+
+        super(TabbedWindow, self).resizeEvent(event)
+
+    def changeEvent(self, event):
+        """
+        Raise the window's tab bars in the drop targets' index when the
+        window is activated and invalidate the index when the window is
+        minimised or restored.
+
+        See QWidget.changeEvent()
+        """
+        if event.type() == QtCore.QEvent.ActivationChange:
+            if self.isActiveWindow():
+                WindowRegistry.instance().raiseWindow(self)
+
+        elif event.type() == QtCore.QEvent.WindowStateChange:
+            WindowRegistry.instance().invalidate()
+            self.tabs.updateVisibility()
+
+        super(TabbedWindow, self).changeEvent(event)
+
+    def showEvent(self, event):
+        """
+        Notify the current view it's visible.
+
+        See QWidget.showEvent()
+        """
+        super(TabbedWindow, self).showEvent(event)
+
+        self.tabs.updateVisibility()
+
+    def hideEvent(self, event):
+        """
+        Notify the current view it's in background.
+
+        See QWidget.hideEvent()
+        """
+        super(TabbedWindow, self).hideEvent(event)
+
+        self.tabs.updateVisibility()
+
+    def closeEvent(self, event):
+        """
+        Invalidate the drop targets' index and put the window back into the
+        :py:class:`.tabbedwindow.WindowPool` if no tabs are left.
+
+        See QWidget.closeEvent()
+        """
+        WindowRegistry.instance().invalidate()
+
+        super(TabbedWindow, self).closeEvent(event)
+
+        if event.isAccepted():
+            journal = Journal.active()
+
+            if journal is not None:
+                journal.windowClosed(self)
+
+            WindowPool.instance().release(self)
+
+
+class Session(object):
+    """
+    Snapshot of the layout of the tabbed windows: the windows' geometry,
+    screen and state, the tabs' order and titles, the current tab and an
+    opaque state for every view.
+
+    The view's state is returned by the view's optional
+    ``saveSessionState()`` method as bytes and passed back to the factory
+    building the view when the session is restored.
+
+    The snapshot is serialised to a compact, versioned binary format by
+    :py:meth:`.tabbedwindow.Session.dumps()`.
+
+    Restoring is progressive: the windows are shown at once with only their
+    current views, the other tabs are added as
+    :py:class:`.tabbedwindow.LazyView` placeholders by
+    :py:meth:`.tabbedwindow.TabbedWindow.submitView()` during the following
+    event loop iterations.
+    """
+
+    MAGIC = b"TBWS"
+    VERSION = 1
+
+    _HEADER = struct.Struct(">4sHI")
+    _WINDOW = struct.Struct(">iiiihIiI")
+    _LENGTH = struct.Struct(">I")
+
+    Window = collections.namedtuple(
+        "Window", "geometry screen state current tabs")
+    Tab = collections.namedtuple("Tab", "text state")
+
+    def __init__(self, windows=None):
+        """
+        Constructor accepts the optional list of
+        :py:class:`.tabbedwindow.Session.Window` tuples
+
+        :param windows: The windows of the session
+        :type windows: list
+        """
+        self._windows = list(windows or [])
+
+    def windows(self):
+        """
+        The windows of the session, from the top most one
+
+        :rtype: list
+        """
+        return list(self._windows)
+
+    @classmethod
+    def capture(cls, windows=None):
+        """
+        Returns the snapshot of the given windows, by default all the visible
+        tabbed windows with at least one tab known by the
+        :py:class:`.tabbedwindow.WindowRegistry`, closed windows are only
+        hidden and are not saved
+
+        :param windows: The windows to be saved
+        :type windows: iterable
+        :rtype: :py:class:`.tabbedwindow.Session`
+        """
+        if windows is None:
+            windows = [
+                wnd for wnd in WindowRegistry.instance().windows()
+                if isinstance(wnd, TabbedWindow) and wnd.tabs.count() and
+                wnd.isVisible()
+            ]
+
+        desktop = QtGui.QApplication.desktop()
+        snapshot = []
+
+        for wnd in windows:
+            if wnd.windowState() & (Qt.WindowMinimized | Qt.WindowMaximized):
+                geometry = wnd.normalGeometry()
+            else:
+                geometry = wnd.geometry()
+
+            tabs = wnd.tabs
+            snapshot.append(cls.Window(
+                geometry=(geometry.x(), geometry.y(),
+                          geometry.width(), geometry.height()),
+                screen=desktop.screenNumber(wnd),
+                state=int(wnd.windowState()),
+                current=tabs.currentIndex(),
+                tabs=[
+                    cls.Tab(tabs.tabText(index), cls._view_state(tabs, index))
+                    for index in range(tabs.count())
+                ],
+            ))
+
+        return cls(snapshot)
+
+    @staticmethod
+    def _view_state(tabs, index):
+        """
+        Returns the state of the view at the given index of the given tab
+        widget
+        """
+        page = tabs.widget(index)
+        view = page
+
+        if isinstance(page, LazyView):
+            view = page.view()
+
+            if view is None:
+                return page.sessionState() or b""
+
+        if hasattr(view, "saveSessionState"):
+            return bytes(view.saveSessionState())
+
+        return b""
+
+    def dumps(self):
+        """
+        Serialise the session
+
+        :rtype: bytes
+        """
+        chunks = [self._HEADER.pack(
+            self.MAGIC, self.VERSION, len(self._windows))]
+
+        for wnd in self._windows:
+            chunks.append(self._WINDOW.pack(
+                *(tuple(wnd.geometry) +
+                  (wnd.screen, wnd.state, wnd.current, len(wnd.tabs)))
+            ))
+
+            for tab in wnd.tabs:
+                text = tab.text.encode("utf-8")
+
+                chunks.append(self._LENGTH.pack(len(text)))
+                chunks.append(text)
+                chunks.append(self._LENGTH.pack(len(tab.state)))
+                chunks.append(tab.state)
+
+        return b"".join(chunks)
+
+    @classmethod
+    def loads(cls, data):
+        """
+        Returns the session serialised in the given data
+
+        :param data: The serialised session
+        :type data: bytes
+        :rtype: :py:class:`.tabbedwindow.Session`
+        """
+        data = memoryview(data)
+
+        try:
+            magic, version, count = cls._HEADER.unpack_from(data, 0)
+        except struct.error:
+            raise ValueError("Not a session")
+
+        if magic != cls.MAGIC:
+            raise ValueError("Not a session")
+
+        if version != cls.VERSION:
+            raise ValueError("Unsupported session version {0}".format(version))
+
+        offset = cls._HEADER.size
+        windows = []
+
+        try:
+            for _ in range(count):
+                fields = cls._WINDOW.unpack_from(data, offset)
+                offset += cls._WINDOW.size
+                tabs = []
+
+                for _ in range(fields[7]):
+                    text, offset = cls._unpack_bytes(data, offset)
+                    state, offset = cls._unpack_bytes(data, offset)
+
+                    tabs.append(cls.Tab(text.decode("utf-8"), state))
+
+                windows.append(cls.Window(
+                    geometry=fields[:4], screen=fields[4], state=fields[5],
+                    current=fields[6], tabs=tabs
+                ))
+        except struct.error:
+            raise ValueError("Truncated session")
+
+        return cls(windows)
+
+    @classmethod
+    def _unpack_bytes(cls, data, offset):
+        """
+        Returns the length-prefixed bytes at the given offset and the offset
+        following them
+        """
+        length, = cls._LENGTH.unpack_from(data, offset)
+        offset += cls._LENGTH.size
+
+        if offset + length > len(data):
+            raise struct.error("Truncated data")
+
+        return data[offset:offset + length].tobytes(), offset + length
+
+    def save(self, path):
+        """
+        Write the serialised session into the file at the given path
+
+        :param path: The file's path
+        :type path: str
+        """
+        with open(path, "wb") as output:
+            output.write(self.dumps())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Returns the session serialised in the file at the given path
+
+        :param path: The file's path
+        :type path: str
+        :rtype: :py:class:`.tabbedwindow.Session`
+        """
+        with open(path, "rb") as source:
+            return cls.loads(source.read())
+
+    def restore(self, factory, window_factory=None):
+        """
+        Restore the session and returns the new windows.
+
+        The windows not minimised are shown first with only their current
+        view, the other tabs are added as :py:class:`.tabbedwindow.LazyView`
+        placeholders in the following event loop iterations and their views
+        are built only when activated.
+
+        :param factory: Callable building a view from the tab's title and
+                        the view's state
+        :param window_factory: Callable without arguments returning a new
+                               window, by default
+                               :py:class:`.tabbedwindow.TabbedWindow`
+
+        :type factory: callable
+        :type window_factory: callable
+
+        :rtype: list
+        """
+        if window_factory is None:
+            window_factory = TabbedWindow
+
+        desktop = QtGui.QApplication.desktop()
+        windows = []
+
+        # Current views first
+        for snapshot in self._windows:
+            if not snapshot.tabs:
+                continue
+
+            current = min(max(snapshot.current, 0), len(snapshot.tabs) - 1)
+            tab = snapshot.tabs[current]
+
+            wnd = window_factory()
+            wnd.addView(factory(tab.text, tab.state), tab.text)
+
+            geometry = QtCore.QRect(*snapshot.geometry)
+
+            # Screens could have been removed since the session was saved
+            if not desktop.availableGeometry(
+                    snapshot.screen).intersects(geometry):
+                geometry.moveCenter(desktop.availableGeometry().center())
+
+            wnd.setGeometry(geometry)
+            wnd.setWindowState(Qt.WindowStates(snapshot.state))
+
+            windows.append((wnd, snapshot, current))
+
+        # Visible windows first
+        for wnd, snapshot, _ in windows:
+            if not snapshot.state & Qt.WindowMinimized:
+                wnd.show()
+
+        for wnd, snapshot, _ in windows:
+            if snapshot.state & Qt.WindowMinimized:
+                wnd.show()
+
+        # The other tabs during the following event loop iterations
+        for wnd, snapshot, current in windows:
+            for index, tab in enumerate(snapshot.tabs):
+                if index == current:
+                    continue
+
+                wnd.submitView(
+                    functools.partial(
+                        self._placeholder, factory, tab.text, tab.state),
+                    tab.text,
+                    index if index < current else -1
+                )
+
+        return [wnd for wnd, _, _ in windows]
+
+    @staticmethod
+    def _placeholder(factory, text, state):
+        """
+        Returns the placeholder of a restored view
+        """
+        page = LazyView(functools.partial(factory, text, state))
+        page.setSessionState(state)
+
+        return page
+
+
+class Journal(QtCore.QObject):
+    """
+    Append-only journal of the changes of the tabbed windows' layout, used to
+    recover the layout after a crash.
+
+    Once installed the journal records every view inserted, removed or moved
+    in any :py:class:`.tabbedwindow.TabWidget`, the current tab, the windows'
+    geometry and the closed windows: adding, inserting and removing views,
+    in-place moves, moves between windows and torn-off tabs are all recorded
+    by these changes.
+
+    The records are collected by the GUI thread and handed to a writer thread
+    every :py:attr:`.tabbedwindow.Journal.FLUSH_INTERVAL` milliseconds as a
+    single checksummed frame, a frame partially written by a crash is
+    discarded by the replay. Every
+    :py:attr:`.tabbedwindow.Journal.COMPACT_THRESHOLD` records the journal is
+    replaced by a :py:class:`.tabbedwindow.Session` snapshot.
+
+    :py:meth:`.tabbedwindow.Journal.replay()` returns the last recorded
+    layout as a :py:class:`.tabbedwindow.Session` to be restored.
+    """
+
+    MAGIC = b"TBWJ"
+    VERSION = 1
+
+    FLUSH_INTERVAL = 200
+    COMPACT_THRESHOLD = 10000
+
+    # Records
+    SNAPSHOT = 1
+    WINDOW = 2
+    INSERT = 3
+    REMOVE = 4
+    MOVE = 5
+    CURRENT = 6
+    CLOSE = 7
+
+    _HEADER = struct.Struct(">4sH")
+    _FRAME = struct.Struct(">II")
+    _TYPE = struct.Struct(">B")
+    _ID = struct.Struct(">I")
+    _GEOMETRY = struct.Struct(">iiiihI")
+    _INDEX = struct.Struct(">i")
+    _LENGTH = struct.Struct(">I")
+
+    _active = None
+
+    def __init__(self, path, parent=None):
+        """
+        Constructor accepts the path of the journal's file and the optional
+        parent object
+
+        :param path: The journal's file path
+        :param parent: The optional parent object
+
+        :type path: str
+        :type parent: QObject
+        """
+        # Call superclass
+        super(Journal, self).__init__(parent)
+
+        # Protected attributes
+        self._path = path
+        self._ids = weakref.WeakKeyDictionary()
+        self._next_id = 1
+        self._records = []
+        self._moved = weakref.WeakKeyDictionary()
+        self._count = 0
+
+        self._queue = collections.deque()
+        self._condition = threading.Condition()
+        self._enqueued = 0
+        self._written = 0
+        self._error = None
+        self._writer = None
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.FLUSH_INTERVAL)
+        self._timer.timeout.connect(self.flush)
+
+    @classmethod
+    def active(cls):
+        """
+        Returns the installed journal or *None*
+
+        :rtype: :py:class:`.tabbedwindow.Journal`
+        """
+        return cls._active
+
+    def path(self):
+        """
+        The journal's file path
+
+        :rtype: str
+        """
+        return self._path
+
+    def install(self):
+        """
+        Start recording the layout's changes, the journal's file is replaced
+        by a snapshot of the current layout
+        """
+        Journal._active = self
+
+        self._writer = threading.Thread(target=self._write_loop)
+        self._writer.daemon = True
+        self._writer.start()
+
+        self.compact()
+
+    def uninstall(self):
+        """
+        Stop recording, write the pending records and wait for the writer
+        thread to finish
+        """
+        if Journal._active is self:
+            Journal._active = None
+
+        if self._writer is None:
+            return
+
+        self.flush()
+        self._enqueue(None, None)
+        self._writer.join()
+        self._writer = None
+
+    def error(self):
+        """
+        The last error raised by the writer thread or *None*
+
+        :rtype: Exception
+        """
+        return self._error
+
+    def flush(self, wait=False):
+        """
+        Hand the pending records to the writer thread as a single frame,
+        optionally waiting until they are written on disk
+
+        :param wait: Wait for the records to be written
+        :type wait: bool
+        """
+        self._timer.stop()
+
+        for wnd in list(self._moved.keys()):
+            self._record_window(wnd)
+
+        self._moved.clear()
+
+        if self._records:
+            payload = b"".join(self._records)
+            self._records = []
+
+            self._enqueue("append", self._frame(payload))
+
+        if self._count >= self.COMPACT_THRESHOLD:
+            self.compact()
+
+        if wait:
+            self.wait()
+
+    def wait(self):
+        """
+        Wait until all the records handed to the writer thread are written
+        """
+        with self._condition:
+            target = self._enqueued
+
+            while self._written < target and self._writer is not None:
+                self._condition.wait()
+
+    def compact(self):
+        """
+        Replace the journal with a snapshot of the current layout
+        """
+        self._records = []
+        self._moved.clear()
+        self._count = 0
+
+        # Closed windows are only hidden, they are dropped by the replay too
+        windows = [
+            wnd for wnd in WindowRegistry.instance().windows()
+            if isinstance(wnd, TabbedWindow) and wnd.tabs.count() and
+            wnd.isVisible()
+        ]
+        # Windows left out get a new identifier if they change again
+        for wnd in list(self._ids.keys()):
+            if wnd not in windows:
+                del self._ids[wnd]
+
+        ids = [self._window_id(wnd, record=False) for wnd in windows]
+        session = Session.capture(windows).dumps()
+
+        record = b"".join(
+            [self._TYPE.pack(self.SNAPSHOT), self._LENGTH.pack(len(ids))] +
+            [self._ID.pack(wid) for wid in ids] +
+            [self._pack_bytes(session)]
+        )
+
+        self._enqueue("snapshot", self._frame(record))
+
+    def viewInserted(self, tabs, index):
+        """
+        Record the view inserted into the given tab widget at the given index
+
+        :param tabs: The tab widget
+        :param index: The view's index
+
+        :type tabs: :py:class:`.tabbedwindow.TabWidget`
+        :type index: int
+        """
+        wnd = tabs.window()
+
+        if not isinstance(wnd, TabbedWindow):
+            return
+
+        self._append(
+            self.INSERT, wnd, self._ID.pack(index),
+            self._pack_bytes(tabs.tabText(index).encode("utf-8")),
+            self._pack_bytes(Session._view_state(tabs, index)),
+        )
+
+    def viewRemoved(self, tabs, index):
+        """
+        Record the view removed from the given tab widget at the given index
+
+        :param tabs: The tab widget
+        :param index: The view's index
+
+        :type tabs: :py:class:`.tabbedwindow.TabWidget`
+        :type index: int
+        """
+        wnd = tabs.window()
+
+        if isinstance(wnd, TabbedWindow) and wnd in self._ids:
+            self._append(self.REMOVE, wnd, self._ID.pack(index))
+
+    def viewMoved(self, tabs, from_index, to_index):
+        """
+        Record the view moved in-place in the given tab widget
+
+        :param tabs: The tab widget
+        :param from_index: The view's old index
+        :param to_index: The view's new index
+
+        :type tabs: :py:class:`.tabbedwindow.TabWidget`
+        :type from_index: int
+        :type to_index: int
+        """
+        wnd = tabs.window()
+
+        if isinstance(wnd, TabbedWindow) and wnd in self._ids:
+            self._append(
+                self.MOVE, wnd,
+                self._ID.pack(from_index), self._ID.pack(to_index))
+
+    def currentChanged(self, tabs, index):
+        """
+        Record the current tab of the given tab widget
+
+        :param tabs: The tab widget
+        :param index: The current tab's index
+
+        :type tabs: :py:class:`.tabbedwindow.TabWidget`
+        :type index: int
+        """
+        wnd = tabs.window()
+
+        if isinstance(wnd, TabbedWindow) and wnd in self._ids:
+            self._append(self.CURRENT, wnd, self._INDEX.pack(index))
+
+    def windowChanged(self, wnd):
+        """
+        Record the geometry of the given window at the next flush
+
+        :param wnd: The moved or resized window
+        :type wnd: :py:class:`.tabbedwindow.TabbedWindow`
+        """
+        if wnd in self._ids:
+            self._moved[wnd] = True
+            self._schedule()
+
+    def windowClosed(self, wnd):
+        """
+        Record the given closed window
+
+        :param wnd: The closed window
+        :type wnd: :py:class:`.tabbedwindow.TabbedWindow`
+        """
+        wid = self._ids.pop(wnd, None)
+
+        if wid is not None:
+            self._moved.pop(wnd, None)
+            self._records.append(
+                self._TYPE.pack(self.CLOSE) + self._ID.pack(wid))
+            self._count += 1
+            self._schedule()
+
+    def _window_id(self, wnd, record=True):
+        """
+        Returns the journal's identifier of the given window, a new window is
+        recorded with its geometry
+        """
+        wid = self._ids.get(wnd)
+
+        if wid is None:
+            wid = self._ids[wnd] = self._next_id
+            self._next_id += 1
+
+            if record:
+                self._record_window(wnd)
+
+        return wid
+
+    def _record_window(self, wnd):
+        """
+        Record the geometry of the given window
+        """
+        if wnd.windowState() & (Qt.WindowMinimized | Qt.WindowMaximized):
+            geometry = wnd.normalGeometry()
+        else:
+            geometry = wnd.geometry()
+
+        self._records.append(
+            self._TYPE.pack(self.WINDOW) +
+            self._ID.pack(self._ids[wnd]) +
+            self._GEOMETRY.pack(
+                geometry.x(), geometry.y(), geometry.width(),
+                geometry.height(),
+                QtGui.QApplication.desktop().screenNumber(wnd),
+                int(wnd.windowState())
+            )
+        )
+        self._count += 1
+
+    def _append(self, kind, wnd, *fields):
+        """
+        Append a record of the given kind about the given window
+        """
+        wid = self._window_id(wnd)
+
+        self._records.append(
+            self._TYPE.pack(kind) + self._ID.pack(wid) + b"".join(fields))
+        self._count += 1
+        self._schedule()
+
+    def _schedule(self):
+        """
+        Schedule the flush of the pending records
+        """
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _enqueue(self, kind, data):
+        """
+        Hand the given data to the writer thread
+        """
+        with self._condition:
+            self._queue.append((kind, data))
+            self._enqueued += 1
+            self._condition.notify_all()
+
+    def _write_loop(self):
+        """
+        Writer thread's main loop
+        """
+        output = None
+
+        try:
+            while True:
+                with self._condition:
+                    while not self._queue:
+                        self._condition.wait()
+
+                    items = list(self._queue)
+                    self._queue.clear()
+
+                for kind, data in items:
+                    if kind is None:
+                        return
+
+                    try:
+                        output = self._write(output, kind, data)
+                    except (IOError, OSError) as error:
+                        self._error = error
+
+                if output is not None:
+                    output.flush()
+                    os.fsync(output.fileno())
+
+                with self._condition:
+                    self._written += len(items)
+                    self._condition.notify_all()
+        finally:
+            if output is not None:
+                output.close()
+
+            # Release the threads still waiting
+            with self._condition:
+                self._written = self._enqueued
+                self._condition.notify_all()
+
+    def _write(self, output, kind, data):
+        """
+        Write the given data, a snapshot replaces the journal's file
+        atomically, and returns the journal's file open for appending
+        """
+        if kind == "snapshot":
+            if output is not None:
+                output.close()
+
+            temp = self._path + ".tmp"
+
+            with open(temp, "wb") as snapshot:
+                snapshot.write(self._HEADER.pack(self.MAGIC, self.VERSION))
+                snapshot.write(data)
+                snapshot.flush()
+                os.fsync(snapshot.fileno())
+
+            # Renaming over an existing file is atomic only on POSIX
+            if os.name == "nt" and os.path.exists(self._path):
+                os.remove(self._path)
+
+            os.rename(temp, self._path)
+
+            return open(self._path, "ab")
+
+        if output is None:
+            output = open(self._path, "ab")
+
+        output.write(data)
+
+        return output
+
+    @classmethod
+    def _frame(cls, payload):
+        """
+        Returns the given payload framed with its length and checksum
+        """
+        return cls._FRAME.pack(
+            len(payload), zlib.crc32(payload) & 0xffffffff) + payload
+
+    @classmethod
+    def _pack_bytes(cls, data):
+        """
+        Returns the given bytes prefixed by their length
+        """
+        return cls._LENGTH.pack(len(data)) + data
+
+    @classmethod
+    def replay(cls, path):
+        """
+        Returns the last layout recorded in the journal at the given path,
+        the records after the first damaged frame are ignored, an intact
+        frame with records not matching the layout is skipped
+
+        :param path: The journal's file path
+        :type path: str
+        :rtype: :py:class:`.tabbedwindow.Session`
+        """
+        with open(path, "rb") as source:
+            data = memoryview(source.read())
+
+        try:
+            magic, version = cls._HEADER.unpack_from(data, 0)
+        except struct.error:
+            raise ValueError("Not a journal")
+
+        if magic != cls.MAGIC:
+            raise ValueError("Not a journal")
+
+        if version != cls.VERSION:
+            raise ValueError("Unsupported journal version {0}".format(version))
+
+        windows = collections.OrderedDict()
+        offset = cls._HEADER.size
+
+        while offset + cls._FRAME.size <= len(data):
+            length, checksum = cls._FRAME.unpack_from(data, offset)
+            start = offset + cls._FRAME.size
+            payload = data[start:start + length].tobytes()
+
+            if len(payload) < length:
+                break
+
+            if zlib.crc32(payload) & 0xffffffff != checksum:
+                break
+
+            try:
+                cls._apply(windows, payload)
+            except (KeyError, IndexError, ValueError, struct.error):
+                pass
+
+            offset = start + length
+
+        return Session([
+            Session.Window(
+                geometry=tuple(wnd["geometry"]), screen=wnd["screen"],
+                state=wnd["state"],
+                current=min(max(wnd["current"], 0), len(wnd["tabs"]) - 1),
+                tabs=wnd["tabs"])
+            for wnd in windows.values() if wnd["tabs"]
+        ])
+
+    @classmethod
+    def _apply(cls, windows, payload):
+        """
+        Apply the records in the given frame's payload to the given windows
+        """
+        offset = 0
+        payload = memoryview(payload)
+
+        while offset < len(payload):
+            kind, = cls._TYPE.unpack_from(payload, offset)
+            offset += cls._TYPE.size
+
+            if kind == cls.SNAPSHOT:
+                count, = cls._LENGTH.unpack_from(payload, offset)
+                offset += cls._LENGTH.size
+                ids = []
+
+                for _ in range(count):
+                    ids.append(cls._ID.unpack_from(payload, offset)[0])
+                    offset += cls._ID.size
+
+                data, offset = Session._unpack_bytes(payload, offset)
+
+                windows.clear()
+
+                for wid, snapshot in zip(ids, Session.loads(data).windows()):
+                    windows[wid] = dict(
+                        geometry=snapshot.geometry, screen=snapshot.screen,
+                        state=snapshot.state, current=snapshot.current,
+                        tabs=list(snapshot.tabs)
+                    )
+
+                continue
+
+            wid, = cls._ID.unpack_from(payload, offset)
+            offset += cls._ID.size
+
+            if kind == cls.WINDOW:
+                fields = cls._GEOMETRY.unpack_from(payload, offset)
+                offset += cls._GEOMETRY.size
+
+                wnd = windows.setdefault(wid, dict(current=0, tabs=[]))
+                wnd.update(
+                    geometry=fields[:4], screen=fields[4], state=fields[5])
+
+            elif kind == cls.INSERT:
+                index, = cls._ID.unpack_from(payload, offset)
+                offset += cls._ID.size
+
+                text, offset = Session._unpack_bytes(payload, offset)
+                state, offset = Session._unpack_bytes(payload, offset)
+
+                windows[wid]["tabs"].insert(
+                    index, Session.Tab(text.decode("utf-8"), state))
+
+            elif kind == cls.REMOVE:
+                index, = cls._ID.unpack_from(payload, offset)
+                offset += cls._ID.size
+
+                del windows[wid]["tabs"][index]
+
+            elif kind == cls.MOVE:
+                from_index, to_index = (
+                    cls._ID.unpack_from(payload, offset)[0],
+                    cls._ID.unpack_from(payload, offset + cls._ID.size)[0])
+                offset += 2 * cls._ID.size
+
+                tabs = windows[wid]["tabs"]
+                tabs.insert(to_index, tabs.pop(from_index))
+
+            elif kind == cls.CURRENT:
+                windows[wid]["current"], = cls._INDEX.unpack_from(
+                    payload, offset)
+                offset += cls._INDEX.size
+
+            elif kind == cls.CLOSE:
+                windows.pop(wid, None)
+
+            else:
+                raise ValueError("Unknown journal record {0}".format(kind))
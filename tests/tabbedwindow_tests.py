@@ -26,21 +26,35 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 """
 
 from __future__ import division, print_function, unicode_literals
-from mock import patch
-from tabbedwindow import TabbedWindow, GhostWindow
+from concurrent import futures
+from mock import Mock, patch
+from tabbedwindow import (TabbedWindow, CachedSnapshotRenderer, DragObserver,
+                          DragStatistics, GhostWindow, HibernationManager,
+                          Journal, LazyView, OutlineRenderer, PendingView,
+                          Session, SnapshotCache, SnapshotRenderer, TabBar,
+                          TabWidget, ThumbnailRenderer, Tracer, ViewThrottle,
+                          WindowPool, WindowRegistry)
 import gc
+import json
+import os
 import sys
+import tempfile
+import threading
 import unittest
 from PyQt4 import QtGui, QtCore
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
 from PyQt4.QtCore import Qt
 
 
 class MouseEvent(QtGui.QMouseEvent):
 
-    def __init__(self, pos, button=Qt.LeftButton):
+    def __init__(self, pos, button=Qt.LeftButton, modifiers=Qt.NoModifier):
         super(MouseEvent, self).__init__(
             QtCore.QEvent.MouseButtonPress, pos,
-            button, Qt.NoButton, Qt.NoModifier
+            button, Qt.NoButton, modifiers
         )
 
     # Returns global's fake mouse position
@@ -153,6 +167,352 @@ class TabbedWindowTests(WidgetTestsMixin, unittest.TestCase):
         self.assertEqual(self.window.tabs.tabText(index + 1), title1)
         self.assertEqual(self.window.tabs.widget(index + 1), view1)
 
+    def test_add_views(self):
+        views = [(QtGui.QWidget(), "title {0}".format(i)) for i in xrange(5)]
+        changed = Mock()
+
+        self.window.viewsChanged.connect(changed)
+
+        indices = self.window.addViews(views)
+
+        # Check
+        self.assertEqual(indices, list(xrange(5)))
+        self.assertEqual(changed.call_count, 1)
+
+        for index, (view, title) in zip(indices, views):
+            self.assertEqual(self.window.tabs.widget(index), view)
+            self.assertEqual(self.window.tabs.tabText(index), title)
+
+    def test_insert_views(self):
+        view = QtGui.QWidget()
+
+        self.window.addView(view, "title")
+
+        views = [(QtGui.QWidget(), "title {0}".format(i)) for i in xrange(3)]
+        indices = self.window.insertViews(QtCore.QPoint(), views)
+
+        # Check
+        self.assertEqual(indices, [0, 1, 2])
+        self.assertEqual(self.window.tabs.widget(3), view)
+
+        for index, (view, _) in zip(indices, views):
+            self.assertEqual(self.window.tabs.widget(index), view)
+
+    @patch.object(TabbedWindow, "close")
+    def test_remove_views(self, mock_close):
+        self.window.addViews(
+            [(QtGui.QWidget(), "title {0}".format(i)) for i in xrange(5)])
+
+        changed = Mock()
+        self.window.viewsChanged.connect(changed)
+
+        # Remove some views
+        view = self.window.tabs.widget(1)
+        self.window.removeViews([0, 2, 3, 4])
+
+        self.assertEqual(self.window.tabs.count(), 1)
+        self.assertEqual(self.window.tabs.widget(0), view)
+        self.assertEqual(changed.call_count, 1)
+        self.assertFalse(mock_close.called)
+
+        # The window is closed only once at the end of the batch
+        self.window.removeViews([0])
+
+        mock_close.assert_called_once_with()
+
+    def test_batch_update_signals(self):
+        self.window.addView(QtGui.QWidget(), "first")
+        self.window.show()
+
+        changed = Mock()
+        self.window.tabs.currentChanged.connect(changed)
+
+        tabbar = self.window.tabs.tabBar()
+        factory = Mock(side_effect=QtGui.QWidget)
+
+        with self.window.batchUpdate():
+            self.window.addViewFactory(factory, "lazy")
+            self.window.addView(QtGui.QWidget(), "last")
+
+            # The tab widget's signals are not blocked, the tab bar is not
+            # hidden
+            self.window.setCurrentView(1)
+            self.window.setCurrentView(2)
+
+            self.assertTrue(tabbar.isVisible())
+            self.assertEqual(changed.call_count, 2)
+
+        # Intermediate current views are not built
+        self.assertFalse(factory.called)
+
+    @patch.object(TabbedWindow, "close")
+    def test_empty_batch(self, mock_close):
+        """
+        A batch not removing any view doesn't close an empty window
+        """
+        self.window.addViews([])
+        self.window.reorderViews([])
+
+        self.assertFalse(mock_close.called)
+
+    def test_reorder_views(self):
+        views = [QtGui.QWidget() for _ in xrange(6)]
+
+        for i, view in enumerate(views):
+            self.window.addView(view, "title {0}".format(i))
+
+        self.window.setCurrentView(1)
+
+        changed = Mock()
+        self.window.viewsChanged.connect(changed)
+
+        # Only the first tab is out of place
+        order = [1, 2, 3, 4, 5, 0]
+
+        with patch.object(
+                self.window.tabs.tabBar(), "moveTab",
+                wraps=self.window.tabs.tabBar().moveTab) as mock_move:
+            self.window.reorderViews(order)
+
+            self.assertEqual(mock_move.call_count, 1)
+
+        # Check
+        for index, old_index in enumerate(order):
+            self.assertEqual(self.window.tabs.widget(index), views[old_index])
+
+        self.assertEqual(self.window.currentView(), views[1])
+        self.assertEqual(changed.call_count, 1)
+
+    def test_reorder_views_invalid(self):
+        self.window.addView(QtGui.QWidget(), "title")
+
+        with self.assertRaises(ValueError):
+            self.window.reorderViews([1, 0])
+
+    def test_sort_views(self):
+        for title in ("b", "c", "a"):
+            self.window.addView(QtGui.QWidget(), title)
+
+        self.window.sortViews()
+
+        self.assertEqual(
+            [self.window.tabs.tabText(i) for i in xrange(3)], ["a", "b", "c"])
+
+        self.window.sortViews(reverse=True)
+
+        self.assertEqual(
+            [self.window.tabs.tabText(i) for i in xrange(3)], ["c", "b", "a"])
+
+    def test_submit_view(self):
+        changed = Mock()
+        self.window.viewsChanged.connect(changed)
+
+        # Submit from worker threads
+        def worker(first):
+            for i in xrange(first, first + 10):
+                self.window.submitView(
+                    QtGui.QWidget, "title {0}".format(i))
+
+        threads = [
+            threading.Thread(target=worker, args=(i * 10,)) for i in xrange(3)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        # Views are added by the GUI thread only
+        self.assertEqual(self.window.tabs.count(), 0)
+        self.assertEqual(self.window.pendingViews(), 30)
+
+        QtGui.QApplication.sendPostedEvents(
+            self.window, TabbedWindow.SUBMIT_EVENT)
+
+        self.assertGreater(self.window.tabs.count(), 0)
+        self.assertEqual(changed.call_count, 1)
+
+        self.window.flushSubmittedViews()
+
+        self.assertEqual(self.window.tabs.count(), 30)
+        self.assertEqual(self.window.pendingViews(), 0)
+
+    def test_submit_view_index(self):
+        self.window.addView(QtGui.QWidget(), "last")
+        self.window.submitView(QtGui.QWidget, "first", 0)
+        self.window.flushSubmittedViews()
+
+        self.assertEqual(
+            [self.window.tabs.tabText(i) for i in xrange(2)],
+            ["first", "last"]
+        )
+
+    def test_submit_view_failed(self):
+        def factory():
+            raise ValueError("error")
+
+        self.window.submitView(factory, "failed")
+        self.window.submitView(QtGui.QWidget, "title")
+
+        with patch("tabbedwindow._logger") as logger:
+            QtGui.QApplication.sendPostedEvents(
+                self.window, TabbedWindow.SUBMIT_EVENT)
+
+        # The failed view is dropped, the others are added
+        self.assertEqual(logger.exception.call_count, 1)
+        self.assertEqual(self.window.tabs.count(), 1)
+        self.assertEqual(self.window.tabs.tabText(0), "title")
+        self.assertEqual(self.window.pendingViews(), 0)
+
+    def test_submit_view_zero_budget(self):
+        self.window.submitView(QtGui.QWidget, "first")
+        self.window.submitView(QtGui.QWidget, "second")
+
+        with patch.object(TabbedWindow, "SUBMIT_BUDGET", 0):
+            self.window.customEvent(QtCore.QEvent(TabbedWindow.SUBMIT_EVENT))
+
+        # A zero budget adds a single view per event loop iteration
+        self.assertEqual(self.window.tabs.count(), 1)
+        self.assertEqual(self.window.pendingViews(), 1)
+
+    def test_add_view_future(self):
+        future = futures.Future()
+        index = self.window.addView(future, "title")
+        page = self.window.tabs.widget(index)
+
+        # Placeholder until resolved
+        self.assertIsInstance(page, PendingView)
+        self.assertTrue(page.isPending())
+        self.assertIs(self.window.tabs.view(index), page)
+
+        view = QtGui.QWidget()
+        future.set_result(view)
+
+        self.assertFalse(page.isPending())
+        self.assertIs(self.window.tabs.view(index), view)
+
+    def test_add_view_future_factory(self):
+        future = futures.Future()
+        factory = Mock(side_effect=lambda data: QtGui.QWidget())
+
+        index = self.window.addView(future, "title", factory)
+        future.set_result("data")
+
+        factory.assert_called_once_with("data")
+        self.assertTrue(self.window.tabs.widget(index).isMaterialized())
+
+    @unittest.skipIf(asyncio is None, "asyncio not available")
+    def test_add_view_coroutine(self):
+        # Python 2 can't parse the async syntax
+        namespace = {}
+        exec("async def load(view):\n    return view\n", namespace)
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        try:
+            view = QtGui.QWidget()
+            index = self.window.addView(namespace["load"](view), "title")
+            page = self.window.tabs.widget(index)
+
+            self.assertTrue(page.isPending())
+
+            loop.run_until_complete(page.future())
+
+            self.assertIsNone(page.error())
+            self.assertIs(self.window.tabs.view(index), view)
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    def test_add_view_future_failed(self):
+        future = futures.Future()
+        index = self.window.addView(future, "title")
+        page = self.window.tabs.widget(index)
+
+        future.set_exception(ValueError("error"))
+
+        self.assertIsInstance(page.error(), ValueError)
+        self.assertFalse(page.isMaterialized())
+
+    def test_remove_view_cancel_loading(self):
+        future = futures.Future()
+        self.window.addView(QtGui.QWidget(), "view")
+        self.window.addView(future, "title")
+
+        self.window.removeView(1)
+
+        self.assertTrue(future.cancelled())
+
+    def test_load_view(self):
+        future = futures.Future()
+        executor = Mock()
+        executor.submit.return_value = future
+        loader = Mock()
+
+        with patch.object(TabbedWindow, "EXECUTOR", executor):
+            index = self.window.loadView(loader, "title")
+
+        executor.submit.assert_called_once_with(loader)
+        self.assertIs(self.window.tabs.widget(index).future(), future)
+
+    def test_view_visibility(self):
+        view1 = QtGui.QWidget()
+        view1.viewVisibilityChanged = Mock()
+        view2 = QtGui.QWidget()
+        view2.viewVisibilityChanged = Mock()
+
+        # Window not shown yet
+        self.window.addView(view1, "view1")
+        self.window.addView(view2, "view2")
+
+        view1.viewVisibilityChanged.assert_called_once_with(
+            TabWidget.BACKGROUND)
+        view2.viewVisibilityChanged.assert_called_once_with(TabWidget.HIDDEN)
+
+        self.window.show()
+
+        view1.viewVisibilityChanged.assert_called_with(TabWidget.VISIBLE)
+
+        # Switch tab
+        self.window.setCurrentView(1)
+
+        view1.viewVisibilityChanged.assert_called_with(TabWidget.HIDDEN)
+        view2.viewVisibilityChanged.assert_called_with(TabWidget.VISIBLE)
+
+        # Minimise the window
+        self.window.showMinimized()
+
+        view2.viewVisibilityChanged.assert_called_with(TabWidget.BACKGROUND)
+
+    def test_view_throttle(self):
+        view = QtGui.QWidget()
+        timer = QtCore.QTimer(view)
+        timer.start(1000)
+        source = Mock()
+
+        throttle = ViewThrottle(view)
+        throttle.addTimer(timer)
+        throttle.addSource(source.suspend, source.resume)
+
+        self.assertIs(ViewThrottle.forView(view), throttle)
+
+        # Hidden tab
+        self.window.addView(QtGui.QWidget(), "current")
+        self.window.addView(view, "throttled")
+
+        self.assertTrue(throttle.isSuspended())
+        self.assertFalse(timer.isActive())
+        source.suspend.assert_called_once_with()
+
+        # Current tab
+        self.window.show()
+        self.window.setCurrentView(1)
+
+        self.assertFalse(throttle.isSuspended())
+        self.assertTrue(timer.isActive())
+        source.resume.assert_called_once_with()
+
     def test_current_view(self):
         # Add view
         view1 = QtGui.QWidget()
@@ -170,6 +530,43 @@ class TabbedWindowTests(WidgetTestsMixin, unittest.TestCase):
         self.window.setCurrentView(index2)
         self.assertEqual(self.window.currentView(), view2)
 
+    def test_add_view_factory(self):
+        views = []
+
+        def factory():
+            views.append(QtGui.QWidget())
+
+            return views[-1]
+
+        # The first tab becomes the current one and it's built
+        self.window.addViewFactory(factory, "title1")
+        index = self.window.addViewFactory(factory, "title2")
+
+        self.assertEqual(len(views), 1)
+        self.assertEqual(self.window.currentView(), views[0])
+
+        # The second tab is built on activation only
+        page = self.window.tabs.widget(index)
+
+        self.assertIsInstance(page, LazyView)
+        self.assertFalse(page.isMaterialized())
+        self.assertEqual(self.window.tabs.tabText(index), "title2")
+
+        self.window.setCurrentView(index)
+
+        self.assertEqual(len(views), 2)
+        self.assertEqual(self.window.currentView(), views[1])
+
+    def test_prefetch_view(self):
+        view = QtGui.QWidget()
+
+        self.window.addView(QtGui.QWidget(), "title1")
+        index = self.window.addViewFactory(lambda: view, "title2")
+
+        self.assertFalse(self.window.tabs.widget(index).isMaterialized())
+        self.assertEqual(self.window.prefetchView(index), view)
+        self.assertTrue(self.window.tabs.widget(index).isMaterialized())
+
     def test_remove_view(self):
         # Add view
         view = QtGui.QWidget()
@@ -227,6 +624,19 @@ class GhostWindowTests(WidgetTestsMixin, unittest.TestCase):
 
         self.assertEqual(self.ghost.pos() - pos, movement)
 
+    def test_drag_distance(self):
+        ghost = GhostWindow(self.tabbar, self.tab_pos, drag_distance=100)
+        origin = self.tabbar.mapToGlobal(self.tab_pos)
+
+        with patch.object(QtGui.QApplication, "startDragDistance") as mock:
+            self.assertFalse(
+                ghost.dragStarted(origin + QtCore.QPoint(10, 10)))
+            self.assertTrue(
+                ghost.dragStarted(origin + QtCore.QPoint(50, 50)))
+
+        # The distance is not read again during the drag
+        self.assertFalse(mock.called)
+
     def test_drag_started(self):
         # No drag
         origin = self.ghost.pos()
@@ -240,6 +650,64 @@ class GhostWindowTests(WidgetTestsMixin, unittest.TestCase):
 
         self.assertTrue(self.ghost.dragStarted(pos))
 
+    def test_thumbnail_renderer(self):
+        renderer = ThumbnailRenderer(max_pixels=100)
+        ghost = GhostWindow(self.tabbar, self.tab_pos, renderer)
+
+        brush = ghost.palette().brush(ghost.backgroundRole())
+        size = brush.texture().size()
+
+        self.assertEqual(self.window.geometry(), ghost.geometry())
+        self.assertLessEqual(size.width() * size.height(), 100)
+
+    def test_cached_snapshot_renderer(self):
+        cache = SnapshotCache()
+        view = self.window.tabs.widget(0)
+
+        with patch.object(SnapshotCache, "_instance", cache):
+            ghost = GhostWindow(
+                self.tabbar, self.tab_pos, CachedSnapshotRenderer())
+
+        brush = ghost.palette().brush(ghost.backgroundRole())
+
+        self.assertEqual(self.window.geometry(), ghost.geometry())
+        self.assertIs(ghost.tabBar(), self.tabbar)
+        self.assertTrue(cache.isTracked(view))
+
+        # The snapshot is drawn inside the window's frame, not stretched
+        self.assertEqual(brush.texture().size(), self.window.size())
+        self.assertLess(ghost.windowOpacity(), 1)
+
+    def test_cached_snapshot_renderer_default(self):
+        self.assertIsInstance(GhostWindow.RENDERER, CachedSnapshotRenderer)
+
+        # The window is grabbed without the view's snapshot
+        with patch.object(
+                SnapshotCache.instance(), "snapshot", return_value=None):
+            with patch.object(SnapshotRenderer, "render") as mock_render:
+                ghost = GhostWindow(self.tabbar, self.tab_pos)
+
+        mock_render.assert_called_once_with(ghost, self.window)
+
+    def test_outline_renderer(self):
+        ghost = GhostWindow(self.tabbar, self.tab_pos, OutlineRenderer())
+
+        self.assertEqual(self.window.geometry(), ghost.geometry())
+        self.assertEqual(ghost.windowOpacity(), 1)
+        self.assertFalse(ghost.mask().isEmpty())
+        self.assertFalse(ghost.mask().contains(ghost.rect().center()))
+
+    def test_renderer_by_window_class(self):
+        renderer = OutlineRenderer()
+
+        with patch.object(TabbedWindow, "GHOST_RENDERER", renderer):
+            self.assertIs(self.tabbar.ghostRenderer(), renderer)
+
+        # Tab bar's renderer overrides the window's one
+        self.tabbar.setGhostRenderer(renderer)
+
+        self.assertIs(self.tabbar.ghostRenderer(), renderer)
+
 
 class TabBarTests(WidgetTestsMixin, unittest.TestCase):
     """
@@ -303,6 +771,73 @@ class TabBarTests(WidgetTestsMixin, unittest.TestCase):
         self.assertEqual(dest.tabs.tabText(0), text)
         self.assertEqual(dest.currentView(), view)
 
+    def test_move_lazy_view_to_window(self):
+        """
+        Placeholders are moved without building their view
+        """
+        dest = TabbedWindow()
+        dest.addView(QtGui.QWidget(), "test")
+
+        factory = Mock(side_effect=QtGui.QWidget)
+        self.window.addViewFactory(factory, "lazy")
+
+        ghost = GhostWindow(
+            self.tabbar, self.tabbar.tabRect(1).topLeft())
+
+        self.tabbar._move_to_window(  # pylint: disable=W0212
+            dest, dest.tabs.tabBar().tabRect(0).topLeft(), ghost)
+
+        # Check the placeholder has been moved and built only by becoming
+        # the current tab of the destination window
+        self.assertEqual(self.window.tabs.count(), 1)
+        self.assertIsInstance(dest.tabs.widget(0), LazyView)
+        self.assertEqual(factory.call_count, 1)
+
+    def test_reparent_costs(self):
+        dest = TabbedWindow()
+        view = QtGui.QWidget()
+
+        self.assertEqual(self.tabbar.reparentCosts(view, dest), [])
+
+        # Native child window and style sheet
+        child = QtGui.QWidget(view)
+        child.setAttribute(Qt.WA_NativeWindow)
+        view.setStyleSheet("color: red")
+
+        self.assertEqual(
+            self.tabbar.reparentCosts(view, dest),
+            [DragObserver.NATIVE_WINDOW, DragObserver.STYLE_SHEET]
+        )
+
+    def test_move_to_window_slow_path(self):
+        dest = TabbedWindow()
+        dest.addView(QtGui.QWidget(), "test")
+
+        view = QtGui.QWidget()
+        view.setStyleSheet("color: red")
+        self.window.addView(view, "styled")
+
+        ghost = GhostWindow(self.tabbar, self.tabbar.tabRect(1).topLeft())
+        observer = Mock(spec=DragObserver)
+        TabBar.addDragObserver(observer)
+
+        try:
+            self.tabbar._move_to_window(  # pylint: disable=W0212
+                dest, dest.tabs.tabBar().tabRect(0).topLeft(), ghost)
+        finally:
+            TabBar.removeDragObserver(observer)
+
+        # Check
+        observer.slowReparent.assert_called_once_with(
+            self.tabbar, view, [DragObserver.STYLE_SHEET])
+
+        phase, _, _, detail = observer.dragPhase.call_args[0][1:]
+
+        self.assertEqual(phase, DragObserver.REPARENT)
+        self.assertEqual(detail, DragObserver.SLOW_PATH)
+        self.assertTrue(view.updatesEnabled())
+        self.assertEqual(dest.currentView(), view)
+
     @patch.object(TabbedWindow, "close")
     def test_tab_removed(self, mock_close):
         """
@@ -315,6 +850,135 @@ class TabBarTests(WidgetTestsMixin, unittest.TestCase):
         # Check
         mock_close.assert_called_once_with()
 
+    def test_tab_at(self):
+        for i in xrange(20):
+            self.window.addView(QtGui.QWidget(), "test {0}".format(i))
+
+        # Check every tab is found by its position
+        for i in xrange(self.tabbar.count()):
+            rect = self.tabbar.tabRect(i)
+
+            self.assertEqual(self.tabbar.tabAt(rect.center()), i)
+            self.assertEqual(self.tabbar.tabAt(rect.topLeft()), i)
+            self.assertEqual(self.tabbar.tabAt(rect.bottomRight()), i)
+
+        # Outside the tabs
+        self.assertEqual(self.tabbar.tabAt(QtCore.QPoint(-1, -1)), -1)
+
+    def test_virtualized(self):
+        for i in xrange(200):
+            self.window.addView(QtGui.QWidget(), "test {0}".format(i))
+
+        self.window.tabs.setVirtualized(True)
+
+        # Same size for every tab
+        self.assertTrue(self.tabbar.isVirtualized())
+        self.assertEqual(
+            self.tabbar.tabRect(0).width(), TabBar.VIRTUAL_TAB_LENGTH)
+        self.assertEqual(
+            self.tabbar.tabRect(199).size(), self.tabbar.tabRect(0).size())
+
+        # Hit test on the visible tabs
+        first, last = self.tabbar.visibleRange()
+
+        self.assertEqual(first, 0)
+        self.assertLess(last, 199)
+
+        for i in xrange(first, last + 1):
+            rect = self.tabbar.tabRect(i)
+
+            self.assertEqual(self.tabbar.tabAt(rect.center()), i)
+
+        self.assertEqual(self.tabbar.tabAt(QtCore.QPoint(-1, -1)), -1)
+
+        # Overflow menu
+        self.assertIs(
+            self.window.tabs.cornerWidget(Qt.TopRightCorner),
+            self.tabbar.overflowButton()
+        )
+
+        menu = self.tabbar.overflowButton().menu()
+        menu.aboutToShow.emit()
+
+        self.assertEqual(len(menu.actions()), 4)
+
+        submenu = menu.actions()[-1].menu()
+        submenu.aboutToShow.emit()
+        submenu.actions()[-1].trigger()
+
+        self.assertEqual(self.tabbar.currentIndex(), 199)
+
+    def test_tab_previews(self):
+        self.window.addView(QtGui.QWidget(), "test")
+        self.window.addView(QtGui.QWidget(), "test")
+
+        tabbar = self.window.tabs.tabBar()
+        pos = tabbar.tabRect(1).center()
+        event = QtGui.QHelpEvent(
+            QtCore.QEvent.ToolTip, pos, tabbar.mapToGlobal(pos))
+
+        # Disabled by default
+        self.assertFalse(tabbar.tabPreviews())
+
+        tabbar.event(event)
+
+        self.assertIsNone(tabbar._preview)  # pylint: disable=W0212
+
+        # Show the snapshot of the hovered view
+        tabbar.setTabPreviews(True)
+
+        self.assertTrue(tabbar.event(event))
+
+        preview = tabbar._preview  # pylint: disable=W0212
+
+        self.assertTrue(preview.isVisible())
+        self.assertTrue(SnapshotCache.instance().isTracked(
+            self.window.tabs.widget(1)))
+
+        # Hide when the cursor leaves the tab bar
+        tabbar.event(QtCore.QEvent(QtCore.QEvent.Leave))
+
+        self.assertFalse(preview.isVisible())
+
+    def test_tab_at_invalidated(self):
+        rect = self.tabbar.tabRect(0)
+
+        self.assertEqual(self.tabbar.tabAt(rect.center()), 0)
+
+        # Insert a wider tab in front of the existing one
+        self.window.tabs.insertTab(0, QtGui.QWidget(), "a much longer title")
+
+        for i in xrange(self.tabbar.count()):
+            rect = self.tabbar.tabRect(i)
+
+            self.assertEqual(self.tabbar.tabAt(rect.center()), i)
+
+    def test_tab_at_scrolled(self):
+        """
+        The cached rectangles follow the tab bar's scroll buttons
+        """
+        self.tabbar.setUsesScrollButtons(True)
+        self.tabbar.setElideMode(Qt.ElideNone)
+
+        for i in xrange(50):
+            self.window.addView(QtGui.QWidget(), "test {0}".format(i))
+
+        self.assertEqual(self.tabbar.tabAt(self.tabbar.tabRect(0).center()), 0)
+
+        # Scroll the tabs without changing the current tab
+        button = [
+            child for child in self.tabbar.findChildren(QtGui.QToolButton)
+            if child.arrowType() == Qt.RightArrow
+        ][0]
+        button.click()
+
+        first, last = self.tabbar.visibleRange()
+
+        for i in xrange(first, last + 1):
+            rect = self.tabbar.tabRect(i)
+
+            self.assertEqual(self.tabbar.tabAt(rect.center()), i)
+
     def test_mouse_press_event(self):
         # Default state
         self.assertIsNone(self.tabbar._ghost)  # pylint: disable=W0212
@@ -322,20 +986,32 @@ class TabBarTests(WidgetTestsMixin, unittest.TestCase):
         # Simulate mouse press event
         self.tabbar.mousePressEvent(MouseEvent(self.tab_pos))
 
-        # Check
+        # Check the ghost window is not created by a simple click
         # pylint: disable=W0212
-        self.assertIsInstance(self.tabbar._ghost, GhostWindow)
-        self.assertTrue(self.tabbar._ghost.isVisible())
+        self.assertIsNone(self.tabbar._ghost)
+        self.assertEqual(
+            self.tabbar._press_pos, self.tabbar.mapFromGlobal(self.tab_pos))
         # pylint: enable=W0212
 
+    def test_mouse_press_event_no_drag(self):
+        """
+        Moving the cursor less than the drag distance doesn't create the ghost
+        window
+        """
+        self.tabbar.mousePressEvent(MouseEvent(self.tab_pos))
+        self.tabbar.mouseMoveEvent(MouseEvent(self.tab_pos))
+
+        self.assertIsNone(self.tabbar._ghost)  # pylint: disable=W0212
+
+        # Release the mouse button
+        self.tabbar.mouseReleaseEvent(MouseRelease(self.tab_pos))
+
+        self.assertIsNone(self.tabbar._press_pos)  # pylint: disable=W0212
+
     def test_mouse_move_event(self):
         # Default state
         self.tabbar.mousePressEvent(MouseEvent(self.tab_pos))
 
-        # pylint: disable=W0212
-        self.assertIsInstance(self.tabbar._ghost, GhostWindow)
-        # pylint: enable=W0212
-
         # Simulate mouse move
         pos = self.tab_pos + QtCore.QPoint(
             QtGui.QApplication.startDragDistance(),
@@ -346,15 +1022,175 @@ class TabBarTests(WidgetTestsMixin, unittest.TestCase):
 
         # Check
         # pylint: disable=W0212
+        self.assertIsInstance(self.tabbar._ghost, GhostWindow)
+        self.assertTrue(self.tabbar._ghost.isVisible())
         self.assertEqual(self.tabbar._ghost.pos(), pos)
         # pylint: enable=W0212
 
-    def test_mouse_release_new_window(self):
+    def test_mouse_move_event_scrolled(self):
         """
-        Release mouse create new window
+        The dragged tab is the one pressed even if the tab bar scrolled
         """
-        # Add extra tab
-        self.window.addView(QtGui.QWidget(), "test")
+        self.tabbar.mousePressEvent(MouseEvent(self.tab_pos))
+
+        distance = QtGui.QApplication.startDragDistance()
+        pos = self.tab_pos + QtCore.QPoint(distance, distance)
+
+        # No tab left under the pressed position
+        with patch.object(self.tabbar, "tabAt", return_value=-1):
+            self.tabbar.mouseMoveEvent(MouseEvent(pos))
+
+        ghost = self.tabbar._ghost  # pylint: disable=W0212
+
+        self.assertEqual(ghost.index(), 0)
+
+    def test_mouse_move_event_coalesced(self):
+        """
+        Mouse moves after the ghost window is shown are applied once per frame
+        """
+        self.tabbar.mousePressEvent(MouseEvent(self.tab_pos))
+
+        distance = QtGui.QApplication.startDragDistance()
+        pos = self.tab_pos + QtCore.QPoint(distance, distance)
+
+        self.tabbar.mouseMoveEvent(MouseEvent(pos))
+
+        # Simulate a burst of mouse moves
+        ghost = self.tabbar._ghost  # pylint: disable=W0212
+        scheduler = self.tabbar.dragScheduler()
+        origin = ghost.pos()
+
+        for i in xrange(1, 4):
+            self.tabbar.mouseMoveEvent(
+                MouseEvent(pos + QtCore.QPoint(i, i)))
+
+        # Check
+        self.assertEqual(ghost.pos(), origin)
+        self.assertEqual(scheduler.coalescedCount(), 2)
+
+        scheduler.flush()
+
+        self.assertEqual(ghost.pos(), origin + QtCore.QPoint(3, 3))
+        self.assertEqual(scheduler.appliedCount(), 1)
+
+    def test_drop_indicator(self):
+        """
+        The drop target is highlighted while dragging
+        """
+        dest = TabbedWindow()
+        dest.addView(QtGui.QWidget(), "test")
+        dest.move(self.window.geometry().topRight())
+        dest.show()
+
+        tabbar = dest.tabs.tabBar()
+        pos = tabbar.mapToGlobal(tabbar.tabRect(0).center())
+
+        self.tabbar.mousePressEvent(MouseEvent(self.tab_pos))
+        self.tabbar.mouseMoveEvent(MouseEvent(pos))
+
+        # Check
+        indicator = self.tabbar.dropIndicator()
+
+        self.assertEqual(indicator.target(), tabbar)
+        self.assertEqual(indicator.index(), tabbar.dropIndex(pos))
+
+        # The feedback is removed when the mouse is released
+        with patch.object(self.tabbar, "_move_to_window"):
+            self.tabbar.mouseReleaseEvent(MouseEvent(pos))
+
+        self.assertIsNone(indicator.target())
+
+        dest.close()
+
+    def test_drop_indicator_move_right(self):
+        """
+        Moving a tab to the right puts it after the tab under the cursor
+        """
+        self.window.addView(QtGui.QWidget(), "test 1")
+        self.window.addView(QtGui.QWidget(), "test 2")
+
+        rect = self.tabbar.tabRect(2)
+        pos = self.tabbar.mapToGlobal(rect.center())
+
+        self.tabbar.mousePressEvent(MouseEvent(self.tab_pos))
+        self.tabbar.mouseMoveEvent(MouseEvent(pos))
+        self.tabbar.dragScheduler().flush()
+
+        # Check
+        caret = self.tabbar.dropIndicator()._caret  # pylint: disable=W0212
+
+        self.assertEqual(caret.x() + caret.width() // 2, rect.right() + 1)
+
+        self.tabbar.mouseReleaseEvent(MouseEvent(pos))
+
+        self.assertEqual(self.window.tabs.tabText(2), "test")
+
+    def test_drag_observer(self):
+        """
+        Registered observers receive the phases of the Drag&Drop action
+        """
+        observer = Mock(spec=DragObserver)
+        TabBar.addDragObserver(observer)
+
+        try:
+            self.window.addView(QtGui.QWidget(), "test")
+
+            pos = self.tab_pos + QtCore.QPoint(
+                QtGui.QApplication.startDragDistance(),
+                QtGui.QApplication.startDragDistance()
+            )
+
+            self.tabbar.mousePressEvent(MouseEvent(self.tab_pos))
+            self.tabbar.mouseMoveEvent(MouseEvent(pos))
+
+            with patch.object(self.tabbar, "_move_tab"):
+                pos = self.tabbar.mapToGlobal(self.tabbar.tabRect(1).center())
+                self.tabbar.mouseReleaseEvent(MouseEvent(pos))
+        finally:
+            TabBar.removeDragObserver(observer)
+
+        # Check
+        phases = [call[0][1] for call in observer.dragPhase.call_args_list]
+
+        self.assertEqual(phases, [
+            DragObserver.PRESS, DragObserver.THRESHOLD, DragObserver.GHOST,
+            DragObserver.MOVE, DragObserver.RESOLVE,
+            DragObserver.DROP, DragObserver.RELEASE,
+        ])
+        self.assertEqual(
+            observer.dragPhase.call_args_list[6][0][4], DragObserver.MOVE_TAB)
+
+    def test_partial_drag_observer(self):
+        """
+        Observers can implement only some of the hooks
+        """
+        class SlowReparentObserver(DragObserver):
+            def slowReparent(self, tabbar, view, reasons):
+                pass
+
+        observer = SlowReparentObserver()
+        TabBar.addDragObserver(observer)
+
+        try:
+            self.window.addView(QtGui.QWidget(), "other")
+
+            pos = self.tabbar.mapToGlobal(self.tabbar.tabRect(1).center())
+
+            self.tabbar.mousePressEvent(MouseEvent(self.tab_pos))
+            self.tabbar.mouseMoveEvent(MouseEvent(pos))
+            self.tabbar.mouseReleaseEvent(MouseEvent(pos))
+        finally:
+            TabBar.removeDragObserver(observer)
+
+        # The tab has been moved
+        self.assertEqual(self.window.tabs.tabText(0), "other")
+
+    def test_mouse_release_new_window(self):
+        """
+        Release mouse create new window
+        """
+        # Add extra tab
+        self.window.addView(QtGui.QWidget(), "test")
 
         self.assertGreater(self.window.tabs.count(), 1)
 
@@ -404,3 +1240,878 @@ class TabBarTests(WidgetTestsMixin, unittest.TestCase):
             # Check
             mock_create.assert_called_once_with(  # pylint: disable=W0212
                 dest, event.globalPos(), ghost)
+
+    def tab_center(self, index):
+        return self.tabbar.mapToGlobal(self.tabbar.tabRect(index).center())
+
+    def test_selection(self):
+        for i in xrange(4):
+            self.window.addView(QtGui.QWidget(), "test {0}".format(i))
+
+        # Ctrl-click selects the current tab and the clicked one
+        self.tabbar.mousePressEvent(
+            MouseEvent(self.tab_center(2), modifiers=Qt.ControlModifier))
+
+        self.assertEqual(self.tabbar.selectedIndices(), [0, 2])
+        self.assertEqual(self.tabbar.currentIndex(), 0)
+
+        # Shift-click selects a range from the last clicked tab
+        self.tabbar.mousePressEvent(
+            MouseEvent(self.tab_center(4), modifiers=Qt.ShiftModifier))
+
+        self.assertEqual(self.tabbar.selectedIndices(), [2, 3, 4])
+
+        # A click on a tab not selected discards the selection
+        self.tabbar.mousePressEvent(MouseEvent(self.tab_center(1)))
+
+        self.assertEqual(self.tabbar.selectedIndices(), [])
+
+    def test_group_drag_new_window(self):
+        views = [QtGui.QWidget() for _ in xrange(3)]
+        self.window.addViews((view, "test") for view in views)
+
+        self.tabbar.setSelectedIndices([1, 3])
+
+        ghost = GhostWindow(self.tabbar, self.tabbar.tabRect(1).center())
+
+        self.assertEqual(ghost.indices(), [1, 3])
+
+        wnd = self.tabbar._create_new_window(ghost)
+
+        self.assertEqual(
+            [wnd.tabs.widget(i) for i in xrange(wnd.tabs.count())],
+            [views[0], views[2]]
+        )
+        self.assertEqual(self.window.tabs.count(), 2)
+        self.assertEqual(self.tabbar.selectedIndices(), [])
+
+    def test_group_drag_move_tab(self):
+        views = [self.window.tabs.widget(0)]
+        views.extend(QtGui.QWidget() for _ in xrange(3))
+        self.window.addViews((view, "test") for view in views[1:])
+
+        self.tabbar.setSelectedIndices([0, 1])
+
+        ghost = GhostWindow(self.tabbar, self.tabbar.tabRect(0).center())
+        self.tabbar._move_tab(self.tab_center(3), ghost)
+
+        self.assertEqual(
+            [self.window.tabs.widget(i) for i in xrange(4)],
+            [views[2], views[3], views[0], views[1]]
+        )
+        self.assertEqual(self.tabbar.selectedIndices(), [2, 3])
+
+    def test_group_drag_move_tab_middle(self):
+        """
+        A non-contiguous selection dropped in the middle of the tab bar lands
+        next to the tab under the cursor
+        """
+        views = [self.window.tabs.widget(0)]
+        views.extend(QtGui.QWidget() for _ in xrange(5))
+        self.window.addViews((view, "test") for view in views[1:])
+
+        self.tabbar.setSelectedIndices([0, 2])
+
+        ghost = GhostWindow(self.tabbar, self.tabbar.tabRect(0).center())
+        self.tabbar._move_tab(self.tab_center(4), ghost)
+
+        self.assertEqual(
+            [self.window.tabs.widget(i) for i in xrange(6)],
+            [views[1], views[3], views[4], views[0], views[2], views[5]]
+        )
+        self.assertEqual(self.tabbar.selectedIndices(), [3, 4])
+
+
+class WindowRegistryTests(WidgetTestsMixin, unittest.TestCase):
+    """
+    WindowRegistry test cases
+    """
+
+    def setUp(self):
+        # Call superclass
+        super(WindowRegistryTests, self).setUp()
+
+        # Set up
+        self.registry = WindowRegistry.instance()
+
+        self.window = TabbedWindow()
+        self.window.addView(QtGui.QWidget(), "test")
+        self.window.show()
+        self.window.move(QtCore.QPoint(100, 100))
+
+        self.tabbar = self.window.tabs.tabBar()
+
+    def tearDown(self):
+        self.window.close()
+
+    def test_registered(self):
+        self.assertIn(self.tabbar, self.registry.tabBars())
+        self.assertIn(self.window, self.registry.windows())
+
+    def test_tabbar_at(self):
+        pos = self.tabbar.mapToGlobal(self.tabbar.rect().center())
+
+        self.assertEqual(self.registry.tabBarAt(pos), self.tabbar)
+
+        # Hidden windows are not drop targets
+        self.window.hide()
+
+        self.assertIsNone(self.registry.tabBarAt(pos))
+
+    def test_tabbar_at_stacking_order(self):
+        # Create a window overlapping the current one
+        other = TabbedWindow()
+        other.addView(QtGui.QWidget(), "test")
+        other.show()
+        other.move(self.window.pos())
+
+        pos = self.tabbar.mapToGlobal(self.tabbar.rect().center())
+
+        self.assertEqual(self.registry.tabBarAt(pos), other.tabs.tabBar())
+
+        # Raise the first window
+        self.registry.raiseWindow(self.window)
+
+        self.assertEqual(self.registry.tabBarAt(pos), self.tabbar)
+
+        other.close()
+
+    def test_deleted_window(self):
+        other = TabbedWindow()
+        other.addView(QtGui.QWidget(), "test")
+        other.show()
+
+        tabbar = other.tabs.tabBar()
+
+        other.deleteLater()
+        QtGui.QApplication.sendPostedEvents(
+            None, QtCore.QEvent.DeferredDelete)
+
+        self.assertNotIn(tabbar, self.registry.tabBars())
+
+        # Drag after the deletion
+        tab_pos = self.tabbar.mapToGlobal(self.tabbar.tabRect(0).center())
+        distance = QtGui.QApplication.startDragDistance()
+        pos = tab_pos + QtCore.QPoint(distance, distance)
+
+        self.tabbar.mousePressEvent(MouseEvent(tab_pos))
+        self.tabbar.mouseMoveEvent(MouseEvent(pos))
+        self.tabbar.dragScheduler().flush()
+
+        self.assertEqual(self.registry.tabBarAt(tab_pos), self.tabbar)
+        self.assertIn(self.window, self.registry.windows())
+
+        self.tabbar.mouseReleaseEvent(MouseEvent(tab_pos))
+
+
+class StatefulView(QtGui.QWidget):
+    """
+    View implementing the hibernation protocol
+    """
+
+    def __init__(self):
+        super(StatefulView, self).__init__()
+
+        self.state = None
+
+    def saveViewState(self):
+        return self.state
+
+    def restoreViewState(self, state):
+        self.state = state
+
+
+class HibernationManagerTests(WidgetTestsMixin, unittest.TestCase):
+    """
+    HibernationManager test cases
+    """
+
+    def setUp(self):
+        # Call superclass
+        super(HibernationManagerTests, self).setUp()
+
+        # Set up
+        self.window = TabbedWindow()
+        self.window.show()
+
+        for i in xrange(3):
+            self.window.addViewFactory(StatefulView, "test {0}".format(i))
+
+        self.manager = HibernationManager(max_views=2)
+        self.manager.install()
+
+    def tearDown(self):
+        self.manager.uninstall()
+        self.window.close()
+
+    def test_enforce(self):
+        # Activate all the views
+        for i in xrange(3):
+            self.window.setCurrentView(i)
+
+        self.assertEqual(self.manager.residentCounts()[self.window], 3)
+
+        # Check the least recently activated view is hibernated
+        self.assertEqual(self.manager.enforce(), 1)
+        self.assertFalse(self.window.tabs.widget(0).isMaterialized())
+        self.assertTrue(self.window.tabs.widget(1).isMaterialized())
+        self.assertTrue(self.window.tabs.widget(2).isMaterialized())
+        self.assertEqual(self.manager.residentCounts()[self.window], 2)
+
+    def test_current_view_not_hibernated(self):
+        self.manager.setMaxViews(0)
+        self.manager.enforce()
+
+        self.assertEqual(self.window.tabs.currentIndex(), 0)
+        self.assertTrue(self.window.tabs.widget(0).isMaterialized())
+
+    def test_state_restored(self):
+        self.window.setCurrentView(1)
+        self.window.currentView().state = "state"
+
+        # Hibernate the view and activate it again
+        self.window.setCurrentView(0)
+        self.window.tabs.widget(1).hibernate()
+
+        self.assertFalse(self.window.tabs.widget(1).isMaterialized())
+
+        self.window.setCurrentView(1)
+
+        self.assertEqual(self.window.currentView().state, "state")
+
+
+class ViewLocationTests(WidgetTestsMixin, unittest.TestCase):
+    """
+    WindowRegistry's views' locations test cases
+    """
+
+    def setUp(self):
+        # Call superclass
+        super(ViewLocationTests, self).setUp()
+
+        # Set up
+        self.registry = WindowRegistry.instance()
+
+        self.window = TabbedWindow()
+        self.views = [QtGui.QWidget() for _ in xrange(3)]
+
+        for i, view in enumerate(self.views):
+            self.window.addView(view, "test {0}".format(i))
+
+    def test_locate_view(self):
+        for i, view in enumerate(self.views):
+            self.assertEqual(self.registry.locateView(view), (self.window, i))
+
+        self.assertIsNone(self.registry.locateView(QtGui.QWidget()))
+
+    def test_locate_removed_view(self):
+        self.window.removeView(0)
+
+        self.assertIsNone(self.registry.locateView(self.views[0]))
+        self.assertEqual(
+            self.registry.locateView(self.views[1]), (self.window, 0))
+        self.assertEqual(
+            self.registry.locateView(self.views[2]), (self.window, 1))
+
+    def test_locate_moved_view(self):
+        self.window.tabs.tabBar().moveTab(0, 2)
+
+        self.assertEqual(
+            self.registry.locateView(self.views[0]), (self.window, 2))
+        self.assertEqual(
+            self.registry.locateView(self.views[1]), (self.window, 0))
+
+        # Move view into another window
+        dest = TabbedWindow()
+        dest.addView(QtGui.QWidget(), "test")
+
+        self.window.removeView(2)
+        dest.insertView(QtCore.QPoint(), self.views[0], "test")
+
+        self.assertEqual(self.registry.locateView(self.views[0]), (dest, 0))
+
+    def test_locate_view_deleted_window(self):
+        dest = TabbedWindow()
+        view = QtGui.QWidget()
+        dest.addView(view, "test")
+
+        dest.deleteLater()
+        QtGui.QApplication.sendPostedEvents(
+            None, QtCore.QEvent.DeferredDelete)
+
+        self.assertIsNone(self.registry.locateView(view))
+        self.assertNotIn(
+            dest, [wnd for _, wnd, _ in self.registry.views()])
+
+    def test_locate_lazy_view(self):
+        view = QtGui.QWidget()
+        index = self.window.addViewFactory(lambda: view, "lazy")
+
+        self.window.setCurrentView(index)
+
+        self.assertEqual(self.registry.locateView(view), (self.window, index))
+
+    def test_views(self):
+        views = [
+            (view, index) for view, wnd, index in self.registry.views()
+            if wnd is self.window
+        ]
+
+        self.assertEqual(
+            views, [(view, i) for i, view in enumerate(self.views)])
+
+    def test_activate_view(self):
+        self.assertTrue(self.registry.activateView(self.views[2]))
+        self.assertEqual(self.window.currentView(), self.views[2])
+        self.assertFalse(self.registry.activateView(QtGui.QWidget()))
+
+
+class ChromeHostingTests(WidgetTestsMixin, unittest.TestCase):
+    """
+    Hosting of the views' chrome test cases
+    """
+
+    def setUp(self):
+        # Call superclass
+        super(ChromeHostingTests, self).setUp()
+
+        # Set up
+        self.view = QtGui.QMainWindow()
+        self.toolbar = self.view.addToolBar("toolbar")
+        self.menu = self.view.menuBar().addMenu("File")
+        self.statusbar = self.view.statusBar()
+
+        self.window = TabbedWindow()
+        self.window.setChromeHosting(True)
+        self.window.addView(self.view, "main window")
+        self.window.addView(QtGui.QWidget(), "widget")
+
+    def test_host_chrome(self):
+        self.assertTrue(self.window.isChromeHosting())
+        self.assertIs(self.window.hostedView(), self.view)
+        self.assertIs(self.toolbar.parentWidget(), self.window)
+        self.assertIn(
+            self.menu.menuAction(), self.window.menuBar().actions())
+        self.assertIs(self.statusbar.parentWidget(), self.window)
+
+    def test_return_chrome_on_deactivation(self):
+        self.window.setCurrentView(1)
+
+        self.assertIsNone(self.window.hostedView())
+        self.assertIs(self.toolbar.parentWidget(), self.view)
+        self.assertNotIn(
+            self.menu.menuAction(), self.window.menuBar().actions())
+        self.assertIs(self.statusbar.parentWidget(), self.view)
+
+    def test_return_chrome_on_remove(self):
+        self.window.removeView(0)
+
+        self.assertIsNone(self.window.hostedView())
+        self.assertIs(self.toolbar.parentWidget(), self.view)
+        self.assertIs(self.statusbar.parentWidget(), self.view)
+
+    def test_move_single_tab(self):
+        self.window.removeView(0)
+
+        source = TabbedWindow()
+        source.setChromeHosting(True)
+        source.addView(self.view, "main window")
+        source.show()
+
+        tabbar = source.tabs.tabBar()
+        ghost = GhostWindow(tabbar, tabbar.tabRect(0).topLeft())
+
+        tabbar._move_to_window(  # pylint: disable=W0212
+            self.window, self.window.tabs.tabBar().tabRect(0).topLeft(),
+            ghost)
+
+        # The emptied window gives back the chrome, the target lifts it
+        self.assertIsNone(source.hostedView())
+        self.assertIs(self.window.hostedView(), self.view)
+        self.assertIs(self.toolbar.parentWidget(), self.window)
+        self.assertIs(self.statusbar.parentWidget(), self.window)
+
+    def test_no_empty_menu_bar(self):
+        view = QtGui.QMainWindow()
+        view.addToolBar("toolbar")
+
+        window = TabbedWindow()
+        window.setChromeHosting(True)
+        window.addView(view, "main window")
+
+        self.assertIsNone(window.menuWidget())
+
+    def test_disable_hosting(self):
+        self.window.setChromeHosting(False)
+
+        self.assertIsNone(self.window.hostedView())
+        self.assertIs(self.toolbar.parentWidget(), self.view)
+
+
+class WindowPoolTests(WidgetTestsMixin, unittest.TestCase):
+    """
+    WindowPool test cases
+    """
+
+    def setUp(self):
+        # Call superclass
+        super(WindowPoolTests, self).setUp()
+
+        # Set up
+        self.pool = WindowPool(size=1)
+
+        self.window = TabbedWindow()
+        self.window.addView(QtGui.QWidget(), "test")
+
+    def test_acquire_without_pooled_windows(self):
+        rect = self.window.geometry().adjusted(10, 10, 10, 10)
+
+        with patch.object(self.window, "clone", wraps=self.window.clone) as \
+                mock_clone:
+            wnd = self.pool.acquire(self.window, rect)
+
+            mock_clone.assert_called_once_with(rect)
+
+        self.assertIsInstance(wnd, TabbedWindow)
+        self.assertEqual(wnd.geometry(), rect)
+
+    def test_acquire_pooled_window(self):
+        self.pool.fill(self.window)
+
+        self.assertEqual(self.pool.count(self.window), 1)
+
+        rect = self.window.geometry().adjusted(10, 10, 10, 10)
+        wnd = self.pool.acquire(self.window, rect)
+
+        self.assertEqual(self.pool.count(self.window), 0)
+        self.assertEqual(wnd.geometry(), rect)
+        self.assertFalse(wnd.isVisible())
+
+    def test_release(self):
+        wnd = self.pool.acquire(self.window, self.window.geometry())
+
+        # Windows with tabs are not pooled
+        wnd.addView(QtGui.QWidget(), "test")
+
+        self.assertFalse(self.pool.release(wnd))
+
+        # Empty windows are pooled until the pool is full
+        wnd.removeViews([0])
+
+        self.assertTrue(self.pool.release(wnd))
+        self.assertEqual(self.pool.count(self.window), 1)
+        self.assertFalse(self.pool.release(TabbedWindow()))
+
+
+class DragStatisticsTests(unittest.TestCase):
+    """
+    DragStatistics test cases
+    """
+
+    def test_percentile(self):
+        stats = DragStatistics()
+
+        for i in xrange(1, 101):
+            stats.dragPhase(None, DragObserver.MOVE, 0, i)
+
+        stats.dragPhase(None, DragObserver.DROP, 0, 1, DragObserver.MOVE_TAB)
+
+        # Check
+        self.assertEqual(stats.count(DragObserver.MOVE), 100)
+        self.assertEqual(stats.percentile(DragObserver.MOVE, 50), 50)
+        self.assertEqual(stats.percentile(DragObserver.MOVE, 99), 99)
+        self.assertIsNone(stats.percentile(DragObserver.GHOST, 50))
+        self.assertEqual(stats.phases(), ["drop:move_tab", "move"])
+        self.assertEqual(stats.summary()["move"]["max"], 100)
+
+        stats.reset()
+
+        self.assertEqual(stats.phases(), [])
+
+    def test_slow_reparents(self):
+        stats = DragStatistics()
+
+        stats.slowReparent(None, None, [DragObserver.STYLE_SHEET])
+        stats.slowReparent(
+            None, None, [DragObserver.NATIVE_WINDOW, DragObserver.STYLE_SHEET])
+
+        self.assertEqual(stats.slowReparents(), {
+            DragObserver.NATIVE_WINDOW: 1, DragObserver.STYLE_SHEET: 2})
+
+        stats.reset()
+
+        self.assertEqual(stats.slowReparents(), {})
+
+
+class SnapshotCacheTests(WidgetTestsMixin, unittest.TestCase):
+    """
+    SnapshotCache test cases
+    """
+
+    def setUp(self):
+        # Call superclass
+        super(SnapshotCacheTests, self).setUp()
+
+        # Set up
+        self.cache = SnapshotCache(max_pixels=100)
+        self.view = QtGui.QWidget()
+        self.view.resize(200, 100)
+
+    def test_snapshot(self):
+        pixmap = self.cache.snapshot(self.view)
+
+        self.assertTrue(self.cache.isTracked(self.view))
+        self.assertFalse(self.cache.isStale(self.view))
+        self.assertLessEqual(pixmap.width() * pixmap.height(), 100)
+        self.assertEqual(self.cache.bytes(), SnapshotCache._size(pixmap))
+
+        # Not repainted, same snapshot
+        with patch("tabbedwindow._render_thumbnail") as render:
+            self.assertIs(self.cache.snapshot(self.view), pixmap)
+            self.assertFalse(render.called)
+
+    def test_invalidate_on_paint(self):
+        child = QtGui.QLabel(self.view)
+        pixmap = self.cache.snapshot(self.view)
+
+        self.cache.eventFilter(child, QtGui.QPaintEvent(child.rect()))
+
+        self.assertTrue(self.cache.isStale(self.view))
+
+        # Stale snapshots are returned as they are
+        self.assertIs(self.cache.snapshot(self.view), pixmap)
+
+        # Refresh only visible views
+        self.cache.refresh()
+
+        self.assertTrue(self.cache.isStale(self.view))
+
+        self.view.show()
+        self.cache.refresh()
+
+        self.assertFalse(self.cache.isStale(self.view))
+
+    def test_budget(self):
+        other = QtGui.QWidget()
+        other.resize(200, 100)
+
+        pixmap = self.cache.snapshot(self.view)
+        self.cache.setMaxBytes(SnapshotCache._size(pixmap))
+        self.cache.snapshot(other)
+
+        # Least recently used snapshot is dropped
+        self.assertTrue(self.cache.isStale(self.view))
+        self.assertFalse(self.cache.isStale(other))
+        self.assertLessEqual(self.cache.bytes(), self.cache.maxBytes())
+
+    def test_forget_destroyed_view(self):
+        self.cache.snapshot(self.view)
+        self.view.deleteLater()
+
+        QtGui.QApplication.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+
+        self.assertEqual(self.cache.bytes(), 0)
+
+
+class StatefulSessionView(QtGui.QWidget):
+
+    def __init__(self, state=b""):
+        super(StatefulSessionView, self).__init__()
+
+        self.state = state
+
+    def saveSessionState(self):
+        return self.state
+
+
+class SessionTests(WidgetTestsMixin, unittest.TestCase):
+    """
+    Session test cases
+    """
+
+    def setUp(self):
+        # Call superclass
+        super(SessionTests, self).setUp()
+
+        # Set up
+        self.window = TabbedWindow()
+        self.window.addViews(
+            (StatefulSessionView("state {0}".format(i).encode("utf-8")),
+             "title {0}".format(i))
+            for i in xrange(4)
+        )
+        self.window.addView(QtGui.QWidget(), "stateless")
+        self.window.setGeometry(100, 100, 400, 300)
+        self.window.setCurrentView(2)
+
+    def test_capture(self):
+        session = Session.capture([self.window])
+        snapshot = session.windows()[0]
+
+        self.assertEqual(snapshot.geometry, (100, 100, 400, 300))
+        self.assertEqual(snapshot.current, 2)
+        self.assertEqual(
+            snapshot.tabs[1], Session.Tab("title 1", b"state 1"))
+        self.assertEqual(snapshot.tabs[4], Session.Tab("stateless", b""))
+
+    def test_capture_visible_windows(self):
+        self.window.show()
+
+        closed = TabbedWindow()
+        closed.addView(QtGui.QWidget(), "closed")
+        closed.show()
+        closed.close()
+
+        titles = [
+            [tab.text for tab in wnd.tabs]
+            for wnd in Session.capture().windows()
+        ]
+
+        self.assertIn(["title {0}".format(i) for i in xrange(4)] +
+                      ["stateless"], titles)
+        self.assertNotIn(["closed"], titles)
+
+    def test_dumps_loads(self):
+        session = Session.capture([self.window])
+        data = session.dumps()
+
+        self.assertEqual(data[:4], Session.MAGIC)
+        self.assertEqual(Session.loads(data).windows(), session.windows())
+
+        # Invalid data
+        self.assertRaises(ValueError, Session.loads, b"TBWX" + data[4:])
+        self.assertRaises(ValueError, Session.loads, data[:-1])
+
+    def test_restore(self):
+        session = Session.loads(Session.capture([self.window]).dumps())
+        factory = Mock(
+            side_effect=lambda text, state: StatefulSessionView(state))
+
+        wnd, = session.restore(factory)
+
+        # Only the current view is built at first
+        self.assertEqual(wnd.tabs.count(), 1)
+        self.assertTrue(wnd.isVisible())
+        factory.assert_called_once_with("title 2", b"state 2")
+
+        wnd.flushSubmittedViews()
+
+        self.assertEqual(
+            [wnd.tabs.tabText(i) for i in xrange(wnd.tabs.count())],
+            ["title {0}".format(i) for i in xrange(4)] + ["stateless"]
+        )
+        self.assertEqual(wnd.tabs.currentIndex(), 2)
+        self.assertEqual(wnd.geometry(), self.window.geometry())
+
+        # Placeholders keep the state until built
+        self.assertEqual(factory.call_count, 1)
+        self.assertEqual(
+            Session.capture([wnd]).windows()[0].tabs,
+            Session.capture([self.window]).windows()[0].tabs
+        )
+
+
+class JournalTests(WidgetTestsMixin, unittest.TestCase):
+    """
+    Journal test cases
+    """
+
+    def setUp(self):
+        # Call superclass
+        super(JournalTests, self).setUp()
+
+        # Set up
+        self.path = tempfile.mktemp()
+        self.window = TabbedWindow()
+        self.window.addView(StatefulSessionView(b"state"), "journal 1")
+        self.window.show()
+
+        self.journal = Journal(self.path)
+        self.journal.install()
+
+    def tearDown(self):
+        self.journal.uninstall()
+
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def replay(self):
+        """
+        Returns the recorded windows containing the journal's test views
+        """
+        self.journal.flush(wait=True)
+
+        return [
+            wnd for wnd in Journal.replay(self.path).windows()
+            if any(tab.text.startswith("journal") for tab in wnd.tabs)
+        ]
+
+    def titles(self, wnd):
+        return [tab.text for tab in wnd.tabs]
+
+    def test_snapshot(self):
+        wnd, = self.replay()
+
+        self.assertEqual(self.titles(wnd), ["journal 1"])
+        self.assertEqual(wnd.tabs[0].state, b"state")
+
+    def test_replay_changes(self):
+        self.window.addViews(
+            (QtGui.QWidget(), "journal {0}".format(i)) for i in (2, 3))
+        self.window.reorderViews([2, 0, 1])
+        self.window.removeView(1)
+        self.window.setCurrentView(1)
+
+        wnd, = self.replay()
+
+        self.assertEqual(self.titles(wnd), ["journal 3", "journal 2"])
+        self.assertEqual(wnd.current, 1)
+
+    def test_replay_tear_off(self):
+        self.window.addView(QtGui.QWidget(), "journal 2")
+
+        new_wnd = WindowPool.instance().acquire(
+            self.window, QtCore.QRect(10, 10, 200, 100))
+        view = self.window.tabs.widget(1)
+        self.window.tabs.removeTab(1)
+        new_wnd.addView(view, "journal 2")
+
+        windows = self.replay()
+
+        self.assertEqual(
+            [self.titles(wnd) for wnd in windows],
+            [["journal 1"], ["journal 2"]]
+        )
+        self.assertEqual(windows[1].geometry, (10, 10, 200, 100))
+
+        # Closed window
+        new_wnd.close()
+
+        self.assertEqual(len(self.replay()), 1)
+
+    def test_damaged_frame(self):
+        self.journal.flush(wait=True)
+        self.window.addView(QtGui.QWidget(), "journal 2")
+        self.journal.flush(wait=True)
+
+        # Simulate a crash while writing the last frame
+        with open(self.path, "rb+") as journal:
+            journal.seek(-1, os.SEEK_END)
+            journal.truncate()
+
+        wnd, = self.replay()
+
+        self.assertEqual(self.titles(wnd), ["journal 1"])
+
+    def test_skip_invalid_frame(self):
+        self.journal.flush(wait=True)
+
+        # Intact frame with an unknown record and one about an unknown window
+        with open(self.path, "ab") as journal:
+            # pylint: disable=W0212
+            journal.write(Journal._frame(b"\xff"))
+            journal.write(Journal._frame(
+                Journal._TYPE.pack(Journal.REMOVE) +
+                Journal._ID.pack(12345) + Journal._ID.pack(0)))
+            # pylint: enable=W0212
+
+        self.window.addView(QtGui.QWidget(), "journal 2")
+
+        wnd, = self.replay()
+
+        self.assertEqual(self.titles(wnd), ["journal 1", "journal 2"])
+
+    def test_compaction_hidden_window(self):
+        """
+        A window left out of the snapshot is recorded again when it changes
+        """
+        other = TabbedWindow()
+        other.addView(QtGui.QWidget(), "journal other 1")
+        other.show()
+        other.hide()
+
+        self.journal.compact()
+
+        other.show()
+        other.addView(QtGui.QWidget(), "journal other 2")
+        self.window.addView(QtGui.QWidget(), "journal 2")
+
+        titles = [self.titles(wnd) for wnd in self.replay()]
+
+        self.assertIn(["journal 1", "journal 2"], titles)
+        self.assertIn(["journal other 2"], titles)
+
+    def test_compaction(self):
+        with patch.object(Journal, "COMPACT_THRESHOLD", 2):
+            for i in (2, 3):
+                self.window.addView(QtGui.QWidget(), "journal {0}".format(i))
+
+            wnd, = self.replay()
+
+        self.assertEqual(
+            self.titles(wnd), ["journal 1", "journal 2", "journal 3"])
+
+    def test_compaction_closed_window(self):
+        closed = TabbedWindow()
+        closed.addView(QtGui.QWidget(), "journal closed")
+        closed.show()
+        closed.close()
+
+        self.journal.compact()
+
+        wnd, = self.replay()
+
+        self.assertEqual(self.titles(wnd), ["journal 1"])
+
+
+class TracerTests(WidgetTestsMixin, unittest.TestCase):
+    """
+    Tracer test cases
+    """
+
+    def setUp(self):
+        # Call superclass
+        super(TracerTests, self).setUp()
+
+        # Set up
+        self.tracer = Tracer(capacity=2)
+        self.tracer.install()
+
+        self.window = TabbedWindow()
+
+    def tearDown(self):
+        self.tracer.uninstall()
+
+    def test_spans(self):
+        view = QtGui.QWidget()
+
+        self.window.addView(view, "title")
+
+        # Check
+        events = self.tracer.events()
+
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["name"], "TabbedWindow.addView")
+        self.assertEqual(events[0]["ph"], "X")
+        self.assertEqual(events[0]["args"]["text"], "title")
+        self.assertEqual(events[0]["args"]["view"], "0x{0:x}".format(id(view)))
+
+    def test_ring_buffer(self):
+        for i in xrange(3):
+            self.window.addView(QtGui.QWidget(), "title {0}".format(i))
+
+        events = self.tracer.events()
+
+        self.assertEqual(len(events), 2)
+        self.assertEqual(events[0]["args"]["text"], "title 1")
+
+    def test_dumps(self):
+        self.window.addView(QtGui.QWidget(), "title")
+        self.window.removeView(0)
+
+        trace = json.loads(self.tracer.dumps())
+
+        self.assertEqual(
+            [event["name"] for event in trace["traceEvents"]],
+            ["TabbedWindow.addView", "TabbedWindow.removeView"]
+        )